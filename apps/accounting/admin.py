@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
+from apps.core.period_locks import registry as period_lock_registry
 from .models import (
     AccountingPeriod, 
     JournalEntry, 
@@ -182,6 +183,8 @@ class AccountingPeriodAdmin(admin.ModelAdmin):
             status='CLOSED',
             closed_at=timezone.now()
         )
+        # update() skips post_save - refresh the locked period cache explicitly
+        period_lock_registry.invalidate()
         self.message_user(request, f'Successfully closed {updated} accounting period(s).')
     close_period.short_description = 'Close selected periods'
     
@@ -192,6 +195,7 @@ class AccountingPeriodAdmin(admin.ModelAdmin):
             reconciled_at=timezone.now(),
             reconciled_by=request.user.get_full_name() or request.user.username
         )
+        period_lock_registry.invalidate()
         self.message_user(request, f'Successfully reconciled {updated} accounting period(s).')
     reconcile_period.short_description = 'Reconcile selected periods'
 
@@ -0,0 +1,181 @@
+"""
+Management command to benchmark the multi-period financial statements service
+Builds synthetic books (default 36 months), times the statements build against a
+per-period loop, then rolls everything back - nothing is left in the database.
+
+Usage:
+    python manage.py benchmark_financial_statements
+    python manage.py benchmark_financial_statements --months 36 --entries-per-month 500
+"""
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounting.models import AccountingPeriod, JournalEntry, JournalEntryLine, LedgerAccount
+from apps.accounting.services.financial_statements import build_statements, month_range
+
+
+SYNTHETIC_ACCOUNTS = [
+    ('1000-BENCH', 'Benchmark Cash', 'ASSET'),
+    ('1200-BENCH', 'Benchmark Inventory', 'ASSET'),
+    ('2000-BENCH', 'Benchmark Payables', 'LIABILITY'),
+    ('3000-BENCH', 'Benchmark Capital', 'EQUITY'),
+    ('4000-BENCH', 'Benchmark Sales', 'REVENUE'),
+    ('5000-BENCH', 'Benchmark Expenses', 'EXPENSE'),
+]
+
+
+class _Rollback(Exception):
+    """Raised to discard the synthetic data"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmark financial statements over synthetic multi-month books (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=36,
+            help='Number of synthetic months (default: 36)',
+        )
+        parser.add_argument(
+            '--entries-per-month',
+            type=int,
+            default=200,
+            help='Journal entries per month (default: 200)',
+        )
+        parser.add_argument(
+            '--start-year',
+            type=int,
+            default=2090,
+            help='First synthetic year - must not overlap real accounting periods (default: 2090)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for reproducible data',
+        )
+
+    def handle(self, *args, **options):
+        months = options['months']
+        start_year = options['start_year']
+        if months < 1:
+            raise CommandError('--months must be at least 1')
+
+        ordinal = start_year * 12 + months - 1
+        start, end = (start_year, 1), (ordinal // 12, ordinal % 12 + 1)
+        if AccountingPeriod.objects.filter(year__gte=start_year, year__lte=end[0]).exists():
+            raise CommandError(f'Accounting periods already exist in {start_year}-{end[0]}; pick another --start-year')
+
+        try:
+            with transaction.atomic():
+                self._seed(start, end, options['entries_per_month'], options['seed'])
+                self._run(start, end)
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('🧹 Synthetic data rolled back')
+
+    # ------------------------------------------------------------------
+
+    def _seed(self, start, end, entries_per_month, seed):
+        rng = random.Random(seed)
+        months = month_range(start, end)
+        self.stdout.write(f'🔄 Seeding {len(months)} months × {entries_per_month} entries...')
+
+        accounts = {}
+        for code, name, account_type in SYNTHETIC_ACCOUNTS:
+            accounts[code] = LedgerAccount.objects.create(
+                account_code=code, account_name=name, account_type=account_type
+            )
+
+        periods = AccountingPeriod.objects.bulk_create([
+            AccountingPeriod(
+                year=year,
+                month=month,
+                total_revenue=Decimal(rng.randint(800_000, 1_200_000)),
+                total_direct_costs=Decimal(rng.randint(400_000, 600_000)),
+                total_indirect_costs=Decimal(rng.randint(50_000, 90_000)),
+                total_payroll_costs=Decimal(rng.randint(150_000, 200_000)),
+                total_other_expenses=Decimal(rng.randint(5_000, 20_000)),
+            )
+            for year, month in months
+        ])
+
+        # (debit account, credit account) pairs: capital, sale, purchase, expense, payment
+        patterns = [
+            ('1000-BENCH', '3000-BENCH'),
+            ('1000-BENCH', '4000-BENCH'),
+            ('1200-BENCH', '2000-BENCH'),
+            ('5000-BENCH', '1200-BENCH'),
+            ('2000-BENCH', '1000-BENCH'),
+        ]
+        entries = []
+        for period, (year, month) in zip(periods, months):
+            for n in range(entries_per_month):
+                entries.append(JournalEntry(
+                    entry_type='ADJUSTMENT',
+                    date=date(year, month, rng.randint(1, 28)),
+                    reference_number=f'BENCH-{year}{month:02d}-{n:05d}',
+                    accounting_period=period,
+                    description='Benchmark entry',
+                    is_posted=True,
+                ))
+        entries = JournalEntry.objects.bulk_create(entries, batch_size=1000)
+
+        lines = []
+        for entry in entries:
+            debit, credit = rng.choice(patterns[1:]) if rng.random() > 0.02 else patterns[0]
+            amount = Decimal(rng.randint(100, 50_000))
+            lines.append(JournalEntryLine(journal_entry=entry, account=accounts[debit], line_type='DEBIT', amount=amount))
+            lines.append(JournalEntryLine(journal_entry=entry, account=accounts[credit], line_type='CREDIT', amount=amount))
+        JournalEntryLine.objects.bulk_create(lines, batch_size=2000)
+        self.stdout.write(f'  ✅ {len(entries)} entries, {len(lines)} lines')
+
+    def _run(self, start, end):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            statements = build_statements(start, end)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Statements service: {len(statements["periods"])} months in {elapsed * 1000:.1f} ms, '
+            f'{len(queries)} queries'
+        ))
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            self._per_period_baseline(start, end)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.WARNING(
+            f'⏱️  Per-period loop:    {elapsed * 1000:.1f} ms, {len(queries)} queries'
+        ))
+
+        unbalanced = [
+            period for period, difference in
+            zip(statements['periods'], statements['balance_sheet']['difference'])
+            if difference
+        ]
+        if unbalanced:
+            self.stdout.write(self.style.ERROR(f'❌ Balance sheet does not balance for {unbalanced}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Balance sheet balances for every month'))
+
+    def _per_period_baseline(self, start, end):
+        """What a month-by-month report costs: one period read + one aggregate per account type"""
+        for year, month in month_range(start, end):
+            AccountingPeriod.objects.filter(year=year, month=month).first()
+            month_end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+            for account_type in ['ASSET', 'LIABILITY', 'EQUITY', 'REVENUE', 'EXPENSE']:
+                for line_type in ['DEBIT', 'CREDIT']:
+                    JournalEntryLine.objects.filter(
+                        journal_entry__date__lt=month_end,
+                        account__account_type=account_type,
+                        line_type=line_type,
+                    ).aggregate(total=Sum('amount'))
@@ -0,0 +1,90 @@
+"""
+Management command to export the general ledger for the external auditor
+Streams journal lines in chunks - safe for multi-year exports
+
+Usage:
+    python manage.py export_general_ledger --output gl_2025.csv
+    python manage.py export_general_ledger --format xlsx --start 2025-01-01 --end 2025-12-31 --output gl_2025.xlsx
+"""
+from django.core.management.base import BaseCommand, CommandError
+from datetime import datetime
+
+from apps.accounting.services.ledger_export import (
+    DEFAULT_CHUNK_SIZE, ledger_queryset, iter_ledger_rows, write_csv, write_xlsx
+)
+
+
+class Command(BaseCommand):
+    help = 'Export the general ledger (journal lines) to CSV or XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'xlsx'],
+            default='csv',
+            help='Output format (default: csv)',
+        )
+        parser.add_argument(
+            '--start',
+            type=str,
+            help='First entry date to include (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--end',
+            type=str,
+            help='Last entry date to include (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--posted-only',
+            action='store_true',
+            help='Only export posted journal entries',
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Output file path. CSV defaults to stdout; XLSX requires a path.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows fetched per database round-trip (default: {DEFAULT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self._parse_date(options['start'])
+            end_date = self._parse_date(options['end'])
+        except ValueError:
+            raise CommandError('Invalid date format. Use YYYY-MM-DD')
+
+        lines = ledger_queryset(
+            start_date=start_date,
+            end_date=end_date,
+            posted_only=options['posted_only']
+        )
+        rows = iter_ledger_rows(lines, chunk_size=options['chunk_size'])
+        output = options['output']
+
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError('--output is required for XLSX exports')
+            try:
+                with open(output, 'wb') as fileobj:
+                    count = write_xlsx(rows, fileobj)
+            except ImportError as e:
+                raise CommandError(str(e))
+        elif output:
+            with open(output, 'w', newline='', encoding='utf-8') as fileobj:
+                count = write_csv(rows, fileobj)
+        else:
+            write_csv(rows, self.stdout)
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Exported {count} journal line(s) to {output}'))
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').date()
@@ -2,6 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 from decimal import Decimal
+from apps.core.period_locks import PeriodLockedQuerySet, assert_journal_lines_writable
 
 
 class AccountingPeriod(models.Model):
@@ -124,7 +125,7 @@ class AccountingPeriod(models.Model):
         # from apps.sales.models import SalesReturn  # ❌ REMOVED - Sales app deleted
         from apps.production.models import ProductionBatch, IndirectCost
         from apps.payroll.models import MonthlyPayroll, CasualLabor
-        from apps.inventory.models import Purchase
+        from apps.inventory.services.expense_classification import other_expenses_total
         from django.db.models import Sum
         from datetime import datetime
         
@@ -146,8 +147,8 @@ class AccountingPeriod(models.Model):
         
         # Direct Costs from Production (ingredients + packaging)
         production_costs = ProductionBatch.objects.filter(
-            date__gte=start_date,
-            date__lt=end_date
+            daily_production__date__gte=start_date,
+            daily_production__date__lt=end_date
         ).aggregate(
             total=Sum('total_cost')
         )['total'] or Decimal('0.00')
@@ -181,15 +182,9 @@ class AccountingPeriod(models.Model):
         self.total_payroll_costs = payroll_costs + casual_costs
         
         # Other Expenses (non-production inventory purchases)
-        # This would include items not directly used in production
-        other_purchases = Purchase.objects.filter(
-            date__gte=start_date,
-            date__lt=end_date,
-            items__inventory_item__category__name__in=['Cleaning Supplies', 'Office Supplies', 'Miscellaneous']
-        ).aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        self.total_other_expenses = other_purchases
+        # Purchase lines are tagged with their expense category at receipt,
+        # so this is one grouped aggregate on PurchaseItem.total_cost
+        self.total_other_expenses = other_expenses_total(start_date, end_date)
         
         # Calculate Profit Metrics
         self.gross_profit = self.total_revenue - self.total_direct_costs
@@ -421,10 +416,27 @@ class JournalEntryLine(models.Model):
             models.Index(fields=['account']),
         ]
     
+    objects = PeriodLockedQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.journal_entry.reference_number} - {self.account.account_code} ({self.line_type}): KES {self.amount}"
     
+    @classmethod
+    def assert_period_open(cls, lines):
+        """Raise PeriodLockedError if any line posts into a closed accounting period"""
+        assert_journal_lines_writable(lines)
+    
+    def clean(self):
+        """Validate the accounting period is still open"""
+        if self.journal_entry_id:
+            self.assert_period_open([self])
+    
     def save(self, *args, **kwargs):
+        # Load the entry once: the period check reads it from the cache and
+        # the totals below update it
+        entry = self.journal_entry
+        self.assert_period_open([self])
+        
         super().save(*args, **kwargs)
         
         # Update ledger account balance
@@ -432,15 +444,15 @@ class JournalEntryLine(models.Model):
         self.account.update_balance(self.amount, is_debit=is_debit)
         
         # Update journal entry totals
-        self.journal_entry.total_debit = self.journal_entry.lines.filter(line_type='DEBIT').aggregate(
+        entry.total_debit = entry.lines.filter(line_type='DEBIT').aggregate(
             total=models.Sum('amount')
         )['total'] or Decimal('0.00')
         
-        self.journal_entry.total_credit = self.journal_entry.lines.filter(line_type='CREDIT').aggregate(
+        entry.total_credit = entry.lines.filter(line_type='CREDIT').aggregate(
             total=models.Sum('amount')
         )['total'] or Decimal('0.00')
         
-        self.journal_entry.save()
+        entry.save()
 
 
 class TrialBalance(models.Model):
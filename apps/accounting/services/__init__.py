@@ -0,0 +1 @@
+"""Accounting services package"""
@@ -0,0 +1,293 @@
+"""
+Financial Statements Service
+Multi-period P&L, balance sheet and cash flow in a handful of grouped queries
+
+Queries (independent of the number of months):
+1. AccountingPeriod rows in the range (operational P&L from calculate_totals)
+2. Journal line totals grouped by month × account type × cash/non-cash × debit/credit
+3. Opening balances (everything before the range) grouped the same way, without month
+
+Every statement line is a column: a list with one value per month. Lines are
+computed element-wise across all months at once (running balances via
+itertools.accumulate), so nothing is recalculated or re-queried per period.
+"""
+import csv
+import json
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from apps.accounting.models import AccountingPeriod, JournalEntryLine
+
+
+ZERO = Decimal('0.00')
+
+# Chart of accounts convention: 1000-1099 are cash & bank accounts
+CASH_ACCOUNT_PREFIX = '10'
+
+# Accounts are bucketed so assets can be split into cash / non-cash
+BUCKETS = ['CASH', 'OTHER_ASSET', 'LIABILITY', 'EQUITY', 'REVENUE', 'EXPENSE']
+
+# Natural balance side: debit-normal accounts grow with debits
+DEBIT_NORMAL = {'CASH', 'OTHER_ASSET', 'EXPENSE'}
+
+
+# ============================================================================
+# COLUMN HELPERS (element-wise over months)
+# ============================================================================
+
+def _zeros(size):
+    return [ZERO] * size
+
+
+def _add(*columns):
+    return [sum(values, ZERO) for values in zip(*columns)]
+
+
+def _sub(left, right):
+    return [a - b for a, b in zip(left, right)]
+
+
+def _neg(column):
+    return [-value for value in column]
+
+
+def _running(opening, movements):
+    """Closing balance per month: opening + cumulative movements"""
+    return list(accumulate(movements, initial=opening))[1:]
+
+
+def _shift(opening, closing):
+    """Opening balance per month: previous month's closing"""
+    return [opening] + closing[:-1]
+
+
+def _margin(numerator, denominator):
+    return [
+        (n / d * 100).quantize(Decimal('0.01')) if d else ZERO
+        for n, d in zip(numerator, denominator)
+    ]
+
+
+# ============================================================================
+# PERIOD RANGE
+# ============================================================================
+
+def month_range(start, end):
+    """
+    List of (year, month) from start to end inclusive
+    start/end are (year, month) tuples
+    """
+    first = start[0] * 12 + start[1] - 1
+    last = end[0] * 12 + end[1] - 1
+    return [(ordinal // 12, ordinal % 12 + 1) for ordinal in range(first, last + 1)]
+
+
+def _month_start(year, month):
+    return date(year, month, 1)
+
+
+def _month_after(year, month):
+    return date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+# ============================================================================
+# DATA LOADING
+# ============================================================================
+
+def _bucket(account_type, account_code):
+    if account_type == 'ASSET':
+        return 'CASH' if account_code.startswith(CASH_ACCOUNT_PREFIX) else 'OTHER_ASSET'
+    return account_type
+
+
+def _signed(bucket, line_type, amount):
+    """Amount in the account's natural direction"""
+    is_debit = line_type == 'DEBIT'
+    return amount if is_debit == (bucket in DEBIT_NORMAL) else -amount
+
+
+def _journal_totals(lines, by_month):
+    fields = ['account__account_type', 'account__account_code', 'line_type']
+    if by_month:
+        lines = lines.annotate(
+            entry_year=ExtractYear('journal_entry__date'),
+            entry_month=ExtractMonth('journal_entry__date'),
+        )
+        fields = ['entry_year', 'entry_month'] + fields
+    return lines.order_by().values(*fields).annotate(total=Sum('amount'))
+
+
+def _load_periods(months):
+    first = months[0][0] * 12 + months[0][1]
+    last = months[-1][0] * 12 + months[-1][1]
+    return {
+        (period.year, period.month): period
+        for period in AccountingPeriod.objects.annotate(
+            ordinal=F('year') * 12 + F('month')
+        ).filter(ordinal__gte=first, ordinal__lte=last)
+    }
+
+
+def _load_ledger(months, posted_only):
+    """
+    Monthly movements {bucket: column} and opening balances {bucket: Decimal}
+    Two grouped queries over JournalEntryLine
+    """
+    size = len(months)
+    position = {month: i for i, month in enumerate(months)}
+    start_date = _month_start(*months[0])
+    end_date = _month_after(*months[-1])
+
+    lines = JournalEntryLine.objects.all()
+    if posted_only:
+        lines = lines.filter(journal_entry__is_posted=True)
+
+    movements = {bucket: _zeros(size) for bucket in BUCKETS}
+    in_range = lines.filter(journal_entry__date__gte=start_date, journal_entry__date__lt=end_date)
+    for row in _journal_totals(in_range, by_month=True):
+        bucket = _bucket(row['account__account_type'], row['account__account_code'])
+        i = position[(row['entry_year'], row['entry_month'])]
+        movements[bucket][i] += _signed(bucket, row['line_type'], row['total'])
+
+    opening = {bucket: ZERO for bucket in BUCKETS}
+    before_range = lines.filter(journal_entry__date__lt=start_date)
+    for row in _journal_totals(before_range, by_month=False):
+        bucket = _bucket(row['account__account_type'], row['account__account_code'])
+        opening[bucket] += _signed(bucket, row['line_type'], row['total'])
+
+    return movements, opening
+
+
+# ============================================================================
+# STATEMENTS
+# ============================================================================
+
+def build_statements(start, end, posted_only=True):
+    """
+    Build P&L, balance sheet and cash flow for every month in [start, end]
+    start/end are (year, month) tuples
+
+    Returns:
+        {
+            'periods': ['2025-01', ...],
+            'profit_and_loss': {line: [value per month]},
+            'balance_sheet': {line: [...]},
+            'cash_flow': {line: [...]},
+        }
+    """
+    months = month_range(start, end)
+    if not months:
+        raise ValueError('End period must not be before start period')
+
+    periods = _load_periods(months)
+    movements, opening = _load_ledger(months, posted_only)
+
+    def period_column(field):
+        return [
+            getattr(periods[month], field) if month in periods else ZERO
+            for month in months
+        ]
+
+    # ---- Profit & Loss -------------------------------------------------
+    revenue = period_column('total_revenue')
+    direct_costs = period_column('total_direct_costs')
+    indirect_costs = period_column('total_indirect_costs')
+    payroll_costs = period_column('total_payroll_costs')
+    other_expenses = period_column('total_other_expenses')
+    gross_profit = _sub(revenue, direct_costs)
+    net_profit = _sub(gross_profit, _add(indirect_costs, payroll_costs, other_expenses))
+    ledger_net_income = _sub(movements['REVENUE'], movements['EXPENSE'])
+
+    profit_and_loss = {
+        'revenue': revenue,
+        'direct_costs': direct_costs,
+        'gross_profit': gross_profit,
+        'indirect_costs': indirect_costs,
+        'payroll_costs': payroll_costs,
+        'other_expenses': other_expenses,
+        'net_profit': net_profit,
+        'profit_margin': _margin(net_profit, revenue),
+        'ledger_revenue': movements['REVENUE'],
+        'ledger_expenses': movements['EXPENSE'],
+        'ledger_net_income': ledger_net_income,
+    }
+
+    # ---- Balance Sheet (closing balances) ------------------------------
+    cash = _running(opening['CASH'], movements['CASH'])
+    other_assets = _running(opening['OTHER_ASSET'], movements['OTHER_ASSET'])
+    liabilities = _running(opening['LIABILITY'], movements['LIABILITY'])
+    equity = _running(opening['EQUITY'], movements['EQUITY'])
+    retained_earnings = _running(
+        opening['REVENUE'] - opening['EXPENSE'], ledger_net_income
+    )
+    total_assets = _add(cash, other_assets)
+    total_liabilities_and_equity = _add(liabilities, equity, retained_earnings)
+
+    balance_sheet = {
+        'cash': cash,
+        'other_assets': other_assets,
+        'total_assets': total_assets,
+        'liabilities': liabilities,
+        'equity': equity,
+        'retained_earnings': retained_earnings,
+        'total_liabilities_and_equity': total_liabilities_and_equity,
+        'difference': _sub(total_assets, total_liabilities_and_equity),
+    }
+
+    # ---- Cash Flow (indirect method) -----------------------------------
+    change_in_other_assets = _neg(movements['OTHER_ASSET'])
+    operating = _add(ledger_net_income, change_in_other_assets, movements['LIABILITY'])
+    financing = movements['EQUITY']
+
+    cash_flow = {
+        'net_income': ledger_net_income,
+        'change_in_other_assets': change_in_other_assets,
+        'change_in_liabilities': movements['LIABILITY'],
+        'operating_cash_flow': operating,
+        'financing_cash_flow': financing,
+        'net_change_in_cash': _add(operating, financing),
+        'opening_cash': _shift(opening['CASH'], cash),
+        'closing_cash': cash,
+    }
+
+    return {
+        'periods': [f'{year}-{month:02d}' for year, month in months],
+        'profit_and_loss': profit_and_loss,
+        'balance_sheet': balance_sheet,
+        'cash_flow': cash_flow,
+    }
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+STATEMENT_SECTIONS = [
+    ('profit_and_loss', 'Profit & Loss'),
+    ('balance_sheet', 'Balance Sheet'),
+    ('cash_flow', 'Cash Flow'),
+]
+
+
+def to_json(statements, **kwargs):
+    """Serialize statements to JSON (Decimals as strings)"""
+    return json.dumps(statements, cls=DjangoJSONEncoder, **kwargs)
+
+
+def statement_rows(statements):
+    """Yield CSV rows: Statement, Line, <one column per month>"""
+    yield ['Statement', 'Line'] + statements['periods']
+    for key, title in STATEMENT_SECTIONS:
+        for line, values in statements[key].items():
+            yield [title, line] + values
+
+
+def write_csv(statements, fileobj):
+    """Write statements to an open text file"""
+    writer = csv.writer(fileobj)
+    writer.writerows(statement_rows(statements))
@@ -0,0 +1,148 @@
+"""
+General Ledger Export Service
+Streams journal lines to CSV/XLSX for the external auditor
+
+Rows are read with a single JOIN (JournalEntryLine → JournalEntry → LedgerAccount)
+and iterated in chunks, so memory stays flat regardless of how many years are exported.
+"""
+import csv
+import tempfile
+
+from apps.accounting.models import JournalEntryLine
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # openpyxl is only needed for XLSX exports
+    Workbook = None
+
+
+DEFAULT_CHUNK_SIZE = 2000
+XLSX_READ_BLOCK = 64 * 1024
+
+GL_EXPORT_HEADERS = [
+    'Date',
+    'Reference',
+    'Entry Type',
+    'Entry Description',
+    'Account Code',
+    'Account Name',
+    'Account Type',
+    'Line Description',
+    'Debit',
+    'Credit',
+    'Posted',
+]
+
+
+def ledger_queryset(start_date=None, end_date=None, posted_only=False):
+    """
+    Journal lines for the export, joined to their entry and account
+    Ordered chronologically so the auditor can follow the ledger top to bottom
+    """
+    lines = JournalEntryLine.objects.select_related(
+        'journal_entry',
+        'account'
+    ).only(
+        'line_type',
+        'amount',
+        'description',
+        'journal_entry__date',
+        'journal_entry__reference_number',
+        'journal_entry__entry_type',
+        'journal_entry__description',
+        'journal_entry__is_posted',
+        'account__account_code',
+        'account__account_name',
+        'account__account_type',
+    ).order_by('journal_entry__date', 'journal_entry__reference_number', 'id')
+
+    if start_date:
+        lines = lines.filter(journal_entry__date__gte=start_date)
+    if end_date:
+        lines = lines.filter(journal_entry__date__lte=end_date)
+    if posted_only:
+        lines = lines.filter(journal_entry__is_posted=True)
+
+    return lines
+
+
+def iter_ledger_rows(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield one export row per journal line
+    Uses .iterator() so Django never caches the full result set
+    """
+    for line in lines.iterator(chunk_size=chunk_size):
+        entry = line.journal_entry
+        account = line.account
+        is_debit = line.line_type == 'DEBIT'
+        yield [
+            entry.date.isoformat(),
+            entry.reference_number,
+            entry.entry_type,
+            entry.description,
+            account.account_code,
+            account.account_name,
+            account.account_type,
+            line.description or '',
+            line.amount if is_debit else '',
+            '' if is_debit else line.amount,
+            'Y' if entry.is_posted else 'N',
+        ]
+
+
+class _Echo:
+    """File-like object that returns each written value (for csv.writer streaming)"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    """Yield CSV lines (header first) one row at a time"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(GL_EXPORT_HEADERS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_csv(rows, fileobj):
+    """Write CSV rows to an open text file; returns number of data rows"""
+    writer = csv.writer(fileobj)
+    writer.writerow(GL_EXPORT_HEADERS)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_xlsx(rows, fileobj):
+    """
+    Write rows to an XLSX workbook in write-only mode
+    Write-only worksheets flush each row to disk instead of holding cells in memory
+    Returns number of data rows
+    """
+    if Workbook is None:
+        raise ImportError('openpyxl is required for XLSX exports (pip install openpyxl)')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title='General Ledger')
+    sheet.append(GL_EXPORT_HEADERS)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(fileobj)
+    return count
+
+
+def stream_xlsx(rows):
+    """
+    Build the XLSX in a temporary file, then yield it in blocks
+    (the zip container cannot be emitted before it is complete)
+    """
+    with tempfile.TemporaryFile() as tmp:
+        write_xlsx(rows, tmp)
+        tmp.seek(0)
+        for block in iter(lambda: tmp.read(XLSX_READ_BLOCK), b''):
+            yield block
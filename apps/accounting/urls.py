@@ -0,0 +1,15 @@
+"""
+Accounting App URLs
+"""
+from django.urls import path
+from . import views
+
+app_name = 'accounting'
+
+urlpatterns = [
+    # Exports
+    path('ledger/export/', views.general_ledger_export, name='ledger_export'),
+    
+    # Reports
+    path('statements/', views.financial_statements, name='financial_statements'),
+]
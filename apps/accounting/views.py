@@ -1,3 +1,121 @@
-from django.shortcuts import render
+"""
+Accounting App Views
+Exports and reports built on the double-entry ledger
+"""
+from django.shortcuts import redirect
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.http import StreamingHttpResponse, HttpResponse
+from django.utils import timezone
+from datetime import datetime
 
-# Create your views here.
+from .services.ledger_export import (
+    ledger_queryset, iter_ledger_rows, stream_csv, stream_xlsx
+)
+from .services.financial_statements import build_statements, to_json, write_csv
+
+
+FINANCE_ROLES = ['SUPERADMIN', 'ADMIN']
+
+
+def _parse_date(value):
+    """Parse YYYY-MM-DD query parameter (None if blank)"""
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _parse_month(value):
+    """Parse YYYY-MM query parameter into (year, month) (None if blank)"""
+    if not value:
+        return None
+    parsed = datetime.strptime(value, '%Y-%m')
+    return parsed.year, parsed.month
+
+
+@login_required
+def general_ledger_export(request):
+    """
+    Stream the general ledger as CSV or XLSX
+    Query params: format=csv|xlsx, start=YYYY-MM-DD, end=YYYY-MM-DD, posted=1
+    Permission: SUPERADMIN, ADMIN (Accountant)
+    """
+    if request.user.role not in FINANCE_ROLES:
+        messages.error(request, 'You do not have permission to export the general ledger.')
+        return redirect('home')
+
+    try:
+        start_date = _parse_date(request.GET.get('start'))
+        end_date = _parse_date(request.GET.get('end'))
+    except ValueError:
+        messages.error(request, 'Invalid date format. Use YYYY-MM-DD.')
+        return redirect('home')
+
+    export_format = request.GET.get('format', 'csv').lower()
+    lines = ledger_queryset(
+        start_date=start_date,
+        end_date=end_date,
+        posted_only=request.GET.get('posted') == '1'
+    )
+    rows = iter_ledger_rows(lines)
+
+    filename = 'general_ledger'
+    if start_date:
+        filename += f'_{start_date:%Y%m%d}'
+    if end_date:
+        filename += f'_{end_date:%Y%m%d}'
+
+    if export_format == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(rows),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
+    else:
+        response = StreamingHttpResponse(stream_csv(rows), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+
+    return response
+
+
+MAX_STATEMENT_MONTHS = 120
+
+
+@login_required
+def financial_statements(request):
+    """
+    Multi-period P&L, balance sheet and cash flow as JSON or CSV
+    Query params: start=YYYY-MM, end=YYYY-MM (default: last 12 months), format=json|csv, posted=0
+    Permission: SUPERADMIN, ADMIN (Accountant)
+    """
+    if request.user.role not in FINANCE_ROLES:
+        messages.error(request, 'You do not have permission to view financial statements.')
+        return redirect('home')
+
+    today = timezone.localdate()
+    try:
+        end = _parse_month(request.GET.get('end')) or (today.year, today.month)
+        start = _parse_month(request.GET.get('start'))
+    except ValueError:
+        messages.error(request, 'Invalid period format. Use YYYY-MM.')
+        return redirect('home')
+
+    if start is None:
+        ordinal = end[0] * 12 + end[1] - 12
+        start = (ordinal // 12, ordinal % 12 + 1)
+
+    months = (end[0] - start[0]) * 12 + end[1] - start[1] + 1
+    if months < 1 or months > MAX_STATEMENT_MONTHS:
+        messages.error(request, f'Statement range must be 1 to {MAX_STATEMENT_MONTHS} months.')
+        return redirect('home')
+
+    statements = build_statements(start, end, posted_only=request.GET.get('posted') != '0')
+    filename = f'financial_statements_{start[0]}{start[1]:02d}_{end[0]}{end[1]:02d}'
+
+    if request.GET.get('format', 'json').lower() == 'csv':
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        write_csv(statements, response)
+        return response
+
+    return HttpResponse(to_json(statements), content_type='application/json')
@@ -90,6 +90,10 @@ class UserAdmin(BaseUserAdmin):
             # Protect other SUPERADMINs from modification
             if obj.role == 'SUPERADMIN' and obj.id != request.user.id:
                 readonly.extend(['role', 'is_superuser', 'is_primary_superadmin'])
+            
+            # Salary/job details of linked employees are maintained on payroll.Employee
+            if hasattr(obj, 'employee_record'):
+                readonly.extend(['basic_salary', 'position', 'department', 'date_hired', 'date_terminated'])
         
         return readonly
     
@@ -256,16 +256,29 @@ class User(AbstractUser):
     def __str__(self):
         return self.get_full_name()
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Salary as loaded, so save() can tell whether it changed without a query
+        if 'basic_salary' in instance.__dict__:
+            instance._loaded_basic_salary = instance.basic_salary
+        return instance
+    
     def save(self, *args, **kwargs):
         # Auto-generate username from email if not provided
         if not self.username:
             self.username = self.email.split('@')[0]
         
-        # Auto-calculate pay_per_day
-        if self.basic_salary and not self.pay_per_day:
+        # Auto-calculate pay_per_day when basic_salary changed or it is empty
+        # (a manually entered pay_per_day is kept otherwise)
+        salary_changed = self._state.adding or (
+            self.basic_salary != getattr(self, '_loaded_basic_salary', self.basic_salary)
+        )
+        if self.basic_salary and (salary_changed or not self.pay_per_day):
             self.calculate_pay_per_day()
         
         super().save(*args, **kwargs)
+        self._loaded_basic_salary = self.basic_salary
     
     def clean(self):
         """Validate model before saving"""
@@ -81,26 +81,6 @@ def track_user_profile_changes(sender, instance, **kwargs):
         )
 
 
-@receiver(pre_save, sender=User)
-def auto_calculate_pay_per_day(sender, instance, **kwargs):
-    """
-    Auto-calculate pay_per_day when basic_salary changes
-    Only for employees with payroll tracking (superadmins may not have payroll)
-    """
-    if instance.basic_salary and instance.pk:
-        try:
-            old_instance = User.objects.get(pk=instance.pk)
-            # Only recalculate if basic_salary changed
-            if old_instance.basic_salary != instance.basic_salary:
-                instance.calculate_pay_per_day()
-        except User.DoesNotExist:
-            # New user - calculate on first save
-            instance.calculate_pay_per_day()
-    elif instance.basic_salary and not instance.pk:
-        # New user with basic_salary
-        instance.calculate_pay_per_day()
-
-
 @receiver(post_save, sender='accounts.UserInvitation')
 def create_user_from_invitation(sender, instance, created, **kwargs):
     """
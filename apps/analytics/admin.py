@@ -1,8 +1,18 @@
 """
 Analytics App Admin
-NO admin needed - this app has no models
-All data is queried live from other apps
+Daily metrics are derived data - read-only in the admin
 """
 from django.contrib import admin
 
-# No models to register - Analytics queries live data
+from .models import DailyMetric
+
+
+@admin.register(DailyMetric)
+class DailyMetricAdmin(admin.ModelAdmin):
+    list_display = ['metric_key', 'date', 'value', 'updated_at']
+    list_filter = ['metric_key']
+    date_hierarchy = 'date'
+    readonly_fields = ['metric_key', 'date', 'value', 'updated_at']
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,48 @@
+"""
+Management command to (re)build the daily analytics metrics
+
+Usage:
+    python manage.py rebuild_metrics --from 2025-01-01 --to 2025-12-31
+    python manage.py rebuild_metrics --year 2025
+    python manage.py rebuild_metrics               # the last 30 days
+"""
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.analytics.services.metrics import DAY_METRICS, record_range
+
+
+DEFAULT_DAYS = 30
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily analytics metrics from production, purchases and indirect costs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', type=str, help='First date (YYYY-MM-DD)')
+        parser.add_argument('--to', dest='end', type=str, help='Last date (YYYY-MM-DD). Defaults to today.')
+        parser.add_argument('--year', type=int, help='Rebuild a whole calendar year')
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options['year']:
+            start, end = date(options['year'], 1, 1), date(options['year'], 12, 31)
+        else:
+            try:
+                end = datetime.strptime(options['end'], '%Y-%m-%d').date() if options['end'] else today
+                start = (
+                    datetime.strptime(options['start'], '%Y-%m-%d').date() if options['start']
+                    else end - timedelta(days=DEFAULT_DAYS - 1)
+                )
+            except ValueError:
+                raise CommandError('Invalid date format. Use YYYY-MM-DD')
+        if start > end:
+            raise CommandError('--from must not be after --to')
+
+        rows = record_range(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Metrics rebuilt for {start} → {end}: {rows} rows ({len(DAY_METRICS)} metrics/day)'
+        ))
+        self.stdout.write('  Inventory levels are only recorded at book close (they cannot be rebuilt)')
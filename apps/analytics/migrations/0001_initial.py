@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric_key', models.CharField(help_text='Metric name (e.g., revenue, bread_produced)', max_length=50)),
+                ('date', models.DateField(help_text='Day the value belongs to')),
+                ('value', models.DecimalField(decimal_places=2, default=0, help_text='🤖 AUTO: Daily total (or end-of-day level)', max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Metric',
+                'verbose_name_plural': 'Daily Metrics',
+                'ordering': ['metric_key', 'date'],
+                'unique_together': {('metric_key', 'date')},
+            },
+        ),
+    ]
@@ -1,8 +1,36 @@
 """
 Analytics App Models
-NO models - this app queries live data from other apps
-All analytics are real-time aggregations
+Daily metrics store: one (metric_key, date, value) row per metric per day
+Charts read these pre-bucketed rows instead of aggregating the transactional
+tables (see apps/analytics/services/metrics.py for the metric definitions)
 """
 from django.db import models
 
-# No models needed - Analytics queries live data
+
+class DailyMetric(models.Model):
+    """
+    One metric value for one day
+    🤖 AUTO: Written by signals, book closing and rebuild_metrics
+    """
+    metric_key = models.CharField(
+        max_length=50,
+        help_text="Metric name (e.g., revenue, bread_produced)"
+    )
+    date = models.DateField(help_text="Day the value belongs to")
+    value = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text="🤖 AUTO: Daily total (or end-of-day level)"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['metric_key', 'date']
+        verbose_name = "Daily Metric"
+        verbose_name_plural = "Daily Metrics"
+        # Also the (metric_key, date) index every range read uses
+        unique_together = ['metric_key', 'date']
+
+    def __str__(self):
+        return f"{self.metric_key} {self.date}: {self.value}"
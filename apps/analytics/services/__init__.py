@@ -0,0 +1 @@
+"""Analytics services package"""
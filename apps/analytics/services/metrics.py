@@ -0,0 +1,284 @@
+"""
+Daily Metrics Store
+Pre-bucketed (metric_key, date, value) rows for the analytics charts
+
+Writing:
+- record_days(dates) recomputes every DAY_METRIC for the given dates with
+  three grouped queries (batches, days, received purchases) and upserts
+  the rows in one statement
+- Signals queue the touched dates (schedule_day) and they are recorded
+  on commit, at the end of the request, or at once outside a request
+  (commands, cron, shell); book closing records its day
+  and the end-of-day inventory levels (record_inventory_levels)
+- rebuild_metrics backfills any date range
+
+Reading:
+- metric_series(keys, start, end, bucket) reads the stored rows with one
+  indexed query and downsamples them to day / week / month buckets:
+  totals are summed, levels keep the last value of the bucket
+"""
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, When
+
+from apps.analytics.models import DailyMetric
+from apps.inventory.models import InventoryItem, PurchaseItem
+from apps.production.models import DailyProduction, ProductionBatch
+
+
+SUM = 'sum'    # daily totals: buckets add up
+LAST = 'last'  # levels: a bucket shows its last recorded value
+
+# metric_key -> (label, downsampling)
+DAY_METRICS = {
+    'bread_produced': ('Bread produced (incl. rejects)', SUM),
+    'kdf_produced': ('KDF produced', SUM),
+    'scones_produced': ('Scones produced', SUM),
+    'batches': ('Batches', SUM),
+    'revenue': ('Revenue', SUM),
+    'direct_costs': ('Direct costs', SUM),
+    'indirect_costs': ('Indirect costs', SUM),
+    'gross_profit': ('Gross profit', SUM),
+    'purchases': ('Purchases received', SUM),
+}
+LEVEL_METRICS = {
+    'inventory_value': ('Inventory value', LAST),
+    'low_stock_items': ('Low-stock items', LAST),
+}
+METRICS = {**DAY_METRICS, **LEVEL_METRICS}
+
+BUCKETS = ['day', 'week', 'month']
+
+# Product name -> produced metric
+PRODUCT_METRICS = {'bread': 'bread_produced', 'kdf': 'kdf_produced', 'scones': 'scones_produced'}
+
+ZERO = Decimal('0.00')
+MONEY = Decimal('0.01')
+
+
+class MetricError(ValueError):
+    """Raised for an unknown metric key or bucket"""
+
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def _upsert(rows):
+    """rows: {(metric_key, date): value} - one INSERT ... ON CONFLICT UPDATE"""
+    DailyMetric.objects.bulk_create(
+        [
+            DailyMetric(metric_key=key, date=day, value=Decimal(value).quantize(MONEY))
+            for (key, day), value in rows.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['metric_key', 'date'],
+        update_fields=['value', 'updated_at'],
+    )
+
+
+def compute_day_metrics(dates):
+    """
+    Every DAY_METRIC for the given dates (days without data get zeros)
+    Returns {(metric_key, date): value}
+    """
+    dates = set(dates)
+    if not dates:
+        return {}
+    start, end = min(dates), max(dates)
+    values = {(key, day): ZERO for key in DAY_METRICS for day in dates}
+
+    # Direct cost: actual COGS once costed, else the Mix snapshot (as in the daily report)
+    direct_cost = Case(
+        When(costed_at__isnull=False, then=F('actual_ingredient_cost') + F('actual_packaging_cost')),
+        default=F('ingredient_cost') + F('packaging_cost'),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    batches = (
+        ProductionBatch.objects
+        .filter(daily_production__date__range=(start, end))
+        .values('daily_production__date', 'mix__product__name')
+        .annotate(
+            batch_count=Count('id'),
+            packets=Sum('actual_packets'),
+            rejects=Sum('rejects_produced'),
+            revenue=Sum('expected_revenue'),
+            direct=Sum(direct_cost),
+        )
+        .order_by()
+    )
+    for row in batches:
+        day = row['daily_production__date']
+        if day not in dates:
+            continue
+        values[('batches', day)] += row['batch_count']
+        values[('revenue', day)] += row['revenue'] or ZERO
+        values[('direct_costs', day)] += row['direct'] or ZERO
+        key = PRODUCT_METRICS.get(row['mix__product__name'].strip().lower())
+        if key is not None:
+            values[(key, day)] += row['packets'] or 0
+            if key == 'bread_produced':
+                values[(key, day)] += row['rejects'] or 0
+
+    for day, indirect in DailyProduction.objects.filter(
+        date__range=(start, end)
+    ).values_list('date', 'total_indirect_costs'):
+        if day in dates:
+            values[('indirect_costs', day)] = indirect
+
+    for day, total in (
+        PurchaseItem.objects
+        .filter(purchase__status='RECEIVED', purchase__purchase_date__range=(start, end))
+        .values_list('purchase__purchase_date')
+        .annotate(total=Sum('total_cost'))
+        .order_by()
+    ):
+        if day in dates:
+            values[('purchases', day)] = total or ZERO
+
+    for day in dates:
+        values[('gross_profit', day)] = (
+            values[('revenue', day)] - values[('direct_costs', day)] - values[('indirect_costs', day)]
+        )
+    return values
+
+
+def record_days(dates):
+    """Recompute and store the day metrics for the given dates"""
+    values = compute_day_metrics(dates)
+    if values:
+        _upsert(values)
+    return len(values)
+
+
+def record_range(start, end):
+    """Recompute every day from start to end (inclusive)"""
+    return record_days(start + timedelta(days=offset) for offset in range((end - start).days + 1))
+
+
+def record_inventory_levels(day):
+    """Store today's inventory levels under `day` (levels cannot be recomputed later)"""
+    value = Sum(
+        F('current_stock') * F('cost_per_recipe_unit'),
+        output_field=DecimalField(max_digits=18, decimal_places=4),
+    )
+    levels = InventoryItem.objects.filter(is_active=True).aggregate(
+        value=value,
+        low_stock=Count('id', filter=Q(low_stock_alert=True)),
+    )
+    _upsert({
+        ('inventory_value', day): levels['value'] or ZERO,
+        ('low_stock_items', day): levels['low_stock'],
+    })
+
+
+# Dates touched in the current thread, recorded by flush_pending()
+_pending = threading.local()
+
+
+def _pending_days():
+    if not hasattr(_pending, 'days'):
+        _pending.days = set()
+    return _pending.days
+
+
+def begin_request():
+    """Batch the dates touched during this request (request_started)"""
+    _pending.in_request = True
+
+
+def end_request():
+    """Record the request's dates and stop batching (request_finished)"""
+    _pending.in_request = False
+    flush_pending()
+
+
+def flush_pending():
+    """Record every queued date (one recompute for all of them)"""
+    days = _pending_days()
+    if days:
+        dates = set(days)
+        days.clear()
+        record_days(dates)
+
+
+def schedule_day(day):
+    """
+    Queue a date for recording. Inside a transaction it is recorded on
+    commit. In autocommit during a request it waits for the end of the
+    request, so the cascade of saves behind one batch edit collapses into
+    one recompute; anywhere else (commands, cron, shell) it is recorded
+    straight away.
+    """
+    if day is None:
+        return
+    _pending_days().add(day)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(flush_pending)
+    elif not getattr(_pending, 'in_request', False):
+        flush_pending()
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def bucket_start(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _bucket_range(start, end, bucket):
+    """Every bucket start from start to end"""
+    current = bucket_start(start, bucket)
+    buckets = []
+    while current <= end:
+        buckets.append(current)
+        if bucket == 'month':
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current += timedelta(days=7 if bucket == 'week' else 1)
+    return buckets
+
+
+def metric_series(keys, start, end, bucket='day'):
+    """
+    Stored metrics between start and end, downsampled to `bucket`
+    Returns {'bucket', 'labels': [bucket start dates],
+             'series': {key: [value per bucket]}} - SUM metrics fill empty
+    buckets with 0, LAST metrics with None
+    """
+    unknown = [key for key in keys if key not in METRICS]
+    if unknown:
+        raise MetricError(f'Unknown metric(s): {", ".join(unknown)}')
+    if bucket not in BUCKETS:
+        raise MetricError(f'Unknown bucket "{bucket}" (use {", ".join(BUCKETS)})')
+
+    labels = _bucket_range(start, end, bucket)
+    position = {label: index for index, label in enumerate(labels)}
+    series = {
+        key: [ZERO if METRICS[key][1] == SUM else None] * len(labels)
+        for key in keys
+    }
+
+    rows = (
+        DailyMetric.objects
+        .filter(metric_key__in=keys, date__range=(start, end))
+        .order_by('date')
+        .values_list('metric_key', 'date', 'value')
+    )
+    for key, day, value in rows:
+        index = position[bucket_start(day, bucket)]
+        if METRICS[key][1] == SUM:
+            series[key][index] += value
+        else:
+            series[key][index] = value  # rows are in date order: last one wins
+
+    return {'bucket': bucket, 'labels': labels, 'series': series}
+
@@ -0,0 +1,76 @@
+"""
+Analytics App Signals
+Keep the daily metrics store current: every write that changes a day's
+totals queues that date; queued dates are recomputed once, on commit or
+when the request finishes (outside a request, straight away)
+"""
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .services.metrics import begin_request, end_request, schedule_day
+
+
+def _parent_value(descriptor, instance, parent_model, field):
+    """Field of the FK parent - from the cached object when loaded, else one query"""
+    if descriptor.is_cached(instance):
+        return getattr(getattr(instance, descriptor.field.name), field)
+    return (
+        parent_model.objects
+        .filter(pk=getattr(instance, descriptor.field.attname))
+        .values_list(field, flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender='production.ProductionBatch')
+@receiver(post_delete, sender='production.ProductionBatch')
+def production_batch_changed(sender, instance, **kwargs):
+    """Output, revenue and direct costs of the batch's day"""
+    from apps.production.models import DailyProduction
+
+    schedule_day(_parent_value(sender.daily_production, instance, DailyProduction, 'date'))
+
+
+@receiver(post_save, sender='production.DailyProduction')
+@receiver(post_delete, sender='production.DailyProduction')
+def daily_production_changed(sender, instance, **kwargs):
+    """Indirect costs (a deleted day is recorded as zeros)"""
+    schedule_day(instance.date)
+
+
+@receiver(pre_save, sender='inventory.Purchase')
+def capture_previous_purchase_date(sender, instance, **kwargs):
+    """Date the purchase counted on before this save (None when new)"""
+    instance._previous_purchase_date = (
+        sender.objects.filter(pk=instance.pk).values_list('purchase_date', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender='inventory.Purchase')
+@receiver(post_delete, sender='inventory.Purchase')
+def purchase_changed(sender, instance, **kwargs):
+    """Received purchases count on their purchase date (both dates when it moved)"""
+    schedule_day(instance.purchase_date)
+    previous = getattr(instance, '_previous_purchase_date', None)
+    if previous and previous != instance.purchase_date:
+        schedule_day(previous)
+
+
+@receiver(post_save, sender='inventory.PurchaseItem')
+@receiver(post_delete, sender='inventory.PurchaseItem')
+def purchase_item_changed(sender, instance, **kwargs):
+    from apps.inventory.models import Purchase
+
+    schedule_day(_parent_value(sender.purchase, instance, Purchase, 'purchase_date'))
+
+
+@receiver(request_started)
+def batch_request_days(sender, **kwargs):
+    begin_request()
+
+
+@receiver(request_finished)
+def record_queued_days(sender, **kwargs):
+    end_request()
@@ -8,9 +8,11 @@ from . import views
 app_name = 'analytics'
 
 urlpatterns = [
-    path('dashboard/', views.dashboard_view, name='dashboard'),
     path('products/', views.product_performance_view, name='product_performance'),
-    path('inventory/', views.inventory_status_view, name='inventory_status'),
-    path('sales/', views.sales_trends_view, name='sales_trends'),
-    path('deficits/', views.deficit_analysis_view, name='deficit_analysis'),
+    path('metrics/', views.metrics_api, name='metrics_api'),
+    # ❌ Not routed - legacy views without templates or role checks
+    # path('dashboard/', views.dashboard_view, name='dashboard'),
+    # path('inventory/', views.inventory_status_view, name='inventory_status'),
+    # path('sales/', views.sales_trends_view, name='sales_trends'),
+    # path('deficits/', views.deficit_analysis_view, name='deficit_analysis'),
 ]
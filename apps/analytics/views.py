@@ -1,10 +1,13 @@
 """
 Analytics App Views
 Real-time data aggregation and analysis views
-NO models - queries live data from Production, Sales, Inventory apps
+Time-series charts read the pre-bucketed DailyMetric store (metrics_api)
 """
-from django.shortcuts import render
+from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
 from django.db.models import Sum, Avg, Count, F, Q
 from django.utils import timezone
 from datetime import timedelta, date
@@ -14,6 +17,14 @@ from apps.production.models import DailyProduction, ProductionBatch
 # from apps.sales.models import Dispatch, SalesReturn, DailySales, Salesperson  # ❌ REMOVED - Sales app deleted
 from apps.inventory.models import InventoryItem, StockMovement
 from apps.products.models import Product
+from .services.metrics import METRICS, MetricError, metric_series
+
+
+ANALYTICS_ROLES = ['SUPERADMIN', 'ADMIN']
+DEFAULT_PERFORMANCE_DAYS = 30
+MAX_PERFORMANCE_DAYS = 366 * 5
+DEFAULT_METRIC_DAYS = 365
+MAX_METRIC_DAYS = 366 * 5
 
 
 @login_required
@@ -162,45 +173,68 @@ def dashboard_view(request):
 @login_required
 def product_performance_view(request):
     """
-    Detailed product-level P&L analysis
-    Live data from ProductionBatch
+    Detailed product-level P&L analysis over the last ?days= days
+    One grouped ProductionBatch query (batches reach products through mix__product)
+    Permission: SUPERADMIN, ADMIN
     """
-    # Date range filter (default: last 30 days)
-    days = int(request.GET.get('days', 30))
-    start_date = date.today() - timedelta(days=days)
-    
-    products = Product.objects.filter(is_active=True, parent_product__isnull=True)
-    product_data = []
-    
-    for product in products:
-        batches = ProductionBatch.objects.filter(
-            product=product,
-            daily_production__date__gte=start_date
-        ).aggregate(
+    if request.user.role not in ANALYTICS_ROLES:
+        messages.error(request, 'You do not have permission to view analytics.')
+        return redirect('home')
+
+    try:
+        days = min(max(int(request.GET.get('days', DEFAULT_PERFORMANCE_DAYS)), 1), MAX_PERFORMANCE_DAYS)
+    except ValueError:
+        days = DEFAULT_PERFORMANCE_DAYS
+    end_date = timezone.localdate()
+    start_date = end_date - timedelta(days=days - 1)
+
+    totals = {
+        row['mix__product']: row
+        for row in ProductionBatch.objects
+        .filter(daily_production__date__range=(start_date, end_date))
+        .values('mix__product')
+        .annotate(
             total_produced=Sum('actual_packets'),
+            total_expected=Sum('expected_packets'),
+            total_variance=Sum('variance_packets'),
             total_revenue=Sum('expected_revenue'),
             total_cost=Sum('total_cost'),
             total_profit=Sum('gross_profit'),
-            avg_margin=Avg('gross_margin_percentage'),
-            batch_count=Count('id')
+            batch_count=Count('id'),
         )
-        
+        .order_by()
+    }
+
+    # Active products, plus retired ones that still have batches in the window
+    products = Product.objects.filter(Q(is_active=True) | Q(id__in=totals)).order_by('name')
+    product_data = []
+    for product in products:
+        row = totals.get(product.id, {})
+        revenue = row.get('total_revenue') or Decimal('0')
+        profit = row.get('total_profit') or Decimal('0')
+        expected = row.get('total_expected') or 0
+        variance = row.get('total_variance') or 0
         product_data.append({
             'product': product,
-            'produced': batches['total_produced'] or 0,
-            'revenue': batches['total_revenue'] or 0,
-            'cost': batches['total_cost'] or 0,
-            'profit': batches['total_profit'] or 0,
-            'margin': batches['avg_margin'] or 0,
-            'batches': batches['batch_count'] or 0,
+            'produced': row.get('total_produced') or 0,
+            'revenue': revenue,
+            'cost': row.get('total_cost') or Decimal('0'),
+            'profit': profit,
+            # Revenue-weighted, not an average of per-batch percentages
+            'margin': (profit / revenue * 100) if revenue else Decimal('0'),
+            'batches': row.get('batch_count') or 0,
+            'expected': expected,
+            'variance_packets': variance,
+            'variance_percentage': (Decimal(variance) / expected * 100) if expected else Decimal('0'),
         })
-    
+
     context = {
         'product_data': product_data,
         'days': days,
         'start_date': start_date,
+        'end_date': end_date,
     }
-    
+
     return render(request, 'analytics/product_performance.html', context)
 
 
@@ -261,3 +295,36 @@ def deficit_analysis_view(request):
         "<p>Sales app has been removed for rebuild.</p>"
         "<p><a href='/'>Return to Home</a></p>"
     )
+
+
+@login_required
+def metrics_api(request):
+    """
+    Stored daily metrics as chart series (JSON)
+    Query params: metrics=revenue,gross_profit  from=YYYY-MM-DD  to=YYYY-MM-DD
+                  bucket=day|week|month (default: day up to 92 days, else month)
+    Permission: SUPERADMIN, ADMIN
+    """
+    if request.user.role not in ANALYTICS_ROLES:
+        return JsonResponse({'error': 'You do not have permission to view analytics.'}, status=403)
+
+    keys = [key.strip() for key in request.GET.get('metrics', 'revenue').split(',') if key.strip()]
+    try:
+        end = date.fromisoformat(request.GET['to']) if request.GET.get('to') else timezone.localdate()
+        start = (
+            date.fromisoformat(request.GET['from']) if request.GET.get('from')
+            else end - timedelta(days=DEFAULT_METRIC_DAYS - 1)
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid date format. Use YYYY-MM-DD.'}, status=400)
+    if start > end or (end - start).days >= MAX_METRIC_DAYS:
+        return JsonResponse({'error': f'Date range must be 1 to {MAX_METRIC_DAYS} days.'}, status=400)
+
+    bucket = request.GET.get('bucket') or ('day' if (end - start).days < 92 else 'month')
+    try:
+        result = metric_series(keys, start, end, bucket)
+    except MetricError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    result['metrics'] = {key: METRICS[key][0] for key in keys}
+    return JsonResponse(result, encoder=DjangoJSONEncoder)
@@ -0,0 +1,235 @@
+"""
+Locked Period Registry
+Enforces closed books in the data layer (save / bulk_create / bulk_update)
+
+Lock sources:
+- AccountingPeriod.is_locked (CLOSED / RECONCILED month)
+- MonthlyPayroll.is_locked (FINALIZED payroll)
+- DailyProduction.is_closed (books closed at 9PM)
+
+The closed ids/months are loaded in 3 queries and cached in the process, so
+checking a write costs no query. The cache is invalidated by signals when a
+lock status changes (see apps/core/signals.py) and refreshed at least every
+REFRESH_SECONDS so other worker processes pick up changes made elsewhere.
+"""
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils import timezone
+
+
+REFRESH_SECONDS = 60
+
+# Admin/CEO/Manager may still edit closed production days (see production views)
+_closed_day_override = ContextVar('closed_day_override', default=False)
+
+
+class PeriodLockedError(ValidationError):
+    """Raised when a write targets a closed/finalized period"""
+
+
+LockSnapshot = namedtuple('LockSnapshot', [
+    'closed_period_ids',      # AccountingPeriod ids (CLOSED/RECONCILED)
+    'closed_months',          # {(year, month)} for closed accounting periods
+    'finalized_payroll_ids',  # MonthlyPayroll ids with status FINALIZED
+    'locked_payroll_ids',     # finalized + payrolls inside a closed month
+    'closed_day_ids',         # DailyProduction ids with is_closed=True
+    'period_locked_day_ids',  # DailyProduction ids inside a closed month
+])
+
+
+class LockedPeriodRegistry:
+    """Process-local cache of everything that is currently locked"""
+
+    def __init__(self):
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._mutex = threading.Lock()
+
+    def invalidate(self):
+        """Drop the cached snapshot (next check reloads it)"""
+        with self._mutex:
+            self._snapshot = None
+
+    def peek(self):
+        """Current snapshot without loading it (None if not loaded)"""
+        return self._snapshot
+
+    def snapshot(self):
+        snap = self._snapshot
+        if snap is None or time.monotonic() - self._loaded_at > REFRESH_SECONDS:
+            with self._mutex:
+                snap = self._load()
+                self._snapshot = snap
+                self._loaded_at = time.monotonic()
+        return snap
+
+    def _load(self):
+        from apps.accounting.models import AccountingPeriod
+        from apps.payroll.models import MonthlyPayroll
+        from apps.production.models import DailyProduction
+
+        closed_period_ids = set()
+        closed_months = set()
+        for period_id, year, month in AccountingPeriod.objects.filter(
+            status__in=['CLOSED', 'RECONCILED']
+        ).values_list('id', 'year', 'month'):
+            closed_period_ids.add(period_id)
+            closed_months.add((year, month))
+
+        finalized_payroll_ids = set()
+        locked_payroll_ids = set()
+        for payroll_id, year, month, status in MonthlyPayroll.objects.values_list(
+            'id', 'year', 'month', 'status'
+        ):
+            if status == 'FINALIZED':
+                finalized_payroll_ids.add(payroll_id)
+                locked_payroll_ids.add(payroll_id)
+            elif (year, month) in closed_months:
+                locked_payroll_ids.add(payroll_id)
+
+        day_filter = models.Q(is_closed=True)
+        for year, month in closed_months:
+            day_filter |= models.Q(date__year=year, date__month=month)
+
+        closed_day_ids = set()
+        period_locked_day_ids = set()
+        for day_id, day, is_closed in DailyProduction.objects.filter(
+            day_filter
+        ).values_list('id', 'date', 'is_closed'):
+            if is_closed:
+                closed_day_ids.add(day_id)
+            if (day.year, day.month) in closed_months:
+                period_locked_day_ids.add(day_id)
+
+        return LockSnapshot(
+            closed_period_ids=frozenset(closed_period_ids),
+            closed_months=frozenset(closed_months),
+            finalized_payroll_ids=frozenset(finalized_payroll_ids),
+            locked_payroll_ids=frozenset(locked_payroll_ids),
+            closed_day_ids=frozenset(closed_day_ids),
+            period_locked_day_ids=frozenset(period_locked_day_ids),
+        )
+
+    # ------------------------------------------------------------------
+    # Checks (no database access once the snapshot is loaded)
+    # ------------------------------------------------------------------
+
+    def is_month_locked(self, year, month):
+        return (year, month) in self.snapshot().closed_months
+
+    def is_period_locked(self, period_id):
+        return period_id in self.snapshot().closed_period_ids
+
+    def is_payroll_locked(self, payroll_id):
+        return payroll_id in self.snapshot().locked_payroll_ids
+
+    def is_production_day_locked(self, daily_production_id):
+        snap = self.snapshot()
+        if daily_production_id in snap.period_locked_day_ids:
+            return True
+        if _closed_day_override.get():
+            return False
+        return daily_production_id in snap.closed_day_ids
+
+
+registry = LockedPeriodRegistry()
+
+
+@contextmanager
+def allow_closed_day_edits():
+    """
+    Permit writes to closed production days (not to closed accounting months)
+    Used by book closing itself and by views that already checked the user
+    is allowed to edit closed books.
+    """
+    token = _closed_day_override.set(True)
+    try:
+        yield
+    finally:
+        _closed_day_override.reset(token)
+
+
+# ============================================================================
+# PER-MODEL ASSERTIONS
+# ============================================================================
+
+def assert_batches_writable(batches):
+    """ProductionBatch: locked by closed day or closed accounting month"""
+    for batch in batches:
+        if registry.is_production_day_locked(batch.daily_production_id):
+            raise PeriodLockedError(
+                f"Cannot modify batch #{batch.batch_number}: production day is closed"
+            )
+
+
+def assert_payroll_items_writable(items):
+    """PayrollItem: locked by FINALIZED payroll or closed accounting month"""
+    for item in items:
+        if registry.is_payroll_locked(item.payroll_id):
+            raise PeriodLockedError(
+                "Cannot modify payroll item: payroll is finalized or its accounting period is closed"
+            )
+
+
+def assert_journal_lines_writable(lines):
+    """
+    JournalEntryLine: locked by the entry's accounting period
+    Uses the cached journal_entry when present; otherwise one query for the whole batch
+    """
+    from apps.accounting.models import JournalEntry, JournalEntryLine
+
+    lines = list(lines)
+    descriptor = JournalEntryLine.journal_entry
+    missing = {
+        line.journal_entry_id for line in lines
+        if not descriptor.is_cached(line)
+    }
+    period_by_entry = {}
+    if missing:
+        period_by_entry = dict(
+            JournalEntry.objects.filter(id__in=missing).values_list('id', 'accounting_period_id')
+        )
+
+    for line in lines:
+        if descriptor.is_cached(line):
+            period_id = line.journal_entry.accounting_period_id
+        else:
+            period_id = period_by_entry.get(line.journal_entry_id)
+        if registry.is_period_locked(period_id):
+            raise PeriodLockedError(
+                "Cannot modify journal line: accounting period is closed"
+            )
+
+
+def assert_stock_movements_writable(movements):
+    """StockMovement: locked by the accounting month it was (or is being) recorded in"""
+    today = timezone.localdate()
+    for movement in movements:
+        when = timezone.localdate(movement.created_at) if movement.created_at else today
+        if registry.is_month_locked(when.year, when.month):
+            raise PeriodLockedError(
+                f"Cannot record stock movement: accounting period {when:%B %Y} is closed"
+            )
+
+
+class PeriodLockedQuerySet(models.QuerySet):
+    """
+    QuerySet that runs the model's period lock check on bulk writes
+    Models define a classmethod assert_period_open(instances)
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        self.model.assert_period_open(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        self.model.assert_period_open(objs)
+        return super().bulk_update(objs, fields, *args, **kwargs)
@@ -0,0 +1,46 @@
+"""
+Core App Signals
+Keep the locked period registry in sync with lock status changes
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .period_locks import registry
+
+
+@receiver(post_save, sender='accounting.AccountingPeriod')
+def accounting_period_lock_changed(sender, instance, created, **kwargs):
+    """Invalidate when a period is closed/reopened"""
+    snap = registry.peek()
+    if snap is not None and instance.is_locked != (instance.pk in snap.closed_period_ids):
+        registry.invalidate()
+
+
+@receiver(post_save, sender='payroll.MonthlyPayroll')
+def monthly_payroll_lock_changed(sender, instance, created, **kwargs):
+    """Invalidate when a payroll is finalized, or a new payroll lands in a closed month"""
+    snap = registry.peek()
+    if snap is None:
+        return
+    if created or instance.is_locked != (instance.pk in snap.finalized_payroll_ids):
+        registry.invalidate()
+
+
+@receiver(post_save, sender='production.DailyProduction')
+def daily_production_lock_changed(sender, instance, created, **kwargs):
+    """Invalidate when books close/reopen, or a day is created inside a closed month"""
+    snap = registry.peek()
+    if snap is None:
+        return
+    if created:
+        if (instance.date.year, instance.date.month) in snap.closed_months:
+            registry.invalidate()
+    elif instance.is_closed != (instance.pk in snap.closed_day_ids):
+        registry.invalidate()
+
+
+@receiver(post_delete, sender='accounting.AccountingPeriod')
+@receiver(post_delete, sender='payroll.MonthlyPayroll')
+@receiver(post_delete, sender='production.DailyProduction')
+def lock_source_deleted(sender, instance, **kwargs):
+    registry.invalidate()
@@ -198,8 +198,8 @@ class PurchaseItemAdmin(admin.ModelAdmin):
     """
     Purchase item management (backup to inline)
     """
-    list_display = ['purchase', 'item', 'quantity', 'unit_cost', 'total_cost']
-    list_filter = ['purchase__status', 'item__category']
+    list_display = ['purchase', 'item', 'quantity', 'unit_cost', 'total_cost', 'expense_category']
+    list_filter = ['purchase__status', 'item__category', 'expense_category']
     search_fields = ['item__name', 'purchase__purchase_number']
     
     fieldsets = (
@@ -210,13 +210,17 @@ class PurchaseItemAdmin(admin.ModelAdmin):
             'fields': ('quantity', 'unit_cost', 'total_cost'),
             'description': '🤖 total_cost is auto-calculated'
         }),
+        ('Expense Classification', {
+            'fields': ('expense_category', 'purchase_date'),
+            'description': '🤖 Tagged automatically when the purchase is received'
+        }),
         ('Metadata', {
             'fields': ('added_at',),
             'classes': ('collapse',)
         }),
     )
     
-    readonly_fields = ['total_cost', 'added_at']
+    readonly_fields = ['total_cost', 'expense_category', 'purchase_date', 'added_at']
 
 
 @admin.register(StockMovement)
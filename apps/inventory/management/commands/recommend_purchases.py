@@ -0,0 +1,71 @@
+"""
+Management command to create DRAFT restock purchases from forecast usage
+Review the drafts in the admin, then mark them ORDERED
+
+Usage:
+    python manage.py recommend_purchases
+    python manage.py recommend_purchases --dry-run
+    python manage.py recommend_purchases --cover-days 14
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.inventory.models import Supplier
+from apps.inventory.services.purchasing import COVER_DAYS, recommend_purchases
+
+
+class Command(BaseCommand):
+    help = 'Suggest restock orders per supplier and save them as DRAFT purchases'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--cover-days',
+            type=int,
+            default=COVER_DAYS,
+            help=f'Days of usage an order covers beyond the lead time (default {COVER_DAYS})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the suggested orders without creating purchases',
+        )
+
+    def handle(self, *args, **options):
+        if options['cover_days'] < 0:
+            raise CommandError('--cover-days cannot be negative')
+
+        system_user = User.objects.filter(is_superuser=True).first()
+        result = recommend_purchases(
+            user=system_user,
+            create=not options['dry_run'],
+            cover_days=options['cover_days'],
+        )
+
+        orders = result['orders']
+        if not orders and not result['unassigned']:
+            self.stdout.write(self.style.SUCCESS('✅ Stock is sufficient - no purchases needed'))
+            return
+
+        suppliers = Supplier.objects.in_bulk([order['supplier_id'] for order in orders])
+        for order in orders:
+            purchase = order['purchase']
+            label = purchase.purchase_number if purchase else 'Would create'
+            self.stdout.write(self.style.SUCCESS(
+                f"📦 {label}: {suppliers[order['supplier_id']].name} - "
+                f"KES {order['total']:,.2f}, delivery in ~{order['lead_days']} day(s)"
+            ))
+            for line in order['lines']:
+                item = line['item']
+                self.stdout.write(
+                    f"  - {item.name}: {line['quantity']} {item.purchase_unit} "
+                    f"@ KES {line['unit_cost']:,.2f}"
+                )
+
+        if result['unassigned']:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️  {len(result['unassigned'])} item(s) need restocking but have no purchase "
+                f"history with an active supplier:"
+            ))
+            for entry in result['unassigned']:
+                item = entry['item']
+                self.stdout.write(f"  - {item.name}: {entry['quantity']} {item.purchase_unit}")
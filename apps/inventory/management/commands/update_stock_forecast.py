@@ -0,0 +1,37 @@
+"""
+Management command to recompute usage rates, days of supply and restock alerts
+close_daily_books runs it every evening; use this to refresh in between
+
+Usage:
+    python manage.py update_stock_forecast
+    python manage.py update_stock_forecast --window 14
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.services.consumption import WINDOW_DAYS, update_stock_forecast
+
+
+class Command(BaseCommand):
+    help = 'Recompute inventory usage rates, days_remaining and restock alerts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=WINDOW_DAYS,
+            help=f'Trailing days of production usage (default {WINDOW_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        if options['window'] < 1:
+            raise CommandError('--window must be at least 1')
+
+        result = update_stock_forecast(window_days=options['window'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Stock forecast updated: {result['items']} items, {result['updated']} changed"
+        ))
+        if result['alerts']:
+            for level, count in sorted(result['alerts'].items()):
+                self.stdout.write(self.style.WARNING(f'  🚨 {count} new {level} alert(s)'))
+        else:
+            self.stdout.write('  - No new restock alerts')
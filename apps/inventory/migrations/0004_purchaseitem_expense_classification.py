@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:48
+
+from django.db import migrations, models
+
+
+def classify_received_purchase_items(apps, schema_editor):
+    """Tag lines of purchases already RECEIVED before classification existed"""
+    PurchaseItem = apps.get_model('inventory', 'PurchaseItem')
+    items = list(
+        PurchaseItem.objects.filter(purchase__status='RECEIVED')
+        .select_related('purchase', 'item__category')
+    )
+    for purchase_item in items:
+        purchase_item.expense_category = purchase_item.item.category.code
+        purchase_item.purchase_date = purchase_item.purchase.purchase_date
+    PurchaseItem.objects.bulk_update(items, ['expense_category', 'purchase_date'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_alter_cratemovement_movement_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchaseitem',
+            name='expense_category',
+            field=models.CharField(blank=True, choices=[('RAW_MATERIALS', 'Raw Materials'), ('PACKAGING', 'Packaging'), ('FUEL_ENERGY', 'Fuel & Energy'), ('CONSUMABLES', 'Consumables'), ('OTHER', 'Other')], help_text='🤖 AUTO: ExpenseCategory.code of the item at receipt', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='purchaseitem',
+            name='purchase_date',
+            field=models.DateField(blank=True, help_text='🤖 AUTO: Purchase date copied at receipt (for period expense totals)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='purchaseitem',
+            index=models.Index(fields=['purchase_date', 'expense_category'], name='inventory_p_purchas_563268_idx'),
+        ),
+        migrations.RunPython(classify_received_purchase_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_purchaseitem_expense_classification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stockmovement',
+            name='total_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='🤖 AUTO: |quantity| × unit_cost', max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='stockmovement',
+            name='unit_cost',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='🤖 AUTO: Cost per recipe_unit from purchase layers (FIFO / weighted average)', max_digits=12, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['item', 'created_at'], name='inventory_s_item_id_a9fe64_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockmovement',
+            index=models.Index(fields=['reference_type', 'reference_id'], name='inventory_s_referen_5aaa1a_idx'),
+        ),
+    ]
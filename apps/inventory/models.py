@@ -5,6 +5,7 @@ Manages ingredients, stock, purchases, and restocking for Chesanto Bakery
 from django.db import models
 from django.conf import settings
 from decimal import Decimal
+from apps.core.period_locks import PeriodLockedQuerySet, assert_stock_movements_writable
 
 
 class ExpenseCategory(models.Model):
@@ -315,6 +316,19 @@ class PurchaseItem(models.Model):
         help_text="🤖 AUTO: quantity × unit_cost"
     )
     
+    # Expense Classification (tagged when the purchase is RECEIVED)
+    expense_category = models.CharField(
+        max_length=20,
+        choices=ExpenseCategory.CATEGORY_CHOICES,
+        blank=True,
+        help_text="🤖 AUTO: ExpenseCategory.code of the item at receipt"
+    )
+    purchase_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="🤖 AUTO: Purchase date copied at receipt (for period expense totals)"
+    )
+    
     # Metadata
     added_at = models.DateTimeField(auto_now_add=True)
     
@@ -323,13 +337,19 @@ class PurchaseItem(models.Model):
         verbose_name = "Purchase Item"
         verbose_name_plural = "Purchase Items"
         unique_together = ['purchase', 'item']
+        indexes = [
+            models.Index(fields=['purchase_date', 'expense_category']),
+        ]
     
     def __str__(self):
         return f"{self.item.name}: {self.quantity} {self.item.purchase_unit}"
     
     def save(self, *args, **kwargs):
-        """Auto-calculate total_cost"""
+        """Auto-calculate total_cost (and classify if the purchase is already received)"""
         self.total_cost = self.quantity * self.unit_cost
+        if self.purchase.status == 'RECEIVED':
+            self.expense_category = self.item.category.code
+            self.purchase_date = self.purchase.purchase_date
         super().save(*args, **kwargs)
         
         # Note: Stock update is handled by Purchase signal when status = RECEIVED
@@ -382,6 +402,22 @@ class StockMovement(models.Model):
     stock_before = models.DecimalField(max_digits=12, decimal_places=3)
     stock_after = models.DecimalField(max_digits=12, decimal_places=3)
     
+    # Valuation (PRODUCTION movements, set by the costing engine)
+    unit_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        help_text="🤖 AUTO: Cost per recipe_unit from purchase layers (FIFO / weighted average)"
+    )
+    total_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="🤖 AUTO: |quantity| × unit_cost"
+    )
+    
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
@@ -395,9 +431,28 @@ class StockMovement(models.Model):
         ordering = ['-created_at']
         verbose_name = "Stock Movement"
         verbose_name_plural = "Stock Movements"
+        indexes = [
+            models.Index(fields=['item', 'created_at']),
+            models.Index(fields=['reference_type', 'reference_id']),
+        ]
+    
+    objects = PeriodLockedQuerySet.as_manager()
     
     def __str__(self):
         return f"{self.item.name}: {self.quantity:+} {self.unit} ({self.movement_type})"
+    
+    @classmethod
+    def assert_period_open(cls, movements):
+        """Raise PeriodLockedError if any movement falls in a closed accounting month"""
+        assert_stock_movements_writable(movements)
+    
+    def clean(self):
+        """Validate the accounting period is still open"""
+        self.assert_period_open([self])
+    
+    def save(self, *args, **kwargs):
+        self.assert_period_open([self])
+        super().save(*args, **kwargs)
 
 
 class WastageRecord(models.Model):
@@ -0,0 +1,177 @@
+"""
+Consumption Forecast Service
+Daily usage rate, days of supply and restock alerts per inventory item
+
+The usage rate comes from PRODUCTION stock movements over a trailing window
+ending on the last closed production day (usage_window_end), read with one
+grouped query (item, day). Book closing, update_stock_forecast and purchase
+recommendations all read that same window, so they agree on the rate. Days
+without production count as zero usage, and the series is exponentially
+smoothed so recent days weigh more than the start of the window.
+
+days_remaining = current_stock / rate (NO_USAGE_DAYS when nothing is used),
+low_stock_alert = below reorder level or under LOW_DAYS of supply. Both are
+written with one bulk update; RestockAlerts are created for items that do
+not already have an open (unacknowledged) alert at the same level.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.inventory.models import InventoryItem, RestockAlert, StockMovement
+from apps.production.models import DailyProduction
+
+
+WINDOW_DAYS = 28
+SMOOTHING = Decimal('0.3')  # weight of each new day in the smoothed rate
+
+LOW_DAYS = 7
+CRITICAL_DAYS = 3
+NO_USAGE_DAYS = 999  # days_remaining for items nothing consumes (also the cap)
+
+ZERO = Decimal('0')
+
+
+def usage_window_end():
+    """
+    Day after the last closed production day (the window runs through it);
+    today while no day has been closed - an open day's usage is incomplete
+    """
+    last_closed = DailyProduction.objects.filter(is_closed=True).aggregate(last=Max('date'))['last']
+    return last_closed + timedelta(days=1) if last_closed else timezone.localdate()
+
+
+def daily_usage(end=None, window_days=WINDOW_DAYS):
+    """
+    Production usage per item per day for the window_days before `end`
+    (default usage_window_end(): through the last closed day)
+    Returns ({item_id: {date: quantity used}}, [dates in the window])
+    """
+    end = end or usage_window_end()
+    days = [end - timedelta(days=offset) for offset in range(window_days, 0, -1)]
+    start = timezone.make_aware(datetime.combine(days[0], time.min))
+    stop = timezone.make_aware(datetime.combine(end, time.min))
+    usage = defaultdict(dict)
+    rows = (
+        StockMovement.objects
+        .filter(movement_type='PRODUCTION', created_at__gte=start, created_at__lt=stop)
+        .annotate(day=TruncDate('created_at'))
+        .values('item_id', 'day')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+    for row in rows:
+        # Deductions are stored as negative quantities
+        usage[row['item_id']][row['day']] = -row['quantity']
+    return usage, days
+
+
+def smoothed_rate(series, alpha=SMOOTHING):
+    """
+    Exponentially smoothed daily rate of a series (oldest first)
+    Seeded with the window mean so a quiet first day does not drag it down
+    """
+    if not series:
+        return ZERO
+    rate = sum(series, ZERO) / len(series)
+    for value in series:
+        rate = alpha * value + (1 - alpha) * rate
+    return max(rate, ZERO)
+
+
+def days_of_supply(stock, rate):
+    if stock <= 0:
+        return 0
+    if rate <= 0:
+        return NO_USAGE_DAYS
+    return min(int(stock / rate), NO_USAGE_DAYS)
+
+
+def alert_level(item, days):
+    """RestockAlert level for an item, or None if stock is adequate"""
+    if item.current_stock <= 0:
+        return 'OUT'
+    if days < CRITICAL_DAYS:
+        return 'CRITICAL'
+    if days < LOW_DAYS or item.current_stock < item.reorder_level:
+        return 'LOW'
+    return None
+
+
+def update_stock_forecast(end=None, window_days=WINDOW_DAYS):
+    """
+    Recompute usage rate, days_remaining and low_stock_alert for every
+    active item and raise restock alerts
+
+    Queries: usage (1) + items (1) + bulk update + open alerts (1) + bulk create
+    Returns {'items', 'updated', 'rates': {item_id: rate}, 'alerts': {level: created}}
+    """
+    usage, days = daily_usage(end, window_days)
+    items = list(InventoryItem.objects.filter(is_active=True))
+
+    rates = {}
+    changed = []
+    levels = {}
+    for item in items:
+        item_usage = usage.get(item.id, {})
+        rate = smoothed_rate([item_usage.get(day, ZERO) for day in days])
+        rates[item.id] = rate
+
+        remaining = days_of_supply(item.current_stock, rate)
+        low = item.current_stock < item.reorder_level or remaining < LOW_DAYS
+        if item.days_remaining != remaining or item.low_stock_alert != low:
+            item.days_remaining = remaining
+            item.low_stock_alert = low
+            changed.append(item)
+
+        level = alert_level(item, remaining)
+        if level:
+            levels[item.id] = (level, rate)
+
+    if changed:
+        InventoryItem.objects.bulk_update(changed, ['days_remaining', 'low_stock_alert'])
+
+    open_alerts = set(
+        RestockAlert.objects
+        .filter(is_acknowledged=False, item_id__in=levels)
+        .values_list('item_id', 'alert_level')
+    )
+    alerts = []
+    by_id = {item.id: item for item in items}
+    for item_id, (level, rate) in levels.items():
+        if (item_id, level) in open_alerts:
+            continue
+        item = by_id[item_id]
+        alerts.append(RestockAlert(
+            item=item,
+            alert_level=level,
+            days_remaining=item.days_remaining,
+            message=_alert_message(item, level, rate),
+        ))
+    RestockAlert.objects.bulk_create(alerts)
+
+    created = defaultdict(int)
+    for alert in alerts:
+        created[alert.alert_level] += 1
+    return {
+        'items': len(items),
+        'updated': len(changed),
+        'rates': rates,
+        'alerts': dict(created),
+    }
+
+
+def _alert_message(item, level, rate):
+    if level == 'OUT':
+        return f"{item.name} is out of stock"
+    stock = f"{item.current_stock:,.2f} {item.recipe_unit}"
+    if rate > 0:
+        return (
+            f"{item.name}: {stock} left, about {item.days_remaining} day(s) "
+            f"at {rate:,.2f} {item.recipe_unit}/day"
+        )
+    return f"{item.name}: {stock} left, below reorder level of {item.reorder_level:,.2f}"
@@ -0,0 +1,68 @@
+"""
+Expense Classification Service
+Tags purchase lines with their expense category at receipt time
+
+Each PurchaseItem carries the ExpenseCategory.code of its item and the purchase
+date, so period expense totals per category come from a single grouped aggregate
+on PurchaseItem.total_cost (indexed on purchase_date + expense_category) instead
+of joining Purchase → items → item → category and double-counting totals.
+"""
+from decimal import Decimal
+
+from django.db.models import Sum
+
+from apps.inventory.models import PurchaseItem
+
+
+# Direct costs (RAW_MATERIALS, PACKAGING) are costed through ProductionBatch and
+# FUEL_ENERGY through IndirectCost - only these count as "other expenses"
+OTHER_EXPENSE_CODES = ('CONSUMABLES', 'OTHER')
+
+
+def classify_purchase(purchase):
+    """
+    Tag every line of a received purchase with its expense category and date
+    One read (joined to item category) + one bulk update
+    """
+    items = list(purchase.purchaseitem_set.select_related('item__category'))
+    for purchase_item in items:
+        purchase_item.expense_category = purchase_item.item.category.code
+        purchase_item.purchase_date = purchase.purchase_date
+
+    if items:
+        PurchaseItem.objects.bulk_update(items, ['expense_category', 'purchase_date'])
+    return len(items)
+
+
+def unclassify_purchase(purchase):
+    """Remove tags when a purchase leaves RECEIVED (e.g. cancelled)"""
+    return purchase.purchaseitem_set.update(expense_category='', purchase_date=None)
+
+
+def expense_totals_by_category(start_date, end_date):
+    """
+    Received purchase totals per ExpenseCategory.code for [start_date, end_date)
+    Returns {code: Decimal} - categories with no purchases are omitted
+    """
+    rows = (
+        PurchaseItem.objects
+        .filter(purchase_date__gte=start_date, purchase_date__lt=end_date)
+        .exclude(expense_category='')
+        .order_by()
+        .values('expense_category')
+        .annotate(total=Sum('total_cost'))
+    )
+    return {
+        row['expense_category']: row['total'] or Decimal('0.00')
+        for row in rows
+    }
+
+
+def other_expenses_total(start_date, end_date, totals=None):
+    """Sum of the non-production categories for the period"""
+    if totals is None:
+        totals = expense_totals_by_category(start_date, end_date)
+    return sum(
+        (totals.get(code, Decimal('0.00')) for code in OTHER_EXPENSE_CODES),
+        Decimal('0.00')
+    )
@@ -0,0 +1,204 @@
+"""
+Purchase Recommendation Service
+Suggested restock orders per supplier, created as DRAFT purchases
+
+For each active item:
+- usage rate: smoothed daily PRODUCTION usage through the last closed day
+  (consumption service)
+- lead time: the supplier's average expected_delivery_date - purchase_date
+  of its ORDERED / RECEIVED purchases
+- on order: quantities already on DRAFT / ORDERED purchases
+An item needs ordering when the stock left on arrival (stock + on order -
+rate × lead time) would be under its reorder level. The order tops it up to
+reorder level + usage over lead time + COVER_DAYS, rounded up to whole
+purchase units, from the supplier with the lowest last unit cost.
+
+Everything comes from grouped queries (usage, items, on order, last cost
+per item and supplier, lead time per supplier), then the purchases and
+their lines are written with two bulk inserts. Open purchases count as
+on order, so running it again does not duplicate an order.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal, ROUND_CEILING
+
+from django.db import transaction
+from django.db.models import Avg, DurationField, ExpressionWrapper, F, Max, Sum
+from django.utils import timezone
+
+from apps.inventory.models import InventoryItem, Purchase, PurchaseItem
+from apps.inventory.services.consumption import daily_usage, smoothed_rate
+
+
+COVER_DAYS = 7  # usage an order should cover beyond the lead time
+DEFAULT_LEAD_DAYS = 2  # suppliers without expected delivery dates on record
+OPEN_STATUSES = ('DRAFT', 'ORDERED')
+PRICED_STATUSES = ('ORDERED', 'RECEIVED')
+RECOMMENDATION_NOTE = 'Suggested restock order (recommend_purchases) - review before ordering'
+
+ZERO = Decimal('0')
+MONEY = Decimal('0.01')
+
+
+def _on_order(item_ids):
+    """{item_id: quantity in purchase units} on open purchases"""
+    return dict(
+        PurchaseItem.objects
+        .filter(item_id__in=item_ids, purchase__status__in=OPEN_STATUSES)
+        .values_list('item_id')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+
+
+def _last_costs(item_ids):
+    """
+    {item_id: {supplier_id: last unit_cost}} from the latest ordered or
+    received line per item and (active) supplier
+    """
+    latest = (
+        PurchaseItem.objects
+        .filter(
+            item_id__in=item_ids,
+            purchase__status__in=PRICED_STATUSES,
+            purchase__supplier__is_active=True,
+        )
+        .values('item_id', 'purchase__supplier_id')
+        .annotate(last_id=Max('id'))
+        .values('last_id')
+    )
+    costs = defaultdict(dict)
+    for item_id, supplier_id, unit_cost in PurchaseItem.objects.filter(
+        id__in=latest
+    ).values_list('item_id', 'purchase__supplier_id', 'unit_cost'):
+        costs[item_id][supplier_id] = unit_cost
+    return costs
+
+
+def _lead_times(supplier_ids):
+    """
+    {supplier_id: average lead time in whole days (rounded up)}
+    Placed orders only - the DRAFTs created here carry today + this estimate,
+    so counting them would feed each rounded-up guess back into the average
+    """
+    lead = ExpressionWrapper(F('expected_delivery_date') - F('purchase_date'), output_field=DurationField())
+    rows = (
+        Purchase.objects
+        .filter(
+            supplier_id__in=supplier_ids,
+            status__in=PRICED_STATUSES,
+            expected_delivery_date__isnull=False,
+        )
+        .values_list('supplier_id')
+        .annotate(lead=Avg(lead))
+        .order_by()
+    )
+    return {
+        supplier_id: max(0, -int(-average.total_seconds() // 86400))
+        for supplier_id, average in rows
+        if average is not None
+    }
+
+
+def recommend_purchases(user=None, create=True, cover_days=COVER_DAYS, today=None):
+    """
+    Work out restock quantities and (unless create=False) save them as
+    DRAFT purchases, one per supplier
+
+    Returns {
+        'orders': [{supplier_id, lead_days, purchase (None if not created),
+                    total, lines: [{item, quantity, unit_cost, total_cost}]}],
+        'unassigned': [{item, quantity}] - items needing stock that were
+                      never bought from an active supplier (no price)
+    }
+    """
+    today = today or timezone.localdate()
+    usage, days = daily_usage()
+    items = {item.id: item for item in InventoryItem.objects.filter(is_active=True)}
+
+    on_order = _on_order(list(items))
+    costs = _last_costs(list(items))
+    leads = _lead_times({supplier_id for prices in costs.values() for supplier_id in prices})
+
+    orders = defaultdict(list)
+    unassigned = []
+    for item_id, item in items.items():
+        rate = smoothed_rate([usage.get(item_id, {}).get(day, ZERO) for day in days])
+        factor = item.conversion_factor if item.conversion_factor > 0 else Decimal('1')
+        available = item.current_stock + on_order.get(item_id, ZERO) * factor
+
+        prices = costs.get(item_id, {})
+        # Cheapest last price, then the shorter lead time
+        supplier_id = min(
+            prices,
+            key=lambda supplier: (prices[supplier], leads.get(supplier, DEFAULT_LEAD_DAYS)),
+            default=None,
+        )
+        lead_days = leads.get(supplier_id, DEFAULT_LEAD_DAYS)
+
+        if available - rate * lead_days >= item.reorder_level:
+            continue
+        shortfall = item.reorder_level + rate * (lead_days + cover_days) - available
+        quantity = (shortfall / factor).to_integral_value(rounding=ROUND_CEILING)
+        if quantity <= 0:
+            continue
+
+        if supplier_id is None:
+            unassigned.append({'item': item, 'quantity': quantity})
+            continue
+        unit_cost = prices[supplier_id]
+        orders[supplier_id].append({
+            'item': item,
+            'quantity': quantity,
+            'unit_cost': unit_cost,
+            'total_cost': (quantity * unit_cost).quantize(MONEY),
+        })
+
+    results = [
+        {
+            'supplier_id': supplier_id,
+            'lead_days': leads.get(supplier_id, DEFAULT_LEAD_DAYS),
+            'purchase': None,
+            'total': sum((line['total_cost'] for line in lines), ZERO),
+            'lines': sorted(lines, key=lambda line: line['item'].name),
+        }
+        for supplier_id, lines in orders.items()
+    ]
+    if create and results:
+        _create_drafts(results, user, today)
+    return {'orders': results, 'unassigned': unassigned}
+
+
+def _create_drafts(orders, user, today):
+    """One DRAFT purchase per supplier order + its lines, two bulk inserts"""
+    # Purchase.save() numbering (PUR-YYYYMMDD-NNN), which bulk_create skips
+    prefix = f"PUR-{today.strftime('%Y%m%d')}"
+    with transaction.atomic():
+        start = Purchase.objects.filter(purchase_number__startswith=prefix).count()
+        purchases = Purchase.objects.bulk_create([
+            Purchase(
+                purchase_number=f'{prefix}-{start + index:03d}',
+                supplier_id=order['supplier_id'],
+                purchase_date=today,
+                expected_delivery_date=today + timedelta(days=order['lead_days']),
+                status='DRAFT',
+                total_amount=order['total'],
+                notes=RECOMMENDATION_NOTE,
+                created_by=user,
+                updated_by=user,
+            )
+            for index, order in enumerate(orders, start=1)
+        ])
+        PurchaseItem.objects.bulk_create([
+            PurchaseItem(
+                purchase=purchase,
+                item=line['item'],
+                quantity=line['quantity'],
+                unit_cost=line['unit_cost'],
+                total_cost=line['total_cost'],
+            )
+            for purchase, order in zip(purchases, orders)
+            for line in order['lines']
+        ])
+    for purchase, order in zip(purchases, orders):
+        order['purchase'] = purchase
@@ -4,6 +4,7 @@ Inventory app signals for automated stock updates
 from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 from .models import Purchase, PurchaseItem, StockMovement, CrateStock, CrateMovement
+from .services.expense_classification import classify_purchase, unclassify_purchase
 
 
 @receiver(pre_save, sender=Purchase)
@@ -64,7 +65,14 @@ def update_inventory_on_receipt(sender, instance, created, **kwargs):
             
             print(f"  ✅ Updated {item.name}: {stock_before:.2f} → {stock_after:.2f} {item.recipe_unit}")
         
+        # Tag lines with their expense category for period expense totals
+        classify_purchase(instance)
+        
         print(f"✅ Purchase {instance.purchase_number} received and inventory updated\n")
+    
+    elif previous_status == 'RECEIVED' and instance.status != 'RECEIVED':
+        # No longer a received expense
+        unclassify_purchase(instance)
 
 
 # ============================================================================
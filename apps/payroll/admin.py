@@ -1,7 +1,12 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db.models import F
 from django.utils.html import format_html
 from django.utils import timezone
-from .models import Employee, MonthlyPayroll, PayrollItem, CasualLabor
+from apps.core.period_locks import PeriodLockedError
+from .models import (
+    Employee, MonthlyPayroll, PayrollItem, CasualLabor, CasualLaborPayout, BankPaymentFile,
+    ClockEvent, AttendanceDay
+)
 
 
 @admin.register(Employee)
@@ -22,10 +27,11 @@ class EmployeeAdmin(admin.ModelAdmin):
     list_filter = ['status', 'employee_type', 'department', 'hire_date']
     search_fields = ['employee_id', 'first_name', 'last_name', 'email', 'kra_pin']
     readonly_fields = ['created_at', 'updated_at', 'gross_salary_display']
+    autocomplete_fields = ['user']
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('employee_id', 'first_name', 'last_name', 'email', 'phone')
+            'fields': ('employee_id', 'user', 'first_name', 'last_name', 'email', 'phone')
         }),
         ('Employment Details', {
             'fields': ('employee_type', 'status', 'position', 'department', 'hire_date', 'termination_date')
@@ -75,6 +81,13 @@ class EmployeeAdmin(admin.ModelAdmin):
     def gross_salary_display(self, obj):
         return format_html('KES {:,.2f}', obj.gross_salary)
     gross_salary_display.short_description = 'Gross Salary'
+    gross_salary_display.admin_order_field = 'gross_pay'
+    
+    def get_queryset(self, request):
+        # Employee has no stored gross column - annotate it so the list can sort on it
+        return super().get_queryset(request).annotate(
+            gross_pay=F('basic_salary') + F('housing_allowance') + F('transport_allowance') + F('other_allowances')
+        )
 
 
 class PayrollItemInline(admin.TabularInline):
@@ -259,6 +272,38 @@ class MonthlyPayrollAdmin(admin.ModelAdmin):
         obj.calculate_totals()
 
 
+class NetPayRangeFilter(admin.SimpleListFilter):
+    """Filter payroll items by net pay band (uses the net_pay column)"""
+    title = 'net pay'
+    parameter_name = 'net_pay'
+    
+    BANDS = {
+        'under_20k': (None, 20000),
+        '20k_50k': (20000, 50000),
+        '50k_100k': (50000, 100000),
+        'over_100k': (100000, None),
+    }
+    
+    def lookups(self, request, model_admin):
+        return [
+            ('under_20k', 'Under KES 20,000'),
+            ('20k_50k', 'KES 20,000 - 50,000'),
+            ('50k_100k', 'KES 50,000 - 100,000'),
+            ('over_100k', 'Over KES 100,000'),
+        ]
+    
+    def queryset(self, request, queryset):
+        band = self.BANDS.get(self.value())
+        if not band:
+            return queryset
+        low, high = band
+        if low is not None:
+            queryset = queryset.filter(net_pay__gte=low)
+        if high is not None:
+            queryset = queryset.filter(net_pay__lt=high)
+        return queryset
+
+
 @admin.register(PayrollItem)
 class PayrollItemAdmin(admin.ModelAdmin):
     """
@@ -272,7 +317,7 @@ class PayrollItemAdmin(admin.ModelAdmin):
         'other_deductions_display',
         'net_salary_display'
     ]
-    list_filter = ['payroll__year', 'payroll__month']
+    list_filter = ['payroll__year', 'payroll__month', NetPayRangeFilter]
     search_fields = ['employee__employee_id', 'employee__first_name', 'employee__last_name']
     readonly_fields = [
         'gross_salary_display',
@@ -339,6 +384,7 @@ class PayrollItemAdmin(admin.ModelAdmin):
     def gross_salary_display(self, obj):
         return format_html('KES {:,.2f}', obj.gross_salary)
     gross_salary_display.short_description = 'Gross Salary'
+    gross_salary_display.admin_order_field = 'gross_pay'
     
     def statutory_deductions_display(self, obj):
         return format_html('KES {:,.2f}', obj.total_statutory_deductions)
@@ -351,6 +397,7 @@ class PayrollItemAdmin(admin.ModelAdmin):
     def net_salary_display(self, obj):
         return format_html('<strong>KES {:,.2f}</strong>', obj.net_salary)
     net_salary_display.short_description = 'Net Salary'
+    net_salary_display.admin_order_field = 'net_pay'
     
     def total_statutory_deductions_display(self, obj):
         return format_html('KES {:,.2f}', obj.total_statutory_deductions)
@@ -368,10 +415,11 @@ class PayrollItemAdmin(admin.ModelAdmin):
     
     def calculate_statutory_deductions_action(self, request, queryset):
         """Bulk action to calculate statutory deductions for selected items"""
-        count = 0
-        for item in queryset:
-            item.calculate_statutory_deductions()
-            count += 1
+        items = list(queryset.select_related('employee', 'payroll'))
+        for item in items:
+            item.compute_statutory_deductions()
+        PayrollItem.objects.bulk_update(items, ['paye', 'nhif', 'nssf', 'pension'])
+        count = len(items)
         self.message_user(request, f'Successfully calculated statutory deductions for {count} payroll item(s).')
     calculate_statutory_deductions_action.short_description = 'Calculate statutory deductions'
 
@@ -391,7 +439,7 @@ class CasualLaborAdmin(admin.ModelAdmin):
     ]
     list_filter = ['payment_status', 'date']
     search_fields = ['worker_name', 'task_description']
-    readonly_fields = ['total_amount_display', 'created_at', 'updated_at']
+    readonly_fields = ['total_amount_display', 'payout', 'created_at', 'updated_at']
     date_hierarchy = 'date'
     
     fieldsets = (
@@ -403,7 +451,8 @@ class CasualLaborAdmin(admin.ModelAdmin):
                 'daily_rate',
                 'total_amount_display',
                 'payment_status',
-                'paid_at'
+                'paid_at',
+                'payout'
             )
         }),
         ('Additional Information', {
@@ -435,11 +484,125 @@ class CasualLaborAdmin(admin.ModelAdmin):
     actions = ['mark_as_paid']
     
     def mark_as_paid(self, request, queryset):
-        """Bulk action to mark casual labor entries as paid"""
-        updated = queryset.filter(payment_status='PENDING').update(
-            payment_status='PAID',
-            paid_at=timezone.now()
+        """Bulk action: pay the selected PENDING entries as one payout batch"""
+        from .services.casual_payouts import create_payout, NothingToPay
+
+        try:
+            payout = create_payout(queryset, paid_by=request.user.get_full_name() or request.user.username)
+        except NothingToPay:
+            self.message_user(request, 'No pending casual labor entries selected.', messages.WARNING)
+            return
+        except PeriodLockedError as e:
+            self.message_user(request, ' '.join(e.messages), messages.ERROR)
+            return
+        self.message_user(
+            request,
+            f'Payout {payout.batch_number}: marked {payout.entry_count} casual labor entry/entries as paid '
+            f'(KES {payout.total_amount:,.2f}).'
         )
-        self.message_user(request, f'Successfully marked {updated} casual labor entry/entries as paid.')
     mark_as_paid.short_description = 'Mark selected as paid'
 
+
+@admin.register(CasualLaborPayout)
+class CasualLaborPayoutAdmin(admin.ModelAdmin):
+    """
+    Casual Labor Payout Admin - One record per payout batch
+    """
+    list_display = [
+        'batch_number',
+        'period_start',
+        'period_end',
+        'worker_name',
+        'entry_count',
+        'worker_days',
+        'total_amount',
+        'journal_entry',
+        'paid_at',
+        'paid_by'
+    ]
+    list_filter = ['paid_at']
+    search_fields = ['batch_number', 'worker_name', 'paid_by']
+    readonly_fields = [
+        'batch_number', 'period_start', 'period_end', 'worker_name', 'entry_count',
+        'worker_days', 'total_amount', 'journal_entry', 'paid_at', 'paid_by', 'created_at'
+    ]
+    date_hierarchy = 'paid_at'
+
+    def has_add_permission(self, request):
+        # Payouts are created from the Casual Labor "Mark selected as paid" action
+        return False
+
+
+
+
+@admin.register(BankPaymentFile)
+class BankPaymentFileAdmin(admin.ModelAdmin):
+    """
+    Bank Payment File Admin - Reconciliation record of every bank file generated
+    """
+    list_display = [
+        'file_reference',
+        'payroll',
+        'file_format',
+        'row_count',
+        'total_amount',
+        'skipped_count',
+        'is_complete',
+        'generated_by',
+        'created_at'
+    ]
+    list_filter = ['file_format', 'is_complete', 'created_at']
+    search_fields = ['file_reference', 'checksum']
+    list_select_related = ['payroll']
+    readonly_fields = [
+        'payroll', 'file_reference', 'file_format', 'row_count', 'total_amount', 'checksum',
+        'skipped_count', 'validation_errors', 'is_complete', 'generated_by', 'created_at'
+    ]
+
+    def has_add_permission(self, request):
+        # Files are generated from the bank-file export or the export_bank_file command
+        return False
+
+
+@admin.register(ClockEvent)
+class ClockEventAdmin(admin.ModelAdmin):
+    """
+    Clock Event Admin - Append-only punches (add corrections, never edit)
+    """
+    list_display = ['timestamp', 'employee', 'event_type', 'source', 'recorded_by', 'notes']
+    list_filter = ['event_type', 'source', 'date']
+    search_fields = ['employee__employee_id', 'employee__first_name', 'employee__last_name']
+    list_select_related = ['employee']
+    autocomplete_fields = ['employee']
+    date_hierarchy = 'date'
+    fields = ['employee', 'event_type', 'timestamp', 'source', 'notes']
+
+    def save_model(self, request, obj, form, change):
+        obj.source = 'ADMIN'
+        obj.recorded_by = request.user.get_full_name() or request.user.username
+        obj.ip_address = request.META.get('REMOTE_ADDR')
+        super().save_model(request, obj, form, change)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AttendanceDay)
+class AttendanceDayAdmin(admin.ModelAdmin):
+    """
+    Attendance Day Admin - Daily summaries built by summarize_attendance
+    """
+    list_display = ['date', 'employee', 'first_in', 'last_out', 'hours_worked', 'overtime_hours', 'punches', 'is_complete']
+    list_filter = ['is_complete', 'date']
+    search_fields = ['employee__employee_id', 'employee__first_name', 'employee__last_name']
+    list_select_related = ['employee']
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
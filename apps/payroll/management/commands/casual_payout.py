@@ -0,0 +1,84 @@
+"""
+Management command to pay out PENDING casual labor as one batch
+Prints the payout sheet grouped by worker; --dry-run shows it without paying
+
+Usage:
+    python manage.py casual_payout --start 2025-09-01 --end 2025-09-15 --dry-run
+    python manage.py casual_payout --start 2025-09-01 --end 2025-09-15 --paid-by "Accountant"
+    python manage.py casual_payout --worker "John Doe"
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.period_locks import PeriodLockedError
+from apps.payroll.services.casual_payouts import (
+    pending_entries, payout_sheet, create_payout, NothingToPay
+)
+
+
+class Command(BaseCommand):
+    help = 'Mark PENDING casual labor entries as PAID in one batch and print the payout sheet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=str, help='First work date (YYYY-MM-DD)')
+        parser.add_argument('--end', type=str, help='Last work date (YYYY-MM-DD)')
+        parser.add_argument('--worker', type=str, help='Only this worker name')
+        parser.add_argument('--paid-by', type=str, help='Name recorded on the payout batch')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the payout sheet without marking anything as paid',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self._parse_date(options['start'])
+            end_date = self._parse_date(options['end'])
+        except ValueError:
+            raise CommandError('Invalid date format. Use YYYY-MM-DD')
+
+        entries = pending_entries(start_date, end_date, options['worker'])
+        sheet = payout_sheet(entries)
+        if not sheet:
+            self.stdout.write(self.style.WARNING('No pending casual labor entries for this selection'))
+            return
+
+        self._print_sheet(sheet)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run - nothing marked as paid'))
+            return
+
+        try:
+            payout = create_payout(entries, paid_by=options['paid_by'], worker_name=options['worker'] or '')
+        except NothingToPay as e:
+            self.stdout.write(self.style.WARNING(str(e)))
+            return
+        except PeriodLockedError as e:
+            raise CommandError(' '.join(e.messages))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Payout {payout.batch_number}: {payout.entry_count} entries, KES {payout.total_amount:,.2f}'
+        ))
+        if payout.journal_entry_id:
+            self.stdout.write(f'  - Posted to ledger: {payout.journal_entry.reference_number}')
+        else:
+            self.stdout.write(self.style.WARNING('  - Not posted to ledger (wages/cash accounts not set up)'))
+
+    def _print_sheet(self, sheet):
+        self.stdout.write(f"{'Worker':<30} {'Entries':>7} {'Worker-days':>11} {'From':>10} {'To':>10} {'Amount (KES)':>14}")
+        grand_total = 0
+        for row in sheet:
+            self.stdout.write(
+                f"{row['worker_name'][:30]:<30} {row['entries']:>7} {row['worker_days']:>11} "
+                f"{row['first_date']:%Y-%m-%d} {row['last_date']:%Y-%m-%d} {row['total_amount']:>14,.2f}"
+            )
+            grand_total += row['total_amount']
+        self.stdout.write(f"{'TOTAL':<30} {'':>7} {'':>11} {'':>10} {'':>10} {grand_total:>14,.2f}")
+
+    @staticmethod
+    def _parse_date(value):
+        if not value:
+            return None
+        return datetime.strptime(value, '%Y-%m-%d').date()
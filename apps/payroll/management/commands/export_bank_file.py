@@ -0,0 +1,54 @@
+"""
+Management command to write the bank transfer file for a month's net pay
+Records a BankPaymentFile with row count, total and SHA-256 checksum
+
+Usage:
+    python manage.py export_bank_file --month 2025-09
+    python manage.py export_bank_file --month 2025-09 --format fixed --output /tmp/salaries.txt
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.payroll.models import MonthlyPayroll
+from apps.payroll.services.bank_payments import (
+    PaymentFileError, payment_filename, start_payment_file, write_payment_file
+)
+
+
+class Command(BaseCommand):
+    help = 'Generate the bulk bank-transfer file (CSV or fixed-width) for a payroll'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=str, required=True, help='Payroll month (YYYY-MM)')
+        parser.add_argument('--format', type=str, choices=['csv', 'fixed'], default='csv', help='File layout')
+        parser.add_argument('--output', type=str, help='Output path (default: <file reference>.csv/.txt)')
+
+    def handle(self, *args, **options):
+        try:
+            period = datetime.strptime(options['month'], '%Y-%m').date()
+        except ValueError:
+            raise CommandError('Invalid month format. Use YYYY-MM')
+
+        try:
+            payroll = MonthlyPayroll.objects.get(month=period.month, year=period.year)
+        except MonthlyPayroll.DoesNotExist:
+            raise CommandError(f'No payroll for {period:%B %Y}')
+
+        try:
+            payment_file = start_payment_file(payroll, options['format'].upper(), generated_by='manage.py')
+        except PaymentFileError as e:
+            raise CommandError(str(e))
+
+        output = options['output'] or payment_filename(payment_file)
+        with open(output, 'wb') as handle:
+            write_payment_file(payment_file, handle)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ {payment_file.file_reference} written to {output}'))
+        self.stdout.write(f'  - Payments: {payment_file.row_count}')
+        self.stdout.write(f'  - Total: KES {payment_file.total_amount:,.2f}')
+        self.stdout.write(f'  - SHA-256: {payment_file.checksum}')
+        if payment_file.skipped_count:
+            self.stdout.write(self.style.WARNING(f'  ⚠️  Left out (fix bank details and regenerate): {payment_file.skipped_count}'))
+            for error in payment_file.validation_errors:
+                self.stdout.write(f"    - {error['employee_id']}: {error['error']}")
@@ -0,0 +1,81 @@
+"""
+Management command to render payslip PDFs for a month's payroll
+PDFs are rendered in parallel worker processes and written to
+MEDIA_ROOT/payslips/YYYY/MM/. Unchanged payslips are skipped on re-run.
+
+Usage:
+    python manage.py generate_payslips --month 2025-09
+    python manage.py generate_payslips --month 2025-09 --employee EMP001 --employee EMP002
+    python manage.py generate_payslips --month 2025-09 --workers 4 --force
+"""
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.payroll.models import MonthlyPayroll
+from apps.payroll.services.payslips import generate_payslips
+
+
+class Command(BaseCommand):
+    help = 'Render payslip PDFs for every payroll item of a month (process pool)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Payroll month (YYYY-MM). Defaults to the current month.',
+        )
+        parser.add_argument(
+            '--employee',
+            action='append',
+            dest='employees',
+            help='Only this employee ID (repeatable)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Number of worker processes (default: CPU count)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render payslips even if unchanged',
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                period = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Invalid month format. Use YYYY-MM')
+        else:
+            period = date.today()
+
+        if options['workers'] is not None and options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        try:
+            payroll = MonthlyPayroll.objects.get(month=period.month, year=period.year)
+        except MonthlyPayroll.DoesNotExist:
+            raise CommandError(f'No payroll for {period:%B %Y}. Run run_payroll first.')
+
+        try:
+            import xhtml2pdf  # noqa: F401
+        except ImportError:
+            raise CommandError('xhtml2pdf is required for payslip PDFs (pip install xhtml2pdf)')
+
+        result = generate_payslips(
+            payroll,
+            employee_ids=options['employees'],
+            force=options['force'],
+            workers=options['workers'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Payslips for {payroll.period_display}'))
+        self.stdout.write(f"  - Rendered: {result['rendered']}")
+        self.stdout.write(f"  - Unchanged (skipped): {result['skipped']}")
+        self.stdout.write(f"  - Directory: {result['directory']}")
+        for name, error in result['failed']:
+            self.stdout.write(self.style.ERROR(f'  ❌ {name}: {error}'))
+        if result['failed']:
+            raise CommandError(f"{len(result['failed'])} payslip(s) failed to render")
@@ -0,0 +1,49 @@
+"""
+Management command to generate the monthly payroll for all ACTIVE employees
+Safe to re-run while the payroll is DRAFT; FINALIZED payrolls are skipped
+
+Usage:
+    python manage.py run_payroll                 # current month
+    python manage.py run_payroll --month 2025-09
+"""
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.payroll.services.payroll_run import run_payroll, PayrollRunSkipped
+
+
+class Command(BaseCommand):
+    help = 'Generate payroll items for all active employees (bulk)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Payroll month (YYYY-MM). Defaults to the current month.',
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                period = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Invalid month format. Use YYYY-MM')
+        else:
+            period = date.today()
+
+        try:
+            result = run_payroll(period.month, period.year)
+        except PayrollRunSkipped as e:
+            self.stdout.write(self.style.WARNING(f'⚠️  {e}'))
+            return
+
+        payroll = result['payroll']
+        self.stdout.write(self.style.SUCCESS(f'✅ Payroll generated for {payroll.period_display}'))
+        self.stdout.write(f"  - Items created: {result['created']}")
+        self.stdout.write(f"  - Items updated: {result['updated']}")
+        if result['removed']:
+            self.stdout.write(f"  - Items removed (inactive employees): {result['removed']}")
+        self.stdout.write(f'  - Total Gross: KES {payroll.total_gross:,.2f}')
+        self.stdout.write(f'  - Total PAYE: KES {payroll.total_paye:,.2f}')
+        self.stdout.write(f'  - Total Net: KES {payroll.total_net:,.2f}')
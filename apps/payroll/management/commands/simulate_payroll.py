@@ -0,0 +1,105 @@
+"""
+Management command for what-if payroll simulations (nothing is saved)
+
+Usage:
+    python manage.py simulate_payroll --month 2025-09 --raise Production:10%
+    python manage.py simulate_payroll --month 2025-09 --raise "*:+1000" --rate health_rate=2.75 --rate health_minimum=300
+    python manage.py simulate_payroll --month 2025-09 --scenarios scenarios.json --json
+"""
+import json
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.payroll.services.payroll_simulator import ScenarioError, load_snapshot, raise_from_text, simulate
+
+
+class Command(BaseCommand):
+    help = 'Simulate salary raises / statutory rate changes against a month\'s payroll'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=str, help='Payroll month (YYYY-MM). Defaults to the current month.')
+        parser.add_argument(
+            '--raise',
+            action='append',
+            dest='raises',
+            default=[],
+            help='DEPARTMENT:10%% or DEPARTMENT:+2000 (use * for everyone). Repeatable.',
+        )
+        parser.add_argument(
+            '--rate',
+            action='append',
+            dest='rates',
+            default=[],
+            help='Rate override NAME=VALUE, e.g. health_rate=2.75 (percent) or personal_relief=2400. Repeatable.',
+        )
+        parser.add_argument('--name', type=str, help='Scenario name')
+        parser.add_argument('--scenarios', type=str, help='JSON file with a list of scenarios')
+        parser.add_argument('--json', action='store_true', help='Print the full result as JSON')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                period = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Invalid month format. Use YYYY-MM')
+        else:
+            period = date.today()
+
+        if options['scenarios']:
+            try:
+                with open(options['scenarios']) as handle:
+                    scenarios = json.load(handle)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Could not read scenarios file: {e}')
+            if not isinstance(scenarios, list):
+                raise CommandError('Scenarios file must contain a JSON list')
+        else:
+            scenarios = [self._scenario_from_options(options)]
+
+        snapshot = load_snapshot(period.month, period.year)
+        if not len(snapshot):
+            raise CommandError(f'No employees to simulate for {period:%B %Y}')
+
+        try:
+            result = simulate(snapshot, scenarios)
+        except ScenarioError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(result, cls=DjangoJSONEncoder, indent=2))
+            return
+
+        baseline = result['baseline']
+        self.stdout.write(self.style.SUCCESS(
+            f"📊 {result['period']} ({result['employees']} employees, {result['source']}, rates {result['rate_table']})"
+        ))
+        self.stdout.write(f"  Baseline employer cost: KES {baseline['employer_cost']:,.2f} | net pay: KES {baseline['net']:,.2f}")
+        for scenario in result['scenarios']:
+            diff = scenario['diff']
+            self.stdout.write(f"\n▶ {scenario['name']}")
+            self.stdout.write(
+                f"  Employer cost: KES {scenario['totals']['employer_cost']:,.2f} ({diff['employer_cost']:+,.2f})"
+            )
+            self.stdout.write(
+                f"  Gross {diff['gross']:+,.2f} | PAYE {diff['paye']:+,.2f} | NHIF/SHIF {diff['nhif']:+,.2f} | "
+                f"NSSF {diff['nssf']:+,.2f} | Net {diff['net']:+,.2f}"
+            )
+            for row in scenario['departments']:
+                if row['diff']:
+                    self.stdout.write(f"    - {row['department']}: {row['diff']:+,.2f}")
+            self.stdout.write(f"  Employees affected: {scenario['employees_changed']}")
+
+    @staticmethod
+    def _scenario_from_options(options):
+        raises = [raise_from_text(value) for value in options['raises']]
+
+        rates = {}
+        for value in options['rates']:
+            key, sep, amount = value.partition('=')
+            if not sep:
+                raise CommandError(f'Invalid --rate "{value}". Use NAME=VALUE')
+            rates[key.strip()] = amount.strip()
+
+        return {'name': options['name'] or 'What-if', 'raises': raises, 'rates': rates}
@@ -0,0 +1,40 @@
+"""
+Management command to rebuild daily attendance summaries from clock events
+Run nightly (or before payroll - run_payroll also summarizes its month)
+
+Usage:
+    python manage.py summarize_attendance                   # yesterday
+    python manage.py summarize_attendance --date 2025-09-15
+    python manage.py summarize_attendance --month 2025-09
+"""
+from calendar import monthrange
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.payroll.services.attendance import summarize_attendance
+
+
+class Command(BaseCommand):
+    help = 'Summarize clock events into daily attendance (hours, overtime) per employee'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=str, help='Day to summarize (YYYY-MM-DD). Defaults to yesterday.')
+        parser.add_argument('--month', type=str, help='Whole month to summarize (YYYY-MM)')
+
+    def handle(self, *args, **options):
+        try:
+            if options['month']:
+                start_date = datetime.strptime(options['month'], '%Y-%m').date()
+                end_date = start_date.replace(day=monthrange(start_date.year, start_date.month)[1])
+            elif options['date']:
+                start_date = end_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            else:
+                start_date = end_date = date.today() - timedelta(days=1)
+        except ValueError:
+            raise CommandError('Invalid format. Use --date YYYY-MM-DD or --month YYYY-MM')
+
+        written = summarize_attendance(start_date, end_date)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Attendance summarized for {start_date} to {end_date}: {written} employee-day(s)'
+        ))
@@ -0,0 +1,38 @@
+"""
+Management command to link payroll Employees to system Users
+Matches by employee ID, then email, and copies the Employee's salary and job
+details to the linked User (Employee is the source of truth)
+
+Usage:
+    python manage.py sync_employee_users --dry-run
+    python manage.py sync_employee_users
+"""
+from django.core.management.base import BaseCommand
+
+from apps.payroll.services.employee_sync import link_employees_to_users
+
+
+class Command(BaseCommand):
+    help = 'Link Employees to Users and sync salary/job details from Employee to User'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show the links that would be made without saving',
+        )
+
+    def handle(self, *args, **options):
+        result = link_employees_to_users(dry_run=options['dry_run'])
+
+        for employee, user in result['linked']:
+            self.stdout.write(f'  - {employee.employee_id} {employee.full_name} → {user.email}')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Dry run - {len(result['linked'])} employee(s) would be linked"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Linked {len(result['linked'])} employee(s)"))
+        self.stdout.write(f"  - Users updated from Employee: {result['synced']}")
+        if result['unmatched']:
+            self.stdout.write(self.style.WARNING(f"  - Employees with no matching user: {result['unmatched']}"))
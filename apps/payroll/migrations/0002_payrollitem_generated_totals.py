@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:55
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payrollitem',
+            name='deductions_total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('paye'), '+', models.F('nhif')), '+', models.F('nssf')), '+', models.F('pension')), '+', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('loan_deduction'), '+', models.F('advance_deduction')), '+', models.F('other_deductions'))), help_text='🤖 AUTO: Statutory + other deductions (same as total_deductions)', output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddField(
+            model_name='payrollitem',
+            name='gross_pay',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('basic_salary'), '+', models.F('housing_allowance')), '+', models.F('transport_allowance')), '+', models.F('other_allowances')), '+', models.F('overtime_pay')), '+', models.F('bonus')), help_text='🤖 AUTO: All earnings (same as gross_salary)', output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddField(
+            model_name='payrollitem',
+            name='net_pay',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('basic_salary'), '+', models.F('housing_allowance')), '+', models.F('transport_allowance')), '+', models.F('other_allowances')), '+', models.F('overtime_pay')), '+', models.F('bonus')), '-', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('paye'), '+', models.F('nhif')), '+', models.F('nssf')), '+', models.F('pension')), '+', django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('loan_deduction'), '+', models.F('advance_deduction')), '+', models.F('other_deductions')))), help_text='🤖 AUTO: Gross pay - deductions (same as net_salary)', output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounting', '0001_initial'),
+        ('payroll', '0002_payrollitem_generated_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CasualLaborPayout',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch_number', models.CharField(help_text='Auto-generated: CLP-YYYYMMDD-XXX', max_length=50, unique=True)),
+                ('period_start', models.DateField(help_text='Earliest work date in the batch')),
+                ('period_end', models.DateField(help_text='Latest work date in the batch')),
+                ('worker_name', models.CharField(blank=True, help_text='Worker filter used for the batch (blank = all workers)', max_length=200)),
+                ('entry_count', models.IntegerField(default=0, help_text='Casual labor entries paid')),
+                ('worker_days', models.IntegerField(default=0, help_text='Sum of workers × days')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Total paid in this batch (KES)', max_digits=12)),
+                ('paid_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('paid_by', models.CharField(blank=True, help_text='User who made the payout', max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('journal_entry', models.ForeignKey(blank=True, help_text='Journal entry posted for this payout (if the ledger accounts exist)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='casual_labor_payouts', to='accounting.journalentry')),
+            ],
+            options={
+                'verbose_name': 'Casual Labor Payout',
+                'verbose_name_plural': 'Casual Labor Payouts',
+                'ordering': ['-paid_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='casuallabor',
+            name='payout',
+            field=models.ForeignKey(blank=True, help_text='🤖 AUTO: Payout batch that paid this entry', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='entries', to='payroll.casuallaborpayout'),
+        ),
+        migrations.AddIndex(
+            model_name='casuallabor',
+            index=models.Index(fields=['payment_status', 'date'], name='payroll_cas_payment_214bf3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='casuallaborpayout',
+            index=models.Index(fields=['paid_at'], name='payroll_cas_paid_at_f36b1e_idx'),
+        ),
+    ]
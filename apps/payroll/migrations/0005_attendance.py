@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0004_employee_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('first_in', models.DateTimeField(blank=True, null=True)),
+                ('last_out', models.DateTimeField(blank=True, null=True)),
+                ('hours_worked', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='🤖 AUTO: Sum of clock-in → clock-out intervals', max_digits=5)),
+                ('overtime_hours', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='🤖 AUTO: Hours beyond the standard day', max_digits=5)),
+                ('punches', models.IntegerField(default=0, help_text='🤖 AUTO: Clock events on this day')),
+                ('is_complete', models.BooleanField(default=True, help_text='🤖 AUTO: False when a clock-in has no matching clock-out')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_days', to='payroll.employee')),
+            ],
+            options={
+                'verbose_name': 'Attendance Day',
+                'verbose_name_plural': 'Attendance Days',
+                'ordering': ['-date', 'employee__employee_id'],
+                'indexes': [models.Index(fields=['date'], name='payroll_att_date_321441_idx')],
+                'unique_together': {('employee', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ClockEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('IN', 'Clock In'), ('OUT', 'Clock Out')], max_length=3)),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now, help_text='When the punch happened')),
+                ('date', models.DateField(help_text='🤖 AUTO: Local date of the punch')),
+                ('source', models.CharField(choices=[('WEB', 'Web'), ('ADMIN', 'Admin'), ('DEVICE', 'Clock Device'), ('IMPORT', 'Import')], default='WEB', max_length=10)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('recorded_by', models.CharField(blank=True, help_text='User who recorded the punch', max_length=100, null=True)),
+                ('notes', models.CharField(blank=True, help_text='Reason for a correction punch', max_length=255, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='clock_events', to='payroll.employee')),
+            ],
+            options={
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['employee', 'date'], name='payroll_clo_employe_8159bd_idx'), models.Index(fields=['date'], name='payroll_clo_date_2b0a59_idx')],
+            },
+        ),
+    ]
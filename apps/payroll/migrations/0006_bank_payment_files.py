@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:07
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payroll', '0005_attendance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BankPaymentFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_reference', models.CharField(help_text='Auto-generated: BPF-YYYYMM-XXX (printed in the file header)', max_length=50, unique=True)),
+                ('file_format', models.CharField(choices=[('CSV', 'CSV'), ('FIXED', 'Fixed-width bulk payment')], max_length=10)),
+                ('row_count', models.IntegerField(default=0, help_text='🤖 AUTO: Payment rows in the file')),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='🤖 AUTO: Sum of net pay in the file (KES)', max_digits=14)),
+                ('checksum', models.CharField(blank=True, help_text='🤖 AUTO: SHA-256 of the file contents', max_length=64)),
+                ('skipped_count', models.IntegerField(default=0, help_text='🤖 AUTO: Items left out by validation')),
+                ('validation_errors', models.JSONField(blank=True, default=list, help_text='🤖 AUTO: [{employee_id, error}] for items left out')),
+                ('is_complete', models.BooleanField(default=False, help_text='🤖 AUTO: True once the whole file has been written')),
+                ('generated_by', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('payroll', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='bank_payment_files', to='payroll.monthlypayroll')),
+            ],
+            options={
+                'verbose_name': 'Bank Payment File',
+                'verbose_name_plural': 'Bank Payment Files',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
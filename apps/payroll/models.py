@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from decimal import Decimal
+from apps.core.period_locks import PeriodLockedQuerySet, assert_payroll_items_writable
+from .rates import rates_for, pension_contribution
 
 
 class Employee(models.Model):
@@ -22,6 +26,14 @@ class Employee(models.Model):
     
     # Basic Information
     employee_id = models.CharField(max_length=20, unique=True, help_text="Unique employee ID (e.g., EMP001)")
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='employee_record',
+        help_text="✏️ MANUAL: System login for this employee - salary and job details are copied to it on save"
+    )
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     email = models.EmailField(blank=True, null=True)
@@ -101,6 +113,10 @@ class Employee(models.Model):
     def __str__(self):
         return f"{self.employee_id} - {self.first_name} {self.last_name}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.sync_user()
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -119,6 +135,30 @@ class Employee(models.Model):
     def pension_contribution(self):
         """Calculate monthly pension contribution"""
         return (self.basic_salary * self.pension_contribution_rate / 100).quantize(Decimal('0.01'))
+    
+    @property
+    def pay_per_day(self):
+        """Daily pay from basic salary (30 days/month)"""
+        return (self.basic_salary / Decimal('30')).quantize(Decimal('0.01'))
+    
+    def user_sync_values(self):
+        """
+        Fields copied to the linked User - Employee is the source of truth
+        for salary and job details, User keeps them for display/expense tracking
+        """
+        return {
+            'basic_salary': self.basic_salary,
+            'pay_per_day': self.pay_per_day,
+            'position': self.position,
+            'department': self.department or '',
+            'date_hired': self.hire_date,
+            'date_terminated': self.termination_date,
+        }
+    
+    def sync_user(self):
+        """Copy salary/job details to the linked User (changed fields only, audited)"""
+        from apps.payroll.services.employee_sync import sync_employee_user
+        sync_employee_user(self)
 
 
 class MonthlyPayroll(models.Model):
@@ -220,24 +260,74 @@ class MonthlyPayroll(models.Model):
         from calendar import month_name
         return f"{month_name[self.month]} {self.year}"
     
+    @property
+    def period_start(self):
+        """First day of the payroll month (selects the statutory rate table)"""
+        from datetime import date
+        return date(self.year, self.month, 1)
+    
+    @property
+    def period_end(self):
+        """Last day of the payroll month"""
+        from calendar import monthrange
+        from datetime import date
+        return date(self.year, self.month, monthrange(self.year, self.month)[1])
+    
     @property
     def is_locked(self):
         """Check if payroll is finalized (immutable)"""
         return self.status == 'FINALIZED'
     
     def calculate_totals(self):
-        """Recalculate all totals from PayrollItems"""
-        items = self.payroll_items.all()
-        self.total_gross = sum(item.gross_salary for item in items)
-        self.total_paye = sum(item.paye for item in items)
-        self.total_nhif = sum(item.nhif for item in items)
-        self.total_nssf = sum(item.nssf for item in items)
-        self.total_pension = sum(item.pension for item in items)
-        self.total_other_deductions = sum(item.other_deductions for item in items)
-        self.total_net = sum(item.net_salary for item in items)
+        """Recalculate all totals from PayrollItems (one aggregate query)"""
+        from django.db.models import Sum
+        
+        totals = self.payroll_items.aggregate(
+            gross=Sum('gross_pay'),
+            paye=Sum('paye'),
+            nhif=Sum('nhif'),
+            nssf=Sum('nssf'),
+            pension=Sum('pension'),
+            other=Sum(OTHER_DEDUCTIONS_EXPRESSION),
+            net=Sum('net_pay'),
+        )
+        totals = {
+            key: (value or Decimal('0.00')).quantize(Decimal('0.01'))
+            for key, value in totals.items()
+        }
+        self.total_gross = totals['gross']
+        self.total_paye = totals['paye']
+        self.total_nhif = totals['nhif']
+        self.total_nssf = totals['nssf']
+        self.total_pension = totals['pension']
+        self.total_other_deductions = totals['other']
+        self.total_net = totals['net']
         self.save()
 
 
+# Database expressions for PayrollItem totals (mirror the Python properties)
+GROSS_PAY_EXPRESSION = (
+    models.F('basic_salary') +
+    models.F('housing_allowance') +
+    models.F('transport_allowance') +
+    models.F('other_allowances') +
+    models.F('overtime_pay') +
+    models.F('bonus')
+)
+OTHER_DEDUCTIONS_EXPRESSION = (
+    models.F('loan_deduction') +
+    models.F('advance_deduction') +
+    models.F('other_deductions')
+)
+DEDUCTIONS_EXPRESSION = (
+    models.F('paye') +
+    models.F('nhif') +
+    models.F('nssf') +
+    models.F('pension') +
+    OTHER_DEDUCTIONS_EXPRESSION
+)
+
+
 class PayrollItem(models.Model):
     """
     Individual employee payroll entry for a specific month
@@ -350,6 +440,26 @@ class PayrollItem(models.Model):
         help_text="Other miscellaneous deductions"
     )
     
+    # Totals (computed by the database - aggregatable, sortable, filterable)
+    gross_pay = models.GeneratedField(
+        expression=GROSS_PAY_EXPRESSION,
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+        help_text="🤖 AUTO: All earnings (same as gross_salary)"
+    )
+    deductions_total = models.GeneratedField(
+        expression=DEDUCTIONS_EXPRESSION,
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+        help_text="🤖 AUTO: Statutory + other deductions (same as total_deductions)"
+    )
+    net_pay = models.GeneratedField(
+        expression=GROSS_PAY_EXPRESSION - DEDUCTIONS_EXPRESSION,
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+        help_text="🤖 AUTO: Gross pay - deductions (same as net_salary)"
+    )
+    
     # Days Worked (for partial month calculations)
     days_worked = models.IntegerField(
         default=30,
@@ -369,9 +479,25 @@ class PayrollItem(models.Model):
             models.Index(fields=['payroll', 'employee']),
         ]
     
+    objects = PeriodLockedQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.employee.full_name} - {self.payroll.period_display}"
     
+    @classmethod
+    def assert_period_open(cls, items):
+        """Raise PeriodLockedError if any item belongs to a finalized payroll"""
+        assert_payroll_items_writable(items)
+    
+    def clean(self):
+        """Validate payroll is still editable"""
+        if self.payroll_id:
+            self.assert_period_open([self])
+    
+    def save(self, *args, **kwargs):
+        self.assert_period_open([self])
+        super().save(*args, **kwargs)
+    
     @property
     def gross_salary(self):
         """Calculate gross salary (all earnings)"""
@@ -406,97 +532,34 @@ class PayrollItem(models.Model):
     
     def calculate_statutory_deductions(self):
         """
-        Calculate PAYE, NHIF, NSSF based on gross salary
-        Uses Kenya tax brackets (2024 rates)
+        Calculate PAYE, NHIF, NSSF based on gross salary and save
+        Rates come from the effective-dated tables in payroll/rates.py
         """
-        gross = self.gross_salary
-        
-        # NHIF Calculation (Kenya rates 2024)
-        if gross <= 5999:
-            self.nhif = Decimal('150.00')
-        elif gross <= 7999:
-            self.nhif = Decimal('300.00')
-        elif gross <= 11999:
-            self.nhif = Decimal('400.00')
-        elif gross <= 14999:
-            self.nhif = Decimal('500.00')
-        elif gross <= 19999:
-            self.nhif = Decimal('600.00')
-        elif gross <= 24999:
-            self.nhif = Decimal('750.00')
-        elif gross <= 29999:
-            self.nhif = Decimal('850.00')
-        elif gross <= 34999:
-            self.nhif = Decimal('900.00')
-        elif gross <= 39999:
-            self.nhif = Decimal('950.00')
-        elif gross <= 44999:
-            self.nhif = Decimal('1000.00')
-        elif gross <= 49999:
-            self.nhif = Decimal('1100.00')
-        elif gross <= 59999:
-            self.nhif = Decimal('1200.00')
-        elif gross <= 69999:
-            self.nhif = Decimal('1300.00')
-        elif gross <= 79999:
-            self.nhif = Decimal('1400.00')
-        elif gross <= 89999:
-            self.nhif = Decimal('1500.00')
-        elif gross <= 99999:
-            self.nhif = Decimal('1600.00')
-        else:
-            self.nhif = Decimal('1700.00')
+        self.compute_statutory_deductions()
+        self.save()
+    
+    def compute_statutory_deductions(self, pension_rate=None, rates=None):
+        """
+        Set PAYE, NHIF, NSSF and pension in memory (no save)
+        pension_rate: employee's pension % - pass it when computing many items
+        to avoid dereferencing self.employee
+        rates: RateTable to use (default: the table in force for the payroll month)
+        """
+        if pension_rate is None:
+            pension_rate = self.employee.pension_contribution_rate
+        if rates is None:
+            rates = rates_for(self.payroll.period_start if self.payroll_id else None)
         
-        # NSSF Calculation (6% of gross, capped at KES 2,160)
-        nssf_rate = Decimal('0.06')
-        nssf_cap = Decimal('2160.00')
-        self.nssf = min(gross * nssf_rate, nssf_cap).quantize(Decimal('0.01'))
+        gross = self.gross_salary
+        self.nhif = rates.health(gross)
+        self.nssf = rates.nssf(gross)
         
-        # Pension Calculation (from employee record)
-        if self.employee.pension_contribution_rate > 0:
-            self.pension = (self.basic_salary * self.employee.pension_contribution_rate / 100).quantize(Decimal('0.01'))
+        # Pension only comes from the employee rate when one is set
+        if pension_rate > 0:
+            self.pension = pension_contribution(self.basic_salary, pension_rate)
         
-        # PAYE Calculation (Kenya tax brackets 2024)
         # Taxable income = Gross - NHIF - NSSF - Pension
-        taxable_income = gross - self.nhif - self.nssf - self.pension
-        
-        if taxable_income <= 0:
-            self.paye = Decimal('0.00')
-        else:
-            paye = Decimal('0.00')
-            
-            # 10% on first 24,000
-            if taxable_income <= 24000:
-                paye = taxable_income * Decimal('0.10')
-            else:
-                paye += Decimal('24000') * Decimal('0.10')
-                
-                # 25% on next 8,333 (24,001 - 32,333)
-                if taxable_income <= 32333:
-                    paye += (taxable_income - Decimal('24000')) * Decimal('0.25')
-                else:
-                    paye += Decimal('8333') * Decimal('0.25')
-                    
-                    # 30% on next 467,667 (32,334 - 500,000)
-                    if taxable_income <= 500000:
-                        paye += (taxable_income - Decimal('32333')) * Decimal('0.30')
-                    else:
-                        paye += Decimal('467667') * Decimal('0.30')
-                        
-                        # 32.5% on next 300,000 (500,001 - 800,000)
-                        if taxable_income <= 800000:
-                            paye += (taxable_income - Decimal('500000')) * Decimal('0.325')
-                        else:
-                            paye += Decimal('300000') * Decimal('0.325')
-                            
-                            # 35% on amount above 800,000
-                            paye += (taxable_income - Decimal('800000')) * Decimal('0.35')
-            
-            # Personal relief (KES 2,400 per month)
-            personal_relief = Decimal('2400.00')
-            self.paye = max(paye - personal_relief, Decimal('0.00')).quantize(Decimal('0.01'))
-        
-        self.save()
+        self.paye = rates.paye(gross - self.nhif - self.nssf - self.pension, health=self.nhif)
 
 
 class CasualLabor(models.Model):
@@ -540,6 +603,14 @@ class CasualLabor(models.Model):
         default='PENDING'
     )
     paid_at = models.DateTimeField(blank=True, null=True)
+    payout = models.ForeignKey(
+        'CasualLaborPayout',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='entries',
+        help_text="🤖 AUTO: Payout batch that paid this entry"
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -553,6 +624,7 @@ class CasualLabor(models.Model):
         indexes = [
             models.Index(fields=['date']),
             models.Index(fields=['payment_status']),
+            models.Index(fields=['payment_status', 'date']),
         ]
     
     def __str__(self):
@@ -568,3 +640,249 @@ class CasualLabor(models.Model):
         from calendar import month_name
         return f"{month_name[self.date.month]} {self.date.year}"
 
+
+class CasualLaborPayout(models.Model):
+    """
+    Casual labor payout batch - One payment run covering many PENDING entries
+    Records what was paid (and the journal entry posted) for the ledger
+    """
+    # Batch Information
+    batch_number = models.CharField(
+        max_length=50,
+        unique=True,
+        help_text="Auto-generated: CLP-YYYYMMDD-XXX"
+    )
+    period_start = models.DateField(help_text="Earliest work date in the batch")
+    period_end = models.DateField(help_text="Latest work date in the batch")
+    worker_name = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text="Worker filter used for the batch (blank = all workers)"
+    )
+    
+    # Totals
+    entry_count = models.IntegerField(default=0, help_text="Casual labor entries paid")
+    worker_days = models.IntegerField(default=0, help_text="Sum of workers × days")
+    total_amount = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Total paid in this batch (KES)"
+    )
+    
+    # Ledger
+    journal_entry = models.ForeignKey(
+        'accounting.JournalEntry',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='casual_labor_payouts',
+        help_text="Journal entry posted for this payout (if the ledger accounts exist)"
+    )
+    
+    # Payment Information
+    paid_at = models.DateTimeField(default=timezone.now)
+    paid_by = models.CharField(max_length=100, blank=True, null=True, help_text="User who made the payout")
+    
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    notes = models.TextField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['-paid_at']
+        verbose_name = 'Casual Labor Payout'
+        verbose_name_plural = 'Casual Labor Payouts'
+        indexes = [
+            models.Index(fields=['paid_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.batch_number} - KES {self.total_amount:,.2f} ({self.entry_count} entries)"
+    
+    def save(self, *args, **kwargs):
+        """Auto-generate batch_number if not set"""
+        if not self.batch_number:
+            date_str = timezone.localdate().strftime('%Y%m%d')
+            today_count = CasualLaborPayout.objects.filter(
+                batch_number__startswith=f'CLP-{date_str}'
+            ).count()
+            self.batch_number = f'CLP-{date_str}-{(today_count + 1):03d}'
+        super().save(*args, **kwargs)
+
+
+class BankPaymentFile(models.Model):
+    """
+    Bank transfer file generated for a payroll's net pay
+    Row count, total and checksum let the upload be reconciled with the bank
+    """
+    FORMAT_CHOICES = [
+        ('CSV', 'CSV'),
+        ('FIXED', 'Fixed-width bulk payment'),
+    ]
+    
+    payroll = models.ForeignKey(
+        MonthlyPayroll,
+        on_delete=models.PROTECT,
+        related_name='bank_payment_files'
+    )
+    file_reference = models.CharField(
+        max_length=50,
+        unique=True,
+        help_text="Auto-generated: BPF-YYYYMM-XXX (printed in the file header)"
+    )
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    
+    # Reconciliation
+    row_count = models.IntegerField(default=0, help_text="🤖 AUTO: Payment rows in the file")
+    total_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="🤖 AUTO: Sum of net pay in the file (KES)"
+    )
+    checksum = models.CharField(max_length=64, blank=True, help_text="🤖 AUTO: SHA-256 of the file contents")
+    skipped_count = models.IntegerField(default=0, help_text="🤖 AUTO: Items left out by validation")
+    validation_errors = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="🤖 AUTO: [{employee_id, error}] for items left out"
+    )
+    is_complete = models.BooleanField(
+        default=False,
+        help_text="🤖 AUTO: True once the whole file has been written"
+    )
+    
+    # Metadata
+    generated_by = models.CharField(max_length=100, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Bank Payment File'
+        verbose_name_plural = 'Bank Payment Files'
+    
+    def __str__(self):
+        return f"{self.file_reference} ({self.get_file_format_display()}) - {self.row_count} rows"
+    
+    def save(self, *args, **kwargs):
+        """Auto-generate file_reference if not set"""
+        if not self.file_reference:
+            prefix = f'BPF-{self.payroll.year}{self.payroll.month:02d}'
+            count = BankPaymentFile.objects.filter(file_reference__startswith=prefix).count()
+            self.file_reference = f'{prefix}-{(count + 1):03d}'
+        super().save(*args, **kwargs)
+
+
+# ============================================================================
+# ATTENDANCE
+# ============================================================================
+
+class AppendOnlyQuerySet(models.QuerySet):
+    """Clock events are never edited or removed - corrections are new events"""
+    
+    def update(self, **kwargs):
+        raise ValidationError("Clock events are append-only and cannot be updated")
+    
+    def delete(self):
+        raise ValidationError("Clock events are append-only and cannot be deleted")
+    
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        raise ValidationError("Clock events are append-only and cannot be updated")
+
+
+class ClockEvent(models.Model):
+    """
+    Clock-in / clock-out punch (append-only)
+    A wrong punch is corrected by recording another event, never by editing
+    """
+    EVENT_TYPE_CHOICES = [
+        ('IN', 'Clock In'),
+        ('OUT', 'Clock Out'),
+    ]
+    
+    SOURCE_CHOICES = [
+        ('WEB', 'Web'),
+        ('ADMIN', 'Admin'),
+        ('DEVICE', 'Clock Device'),
+        ('IMPORT', 'Import'),
+    ]
+    
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.PROTECT,
+        related_name='clock_events'
+    )
+    event_type = models.CharField(max_length=3, choices=EVENT_TYPE_CHOICES)
+    timestamp = models.DateTimeField(default=timezone.now, help_text="When the punch happened")
+    date = models.DateField(help_text="🤖 AUTO: Local date of the punch")
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='WEB')
+    ip_address = models.GenericIPAddressField(blank=True, null=True)
+    recorded_by = models.CharField(max_length=100, blank=True, null=True, help_text="User who recorded the punch")
+    notes = models.CharField(max_length=255, blank=True, null=True, help_text="Reason for a correction punch")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = AppendOnlyQuerySet.as_manager()
+    
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['employee', 'date']),
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.get_event_type_display()} {timezone.localtime(self.timestamp):%Y-%m-%d %H:%M}"
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Clock events are append-only and cannot be edited")
+        self.date = timezone.localdate(self.timestamp)
+        super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Clock events are append-only and cannot be deleted")
+
+
+class AttendanceDay(models.Model):
+    """
+    Daily attendance summary per employee - rebuilt from ClockEvents
+    Hours are attributed to the day the shift started (night shifts included)
+    """
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name='attendance_days'
+    )
+    date = models.DateField()
+    first_in = models.DateTimeField(blank=True, null=True)
+    last_out = models.DateTimeField(blank=True, null=True)
+    hours_worked = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="🤖 AUTO: Sum of clock-in → clock-out intervals"
+    )
+    overtime_hours = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="🤖 AUTO: Hours beyond the standard day"
+    )
+    punches = models.IntegerField(default=0, help_text="🤖 AUTO: Clock events on this day")
+    is_complete = models.BooleanField(
+        default=True,
+        help_text="🤖 AUTO: False when a clock-in has no matching clock-out"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-date', 'employee__employee_id']
+        unique_together = ['employee', 'date']
+        verbose_name = 'Attendance Day'
+        verbose_name_plural = 'Attendance Days'
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.employee.employee_id} {self.date} - {self.hours_worked}h"
@@ -0,0 +1,217 @@
+"""
+Payroll Statutory Rate Tables
+Versioned, effective-dated NHIF/SHIF, NSSF, PAYE and relief tables
+
+Each Finance Act change is a new RateTable appended to RATE_TABLES with the date
+it takes effect - nothing else in the payroll code changes. rates_for(date)
+picks the table in force on that date.
+
+Lookups use bisect on the sorted band edges, and PAYE uses the tax already
+accumulated at each bracket edge, so a deduction is a couple of O(log n)
+lookups instead of an if/elif ladder. compute_deductions_batch() evaluates
+a whole payroll in one pass against a single table.
+"""
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+
+ZERO = Decimal('0.00')
+CENTS = Decimal('0.01')
+
+
+class RateTable:
+    """
+    One version of the statutory rates
+
+    health_bands: [(upper gross, amount)] - NHIF style fixed bands (gross <= upper)
+    health_top_amount: amount above the last band
+    health_rate / health_minimum: SHIF style percentage of gross (used when no bands)
+    nssf_tiers: [(upper pensionable pay, rate)] - contribution per tier
+    paye_brackets: [(upper taxable income, rate)] - None for the open top bracket
+    personal_relief: monthly relief deducted from PAYE
+    health_relief_rate: insurance relief on the health contribution (share of it)
+    """
+
+    def __init__(self, version, effective_from, health_bands=None, health_top_amount=ZERO,
+                 health_rate=ZERO, health_minimum=ZERO, nssf_tiers=(), paye_brackets=(),
+                 personal_relief=ZERO, health_relief_rate=ZERO):
+        self.version = version
+        self.effective_from = effective_from
+
+        self.health_bands = list(health_bands or [])
+        self.health_band_edges = [upper for upper, _ in self.health_bands]
+        self.health_band_amounts = [amount for _, amount in self.health_bands]
+        self.health_top_amount = health_top_amount
+        self.health_rate = health_rate
+        self.health_minimum = health_minimum
+
+        self.nssf_tiers = list(nssf_tiers)
+
+        self.paye_brackets = list(paye_brackets)
+        # PAYE: lower edge, rate and tax accumulated below each bracket
+        self.paye_edges = []
+        self.paye_rates = []
+        self.paye_base = []
+        lower = ZERO
+        accumulated = ZERO
+        for upper, rate in paye_brackets:
+            self.paye_edges.append(upper)
+            self.paye_rates.append(rate)
+            self.paye_base.append((lower, accumulated))
+            if upper is not None:
+                accumulated += (upper - lower) * rate
+                lower = upper
+        # bisect needs the finite edges only (the last bracket is open)
+        self.paye_finite_edges = [edge for edge in self.paye_edges if edge is not None]
+
+        self.personal_relief = personal_relief
+        self.health_relief_rate = health_relief_rate
+
+    def __repr__(self):
+        return f"<RateTable {self.version} from {self.effective_from}>"
+
+    def replace(self, version=None, **changes):
+        """
+        Copy of this table with some rates changed (e.g. for what-if simulations)
+        Setting health_rate without health_bands switches to a percentage contribution
+        """
+        if 'health_rate' in changes and 'health_bands' not in changes:
+            changes['health_bands'] = None
+        values = {
+            'health_bands': self.health_bands,
+            'health_top_amount': self.health_top_amount,
+            'health_rate': self.health_rate,
+            'health_minimum': self.health_minimum,
+            'nssf_tiers': self.nssf_tiers,
+            'paye_brackets': self.paye_brackets,
+            'personal_relief': self.personal_relief,
+            'health_relief_rate': self.health_relief_rate,
+        }
+        values.update(changes)
+        return RateTable(version=version or f'{self.version}*', effective_from=self.effective_from, **values)
+
+    # ------------------------------------------------------------------
+
+    def health(self, gross):
+        """NHIF band amount or SHIF percentage for a gross salary"""
+        if self.health_bands:
+            index = bisect_left(self.health_band_edges, gross)
+            if index < len(self.health_band_amounts):
+                return self.health_band_amounts[index]
+            return self.health_top_amount
+        return max((gross * self.health_rate).quantize(CENTS), self.health_minimum)
+
+    def nssf(self, gross):
+        """Tiered NSSF contribution on pensionable pay"""
+        contribution = ZERO
+        lower = ZERO
+        for upper, rate in self.nssf_tiers:
+            if gross <= lower:
+                break
+            contribution += (min(gross, upper) - lower) * rate
+            lower = upper
+        return contribution.quantize(CENTS)
+
+    def paye(self, taxable_income, health=ZERO):
+        """PAYE after personal (and insurance) relief"""
+        if taxable_income <= 0:
+            return ZERO
+        index = min(bisect_left(self.paye_finite_edges, taxable_income), len(self.paye_rates) - 1)
+        lower, accumulated = self.paye_base[index]
+        tax = accumulated + (taxable_income - lower) * self.paye_rates[index]
+        relief = self.personal_relief + health * self.health_relief_rate
+        return max(tax - relief, ZERO).quantize(CENTS)
+
+
+# ============================================================================
+# RATE TABLES (oldest first)
+# ============================================================================
+
+RATE_TABLES = [
+    RateTable(
+        version='KE-2024',
+        effective_from=date(2020, 1, 1),
+        health_bands=[
+            (Decimal('5999'), Decimal('150.00')),
+            (Decimal('7999'), Decimal('300.00')),
+            (Decimal('11999'), Decimal('400.00')),
+            (Decimal('14999'), Decimal('500.00')),
+            (Decimal('19999'), Decimal('600.00')),
+            (Decimal('24999'), Decimal('750.00')),
+            (Decimal('29999'), Decimal('850.00')),
+            (Decimal('34999'), Decimal('900.00')),
+            (Decimal('39999'), Decimal('950.00')),
+            (Decimal('44999'), Decimal('1000.00')),
+            (Decimal('49999'), Decimal('1100.00')),
+            (Decimal('59999'), Decimal('1200.00')),
+            (Decimal('69999'), Decimal('1300.00')),
+            (Decimal('79999'), Decimal('1400.00')),
+            (Decimal('89999'), Decimal('1500.00')),
+            (Decimal('99999'), Decimal('1600.00')),
+        ],
+        health_top_amount=Decimal('1700.00'),
+        # Tier I up to 7,000 and Tier II up to 36,000 at 6% (max KES 2,160)
+        nssf_tiers=[
+            (Decimal('7000'), Decimal('0.06')),
+            (Decimal('36000'), Decimal('0.06')),
+        ],
+        paye_brackets=[
+            (Decimal('24000'), Decimal('0.10')),
+            (Decimal('32333'), Decimal('0.25')),
+            (Decimal('500000'), Decimal('0.30')),
+            (Decimal('800000'), Decimal('0.325')),
+            (None, Decimal('0.35')),
+        ],
+        personal_relief=Decimal('2400.00'),
+    ),
+]
+
+_EFFECTIVE_DATES = [table.effective_from for table in RATE_TABLES]
+
+
+def rates_for(on_date=None):
+    """Rate table in force on a date (default: today)"""
+    on_date = on_date or date.today()
+    index = bisect_right(_EFFECTIVE_DATES, on_date) - 1
+    if index < 0:
+        raise ValueError(f'No statutory rate table in force on {on_date}')
+    return RATE_TABLES[index]
+
+
+# ============================================================================
+# CALCULATION
+# ============================================================================
+
+Deductions = namedtuple('Deductions', ['nhif', 'nssf', 'pension', 'paye'])
+
+
+def pension_contribution(basic_salary, pension_rate):
+    """Employee pension: rate % of basic salary"""
+    return (basic_salary * pension_rate / 100).quantize(CENTS)
+
+
+def compute_deductions(table, gross, basic_salary, pension_rate):
+    """
+    Statutory deductions for one employee
+    Taxable income = gross - health - NSSF - pension
+    """
+    nhif = table.health(gross)
+    nssf = table.nssf(gross)
+    pension = pension_contribution(basic_salary, pension_rate) if pension_rate > 0 else ZERO
+    paye = table.paye(gross - nhif - nssf - pension, health=nhif)
+    return Deductions(nhif, nssf, pension, paye)
+
+
+def compute_deductions_batch(rows, on_date=None):
+    """
+    Deductions for a whole payroll against one rate table
+    rows: iterable of (gross, basic_salary, pension_rate)
+    Returns a list of Deductions in the same order
+    """
+    table = rates_for(on_date)
+    return [
+        compute_deductions(table, gross, basic_salary, pension_rate)
+        for gross, basic_salary, pension_rate in rows
+    ]
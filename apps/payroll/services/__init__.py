@@ -0,0 +1 @@
+"""Payroll services package"""
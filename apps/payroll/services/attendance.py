@@ -0,0 +1,174 @@
+"""
+Attendance Service
+Clock-in/out capture and the daily/monthly summaries that feed payroll
+
+- record_clock_event: appends a punch (rejects a second IN / an OUT with no IN)
+- summarize_attendance: rebuilds AttendanceDay rows for a date range from one
+  ordered read of ClockEvents (employee, date index) and one bulk upsert
+- monthly_attendance: days worked, hours and overtime per employee for a month
+  in one grouped query - used by run_payroll to fill days_worked and overtime
+
+A shift belongs to the day it started, so a night shift (IN 22:00, OUT 06:00)
+counts towards the clock-in day.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.payroll.models import AttendanceDay, ClockEvent
+
+
+STANDARD_DAY_HOURS = Decimal('8.00')    # Hours before overtime starts
+OVERTIME_MULTIPLIER = Decimal('1.5')    # Overtime paid at 1.5 × normal hourly rate
+DAYS_PER_MONTH = Decimal('30')          # Same basis as pay_per_day
+MAX_SHIFT = timedelta(hours=16)         # Longer IN → OUT gaps are treated as a missed punch
+
+HOURS = Decimal('0.01')
+
+
+# ============================================================================
+# CLOCK EVENTS
+# ============================================================================
+
+def record_clock_event(employee, event_type, timestamp=None, source='WEB', ip_address=None,
+                       recorded_by=None, notes=None):
+    """
+    Append a clock event after checking it follows the employee's last punch
+    Raises ValidationError for a duplicate clock-in or a clock-out without one
+    """
+    timestamp = timestamp or timezone.now()
+    with transaction.atomic():
+        last = (
+            ClockEvent.objects
+            .select_for_update()
+            .filter(employee=employee, timestamp__lte=timestamp)
+            .order_by('-timestamp')
+            .first()
+        )
+        clocked_in = last is not None and last.event_type == 'IN' and timestamp - last.timestamp <= MAX_SHIFT
+        if event_type == 'IN' and clocked_in:
+            raise ValidationError(f'{employee.full_name} is already clocked in')
+        if event_type == 'OUT' and not clocked_in:
+            raise ValidationError(f'{employee.full_name} is not clocked in')
+
+        return ClockEvent.objects.create(
+            employee=employee,
+            event_type=event_type,
+            timestamp=timestamp,
+            source=source,
+            ip_address=ip_address,
+            recorded_by=recorded_by,
+            notes=notes,
+        )
+
+
+# ============================================================================
+# DAILY SUMMARY
+# ============================================================================
+
+def _hours(delta):
+    return (Decimal(delta.total_seconds()) / Decimal('3600')).quantize(HOURS)
+
+
+def summarize_attendance(start_date, end_date):
+    """
+    Rebuild AttendanceDay rows for start_date..end_date (inclusive)
+    Returns the number of employee-days written
+    """
+    # One day of look-ahead so night shifts started on end_date can close
+    events = (
+        ClockEvent.objects
+        .filter(date__gte=start_date, date__lte=end_date + timedelta(days=1))
+        .order_by('employee_id', 'timestamp', 'id')
+        .values_list('employee_id', 'event_type', 'timestamp', 'date')
+    )
+
+    days = {}
+    open_in = {}
+    for employee_id, event_type, timestamp, event_date in events.iterator(chunk_size=2000):
+        clock_in = open_in.pop(employee_id, None)
+        if clock_in is not None and timestamp - clock_in[0] > MAX_SHIFT:
+            clock_in = None  # missed clock-out - the earlier IN stays incomplete
+
+        if event_date <= end_date:
+            day = days.get((employee_id, event_date))
+            if day is None:
+                day = days[(employee_id, event_date)] = AttendanceDay(
+                    employee_id=employee_id,
+                    date=event_date,
+                    hours_worked=Decimal('0.00'),
+                    punches=0,
+                    is_complete=True,
+                )
+            day.punches += 1
+
+        if event_type == 'IN':
+            if clock_in is not None:
+                # Second IN without an OUT - keep the first, the day stays incomplete
+                open_in[employee_id] = clock_in
+                continue
+            open_in[employee_id] = (timestamp, event_date)
+            if event_date <= end_date:
+                day = days[(employee_id, event_date)]
+                if day.first_in is None:
+                    day.first_in = timestamp
+                day.is_complete = False
+        elif clock_in is not None:
+            started, shift_date = clock_in
+            day = days.get((employee_id, shift_date))
+            if day is not None:
+                day.hours_worked += _hours(timestamp - started)
+                day.last_out = timestamp
+                day.is_complete = True
+
+    for day in days.values():
+        day.overtime_hours = max(day.hours_worked - STANDARD_DAY_HOURS, Decimal('0.00'))
+
+    AttendanceDay.objects.bulk_create(
+        days.values(),
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['employee', 'date'],
+        update_fields=['first_in', 'last_out', 'hours_worked', 'overtime_hours', 'punches', 'is_complete', 'updated_at'],
+    )
+    return len(days)
+
+
+# ============================================================================
+# MONTHLY TOTALS
+# ============================================================================
+
+def monthly_attendance(start_date, end_date):
+    """
+    {employee_id: {'days_worked', 'hours_worked', 'overtime_hours'}} for the
+    period - one grouped query over AttendanceDay
+    """
+    rows = (
+        AttendanceDay.objects
+        .filter(date__gte=start_date, date__lte=end_date)
+        .values('employee_id')
+        .annotate(
+            days_worked=Count('id', filter=Q(first_in__isnull=False)),
+            total_hours=Sum('hours_worked'),
+            total_overtime=Sum('overtime_hours'),
+        )
+        .order_by()
+    )
+    return {
+        row['employee_id']: {
+            'days_worked': row['days_worked'],
+            'hours_worked': (row['total_hours'] or Decimal('0.00')).quantize(HOURS),
+            'overtime_hours': (row['total_overtime'] or Decimal('0.00')).quantize(HOURS),
+        }
+        for row in rows
+    }
+
+
+def overtime_pay(basic_salary, overtime_hours):
+    """Overtime at OVERTIME_MULTIPLIER × hourly rate (basic / 30 days / standard day)"""
+    hourly_rate = basic_salary / DAYS_PER_MONTH / STANDARD_DAY_HOURS
+    return (hourly_rate * OVERTIME_MULTIPLIER * overtime_hours).quantize(HOURS)
@@ -0,0 +1,244 @@
+"""
+Bank Payment File Service
+Builds the bulk bank-transfer file (CSV or fixed-width) for a payroll's net pay
+
+- PayrollItem and Employee are read with one JOIN and iterated in chunks
+- Each row is validated as it streams (bank name, account number, amount);
+  invalid items are left out and listed on the BankPaymentFile record
+- Lines are yielded one at a time while a SHA-256 checksum, row count and
+  total are kept; the BankPaymentFile record gets them when the last line
+  has been written (is_complete stays False if the download is aborted)
+
+The fixed-width layout is one header (H), one detail (D) per payment and one
+trailer (T) with the row count and total, CRLF-terminated ASCII lines.
+"""
+import csv
+import hashlib
+import re
+import unicodedata
+from decimal import Decimal
+
+from django.utils import timezone
+
+from apps.payroll.models import BankPaymentFile, PayrollItem
+
+
+PAYABLE_STATUSES = ['APPROVED', 'PAID', 'FINALIZED']
+DEFAULT_CHUNK_SIZE = 2000
+
+ACCOUNT_NUMBER_PATTERN = re.compile(r'^\d{6,20}$')
+ACCOUNT_SEPARATORS = re.compile(r'[\s-]')
+
+CSV_HEADERS = [
+    'Employee ID',
+    'Beneficiary Name',
+    'Bank Name',
+    'Bank Branch',
+    'Account Number',
+    'Amount',
+    'Reference',
+]
+
+# Fixed-width detail record: (field, width, alignment)
+FIXED_WIDTH_DETAIL = [
+    ('record_type', 1, 'left'),
+    ('account_number', 20, 'left'),
+    ('bank_name', 30, 'left'),
+    ('bank_branch', 25, 'left'),
+    ('amount_cents', 15, 'zero'),
+    ('beneficiary_name', 35, 'left'),
+    ('reference', 24, 'left'),
+]
+FIXED_WIDTH_LINE = sum(width for _, width, _ in FIXED_WIDTH_DETAIL)
+
+
+class PaymentFileError(Exception):
+    """Raised when a payment file cannot be generated for the payroll"""
+
+
+# ============================================================================
+# ROWS & VALIDATION
+# ============================================================================
+
+def payment_items(payroll):
+    """Net pay and bank details for every item - one PayrollItem ⋈ Employee query"""
+    return (
+        PayrollItem.objects
+        .filter(payroll=payroll)
+        .order_by('employee__employee_id')
+        .values_list(
+            'employee__employee_id',
+            'employee__first_name',
+            'employee__last_name',
+            'employee__bank_name',
+            'employee__bank_branch',
+            'employee__bank_account_number',
+            'net_pay',
+        )
+    )
+
+
+def validate_payment(bank_name, account_number, amount):
+    """Returns (clean account number, error message or None)"""
+    account = ACCOUNT_SEPARATORS.sub('', account_number or '')
+    if not (bank_name or '').strip():
+        return account, 'Missing bank name'
+    if not account:
+        return account, 'Missing bank account number'
+    if not ACCOUNT_NUMBER_PATTERN.match(account):
+        return account, 'Account number must be 6-20 digits'
+    if amount is None or amount <= 0:
+        return account, 'Net pay is not positive'
+    return account, None
+
+
+def iter_payments(payroll, errors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield valid payment dicts; invalid items are appended to `errors`
+    (single pass over the joined query)
+    """
+    period = f'{payroll.year}-{payroll.month:02d}'
+    for employee_id, first_name, last_name, bank_name, bank_branch, account_number, net_pay in (
+        payment_items(payroll).iterator(chunk_size=chunk_size)
+    ):
+        account, error = validate_payment(bank_name, account_number, net_pay)
+        if error:
+            errors.append({'employee_id': employee_id, 'error': error})
+            continue
+        yield {
+            'employee_id': employee_id,
+            'beneficiary_name': f'{first_name} {last_name}',
+            'bank_name': bank_name.strip(),
+            'bank_branch': (bank_branch or '').strip(),
+            'account_number': account,
+            'amount': net_pay.quantize(Decimal('0.01')),
+            'reference': f'SALARY {period} {employee_id}',
+        }
+
+
+# ============================================================================
+# FORMATTERS
+# ============================================================================
+
+class _Echo:
+    """File-like object that returns each written value (for csv.writer streaming)"""
+
+    def write(self, value):
+        return value
+
+
+def _ascii(value):
+    """Bank files are plain ASCII: strip accents, drop anything else"""
+    return unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode().upper()
+
+
+def _fixed(value, width, alignment):
+    value = _ascii(value)
+    if alignment == 'zero':
+        return value.rjust(width, '0')[-width:]
+    return value[:width].ljust(width)
+
+
+def _cents(amount):
+    return int((amount * 100).to_integral_value())
+
+
+def csv_lines(payments):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADERS)
+    for payment in payments:
+        yield writer.writerow([
+            payment['employee_id'],
+            payment['beneficiary_name'],
+            payment['bank_name'],
+            payment['bank_branch'],
+            payment['account_number'],
+            f"{payment['amount']:.2f}",
+            payment['reference'],
+        ])
+
+
+def fixed_width_lines(payments, payment_file, totals):
+    """Header, one detail per payment, trailer with count and total (from `totals`)"""
+    yield (
+        'H'
+        + _fixed('CHESANTO BAKERY', 35, 'left')
+        + _fixed(payment_file.file_reference, 20, 'left')
+        + timezone.localdate().strftime('%Y%m%d')
+        + _fixed(f'SALARIES {payment_file.payroll.year}{payment_file.payroll.month:02d}', 20, 'left')
+    ).ljust(FIXED_WIDTH_LINE) + '\r\n'
+    for payment in payments:
+        values = {**payment, 'record_type': 'D', 'amount_cents': _cents(payment['amount'])}
+        yield ''.join(_fixed(values[field], width, alignment) for field, width, alignment in FIXED_WIDTH_DETAIL) + '\r\n'
+    yield (
+        'T'
+        + _fixed(totals['rows'], 8, 'zero')
+        + _fixed(_cents(totals['amount']), 18, 'zero')
+    ).ljust(FIXED_WIDTH_LINE) + '\r\n'
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def start_payment_file(payroll, file_format, generated_by=None):
+    """Create the BankPaymentFile record (file reference goes into the file)"""
+    if payroll.status not in PAYABLE_STATUSES:
+        raise PaymentFileError(
+            f'Payroll for {payroll.period_display} is {payroll.get_status_display()} - '
+            f'approve it before generating a bank file'
+        )
+    if file_format not in dict(BankPaymentFile.FORMAT_CHOICES):
+        raise PaymentFileError(f'Unknown bank file format: {file_format}')
+    return BankPaymentFile.objects.create(payroll=payroll, file_format=file_format, generated_by=generated_by)
+
+
+def stream_payment_file(payment_file):
+    """
+    Yield the file as encoded lines; on completion store row count, total,
+    checksum and validation errors on the record
+    """
+    errors = []
+    totals = {'rows': 0, 'amount': Decimal('0.00')}
+    digest = hashlib.sha256()
+
+    def counted(payments):
+        for payment in payments:
+            totals['rows'] += 1
+            totals['amount'] += payment['amount']
+            yield payment
+
+    payments = counted(iter_payments(payment_file.payroll, errors))
+    if payment_file.file_format == 'FIXED':
+        lines = fixed_width_lines(payments, payment_file, totals)
+        encoding = 'ascii'
+    else:
+        lines = csv_lines(payments)
+        encoding = 'utf-8'
+
+    for line in lines:
+        data = line.encode(encoding)
+        digest.update(data)
+        yield data
+
+    BankPaymentFile.objects.filter(pk=payment_file.pk).update(
+        row_count=totals['rows'],
+        total_amount=totals['amount'],
+        checksum=digest.hexdigest(),
+        skipped_count=len(errors),
+        validation_errors=errors,
+        is_complete=True,
+    )
+    payment_file.refresh_from_db()
+
+
+def payment_filename(payment_file):
+    extension = 'txt' if payment_file.file_format == 'FIXED' else 'csv'
+    return f'{payment_file.file_reference}.{extension}'
+
+
+def write_payment_file(payment_file, fileobj):
+    """Write the whole file to an open binary file; returns the completed record"""
+    for block in stream_payment_file(payment_file):
+        fileobj.write(block)
+    return payment_file
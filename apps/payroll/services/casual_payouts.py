@@ -0,0 +1,155 @@
+"""
+Casual Labor Payout Service
+Pays PENDING casual labor entries in one batch and builds the payout sheet
+
+- Entries are selected by date range and/or worker (or an admin selection)
+- Totals come from one aggregate, the sheet from one grouped aggregate
+- All entries are flipped to PAID with a single update()
+- The batch is recorded as a CasualLaborPayout and, when the chart of accounts
+  has the wages and cash accounts, posted as a PAYROLL journal entry
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from apps.payroll.models import CasualLabor, CasualLaborPayout
+
+
+# Chart of accounts used when posting payouts to the ledger
+CASUAL_WAGES_ACCOUNT_CODE = '5100'  # Expense: Casual Labor Wages
+CASH_ACCOUNT_CODE = '1000'          # Asset: Cash
+
+
+class NothingToPay(Exception):
+    """Raised when the selection has no PENDING entries"""
+
+
+def pending_entries(start_date=None, end_date=None, worker_name=None):
+    """PENDING casual labor entries for a date range and/or worker"""
+    entries = CasualLabor.objects.filter(payment_status='PENDING')
+    if start_date:
+        entries = entries.filter(date__gte=start_date)
+    if end_date:
+        entries = entries.filter(date__lte=end_date)
+    if worker_name:
+        entries = entries.filter(worker_name__iexact=worker_name)
+    return entries
+
+
+def payout_sheet(entries):
+    """
+    Consolidated payout sheet: one row per worker (single grouped aggregate)
+    Rows: worker_name, entries, worker_days, first_date, last_date, total_amount
+    """
+    return list(
+        entries.order_by()
+        .values('worker_name')
+        .annotate(
+            entries=Count('id'),
+            worker_days=Sum('number_of_workers'),
+            first_date=Min('date'),
+            last_date=Max('date'),
+            total_amount=Sum('total_amount'),
+        )
+        .order_by('worker_name')
+    )
+
+
+def create_payout(entries, paid_by=None, worker_name='', notes=''):
+    """
+    Pay every PENDING entry in `entries` as one batch
+
+    Returns the CasualLaborPayout
+    Raises NothingToPay if nothing is pending, PeriodLockedError if the
+    ledger posting falls in a closed accounting period (nothing is paid then)
+    """
+    with transaction.atomic():
+        entry_ids = list(
+            entries.filter(payment_status='PENDING')
+            .select_for_update()
+            .values_list('id', flat=True)
+        )
+        if not entry_ids:
+            raise NothingToPay('No pending casual labor entries in the selection')
+
+        batch = CasualLabor.objects.filter(id__in=entry_ids)
+        totals = batch.aggregate(
+            worker_days=Sum('number_of_workers'),
+            total_amount=Sum('total_amount'),
+            period_start=Min('date'),
+            period_end=Max('date'),
+        )
+
+        now = timezone.now()
+        payout = CasualLaborPayout.objects.create(
+            period_start=totals['period_start'],
+            period_end=totals['period_end'],
+            worker_name=worker_name or '',
+            entry_count=len(entry_ids),
+            worker_days=totals['worker_days'] or 0,
+            total_amount=(totals['total_amount'] or Decimal('0.00')).quantize(Decimal('0.01')),
+            paid_at=now,
+            paid_by=paid_by,
+            notes=notes,
+        )
+
+        batch.update(payment_status='PAID', paid_at=now, payout=payout)
+
+        journal_entry = post_payout_to_ledger(payout)
+        if journal_entry:
+            payout.journal_entry = journal_entry
+            payout.save(update_fields=['journal_entry'])
+
+    return payout
+
+
+def post_payout_to_ledger(payout):
+    """
+    Post DR Casual Labor Wages / CR Cash for the payout
+    Skipped (returns None) when either ledger account is not set up yet
+    """
+    from apps.accounting.models import AccountingPeriod, JournalEntry, JournalEntryLine, LedgerAccount
+
+    accounts = {
+        account.account_code: account
+        for account in LedgerAccount.objects.filter(
+            account_code__in=[CASUAL_WAGES_ACCOUNT_CODE, CASH_ACCOUNT_CODE],
+            is_active=True,
+        )
+    }
+    if len(accounts) < 2 or payout.total_amount <= 0:
+        return None
+
+    paid_on = timezone.localdate(payout.paid_at)
+    period, _ = AccountingPeriod.objects.get_or_create(month=paid_on.month, year=paid_on.year)
+    journal_entry = JournalEntry.objects.create(
+        entry_type='PAYROLL',
+        date=paid_on,
+        reference_number=payout.batch_number,
+        accounting_period=period,
+        description=(
+            f"Casual labor payout {payout.batch_number}: {payout.entry_count} entries, "
+            f"{payout.period_start} to {payout.period_end}"
+        ),
+        source_app='payroll',
+        source_model='CasualLaborPayout',
+        source_id=payout.id,
+        created_by=payout.paid_by,
+    )
+    JournalEntryLine.objects.create(
+        journal_entry=journal_entry,
+        account=accounts[CASUAL_WAGES_ACCOUNT_CODE],
+        line_type='DEBIT',
+        amount=payout.total_amount,
+        description='Casual labor wages',
+    )
+    JournalEntryLine.objects.create(
+        journal_entry=journal_entry,
+        account=accounts[CASH_ACCOUNT_CODE],
+        line_type='CREDIT',
+        amount=payout.total_amount,
+        description='Casual labor payout',
+    )
+    return journal_entry
@@ -0,0 +1,130 @@
+"""
+Employee ↔ User Sync Service
+Links payroll Employees to system Users and mirrors salary/job details
+
+payroll.Employee is the source of truth for salary, allowances and job details.
+accounts.User keeps basic_salary, pay_per_day, position, department and
+employment dates for display and expense tracking; for linked users those
+values are copied from the Employee on every Employee save.
+
+The copy is a plain UPDATE (no User save signals), so each changed field
+gets the UserProfileChange audit row track_user_profile_changes would
+have written, created in bulk.
+
+Linking matches unlinked employees to users by employee ID, then by email.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from apps.accounts.models import UserProfileChange
+from apps.accounts.signals import get_current_request
+from apps.payroll.models import Employee
+
+
+USER_SYNC_FIELDS = ['basic_salary', 'pay_per_day', 'position', 'department', 'date_hired', 'date_terminated']
+
+
+def _audit_context():
+    """(changed_by, ip_address) from the current request, as the profile change signal uses"""
+    request = get_current_request()
+    user = getattr(request, 'user', None)
+    changed_by = user if user is not None and user.is_authenticated else None
+    ip_address = request.META.get('REMOTE_ADDR') if request else None
+    return changed_by, ip_address
+
+
+def profile_changes(user_id, old_values, new_values, changed_by=None, ip_address=None):
+    """Unsaved UserProfileChange rows for the synced fields whose value differs"""
+    return [
+        UserProfileChange(
+            user_id=user_id,
+            changed_by_id=changed_by.pk if changed_by else user_id,  # self if no request context
+            field_name=field,
+            old_value=str(old_values[field]) if old_values[field] is not None else '',
+            new_value=str(value) if value is not None else '',
+            ip_address=ip_address,
+        )
+        for field, value in new_values.items()
+        if old_values[field] != value
+    ]
+
+
+def sync_employee_user(employee):
+    """
+    Copy one employee's salary/job details to the linked User
+    One read + one UPDATE of the changed fields + their audit rows
+    """
+    if not employee.user_id:
+        return
+    users = get_user_model().objects.filter(pk=employee.user_id)
+    values = employee.user_sync_values()
+    old_values = users.values(*values).first()
+    if old_values is None:
+        return
+    changed = {field: value for field, value in values.items() if old_values[field] != value}
+    if changed:
+        users.update(**changed)
+        UserProfileChange.objects.bulk_create(
+            profile_changes(employee.user_id, old_values, changed, *_audit_context())
+        )
+
+
+def link_employees_to_users(dry_run=False):
+    """
+    Link unlinked employees to users (employee ID first, then email)
+    and copy salary/job details to every linked user
+
+    Returns a summary dict: linked (list of (employee, user)), synced, unmatched
+    """
+    User = get_user_model()
+
+    with transaction.atomic():
+        employees = list(Employee.objects.select_related('user').order_by('employee_id'))
+        taken = {employee.user_id for employee in employees if employee.user_id}
+        users = list(User.objects.exclude(id__in=taken))
+        by_employee_id = {user.employee_id: user for user in users if user.employee_id}
+        by_email = {user.email.lower(): user for user in users if user.email}
+
+        linked = []
+        unmatched = 0
+        for employee in employees:
+            if employee.user_id:
+                continue
+            user = by_employee_id.get(employee.employee_id)
+            if user is None and employee.email:
+                user = by_email.get(employee.email.lower())
+            if user is None or user.id in taken:
+                unmatched += 1
+                continue
+            employee.user = user
+            taken.add(user.id)
+            linked.append((employee, user))
+
+        if dry_run:
+            transaction.set_rollback(True)
+            return {'linked': linked, 'synced': 0, 'unmatched': unmatched}
+
+        if linked:
+            Employee.objects.bulk_update([employee for employee, _ in linked], ['user'])
+
+        # Mirror the canonical Employee values onto every linked user whose
+        # values differ, with an audit row per changed field
+        changed_by, ip_address = _audit_context()
+        synced_users = []
+        changes = []
+        for employee in employees:
+            if employee.user_id:
+                user = employee.user
+                values = employee.user_sync_values()
+                old_values = {field: getattr(user, field) for field in values}
+                user_changes = profile_changes(user.pk, old_values, values, changed_by, ip_address)
+                if user_changes:
+                    for field, value in values.items():
+                        setattr(user, field, value)
+                    synced_users.append(user)
+                    changes.extend(user_changes)
+        if synced_users:
+            User.objects.bulk_update(synced_users, USER_SYNC_FIELDS, batch_size=500)
+            UserProfileChange.objects.bulk_create(changes, batch_size=500)
+
+    return {'linked': linked, 'synced': len(synced_users), 'unmatched': unmatched}
@@ -0,0 +1,186 @@
+"""
+Payroll Comparison Service
+Month-over-month comparison of two MonthlyPayrolls
+
+- Both payrolls' items (joined to Employee) are read with one query
+- Items are paired per employee in memory; every component gets a delta
+- A component change is flagged when it moves by at least the percentage
+  threshold and the minimum amount (or appears / disappears)
+- Employees only in one payroll are NEW / MISSING; totals and department
+  subtotals are built in the same pass
+"""
+import csv
+from collections import defaultdict
+from decimal import Decimal
+
+from apps.payroll.models import PayrollItem
+
+
+# (field, label) - earnings, deductions, then the generated totals
+COMPONENTS = [
+    ('basic_salary', 'Basic'),
+    ('housing_allowance', 'Housing'),
+    ('transport_allowance', 'Transport'),
+    ('other_allowances', 'Other Allowances'),
+    ('overtime_pay', 'Overtime'),
+    ('bonus', 'Bonus'),
+    ('paye', 'PAYE'),
+    ('nhif', 'NHIF'),
+    ('nssf', 'NSSF'),
+    ('pension', 'Pension'),
+    ('loan_deduction', 'Loan'),
+    ('advance_deduction', 'Advance'),
+    ('other_deductions', 'Other Deductions'),
+    ('gross_pay', 'Gross Pay'),
+    ('net_pay', 'Net Pay'),
+]
+COMPONENT_FIELDS = [field for field, _ in COMPONENTS]
+
+DEFAULT_THRESHOLD_PERCENT = Decimal('10')
+DEFAULT_MIN_AMOUNT = Decimal('500.00')
+
+ZERO = Decimal('0.00')
+
+
+def is_flagged(previous, current, threshold_percent, min_amount):
+    """Change is material: at least min_amount and threshold_percent of the previous value"""
+    delta = current - previous
+    if abs(delta) < min_amount:
+        return False
+    if previous == 0:
+        return True
+    return abs(delta) * 100 / abs(previous) >= threshold_percent
+
+
+def compare_payrolls(previous, current, threshold_percent=DEFAULT_THRESHOLD_PERCENT,
+                     min_amount=DEFAULT_MIN_AMOUNT):
+    """
+    Compare two MonthlyPayrolls
+
+    Returns a dict:
+        rows: per-employee dicts (employee_id, name, department, status,
+              components: [{field, label, previous, current, delta, flagged}],
+              changes: the flagged components, flagged: bool,
+              gross / net: their components)
+        totals: per-component {previous, current, delta}
+        departments: [{department, previous_net, current_net, delta, employees}]
+        counts: {employees, new, missing, flagged}
+    """
+    values = (
+        PayrollItem.objects
+        .filter(payroll__in=[previous, current])
+        .order_by('employee__employee_id')
+        .values_list(
+            'payroll_id', 'employee_id', 'employee__employee_id', 'employee__first_name',
+            'employee__last_name', 'employee__department', *COMPONENT_FIELDS
+        )
+    )
+
+    employees = {}
+    for payroll_id, pk, employee_id, first_name, last_name, department, *amounts in values:
+        entry = employees.setdefault(pk, {
+            'employee_id': employee_id,
+            'name': f'{first_name} {last_name}',
+            'department': department or 'Unassigned',
+            'previous': None,
+            'current': None,
+        })
+        entry['current' if payroll_id == current.id else 'previous'] = amounts
+
+    empty = [ZERO] * len(COMPONENTS)
+    totals = {field: {'previous': ZERO, 'current': ZERO} for field in COMPONENT_FIELDS}
+    departments = defaultdict(lambda: {'previous_net': ZERO, 'current_net': ZERO, 'employees': 0})
+    gross_index = COMPONENT_FIELDS.index('gross_pay')
+    net_index = COMPONENT_FIELDS.index('net_pay')
+    counts = {'employees': len(employees), 'new': 0, 'missing': 0, 'flagged': 0}
+
+    rows = []
+    for entry in employees.values():
+        previous_amounts = entry['previous'] or empty
+        current_amounts = entry['current'] or empty
+        if entry['previous'] is None:
+            status = 'NEW'
+            counts['new'] += 1
+        elif entry['current'] is None:
+            status = 'MISSING'
+            counts['missing'] += 1
+        else:
+            status = 'CHANGED'
+
+        components = []
+        changes = []
+        for (field, label), old, new in zip(COMPONENTS, previous_amounts, current_amounts):
+            flag = is_flagged(old, new, threshold_percent, min_amount)
+            components.append({
+                'field': field,
+                'label': label,
+                'previous': old,
+                'current': new,
+                'delta': new - old,
+                'flagged': flag,
+            })
+            if flag:
+                changes.append(components[-1])
+            totals[field]['previous'] += old
+            totals[field]['current'] += new
+
+        if status == 'CHANGED' and not any(component['delta'] for component in components):
+            status = 'UNCHANGED'
+        flagged = bool(changes) or status in ('NEW', 'MISSING')
+        if flagged:
+            counts['flagged'] += 1
+
+        group = departments[entry['department']]
+        group['previous_net'] += previous_amounts[net_index]
+        group['current_net'] += current_amounts[net_index]
+        group['employees'] += 1
+
+        rows.append({
+            'employee_id': entry['employee_id'],
+            'name': entry['name'],
+            'department': entry['department'],
+            'status': status,
+            'components': components,
+            'changes': changes,
+            'flagged': flagged,
+            'gross': components[gross_index],
+            'net': components[net_index],
+        })
+
+    for field in COMPONENT_FIELDS:
+        totals[field]['delta'] = totals[field]['current'] - totals[field]['previous']
+
+    return {
+        'previous': previous,
+        'current': current,
+        'threshold_percent': threshold_percent,
+        'min_amount': min_amount,
+        'components': COMPONENTS,
+        'rows': rows,
+        'totals': [
+            {'field': field, 'label': label, **totals[field]}
+            for field, label in COMPONENTS
+        ],
+        'departments': [
+            {'department': name, 'delta': group['current_net'] - group['previous_net'], **group}
+            for name, group in sorted(departments.items())
+        ],
+        'counts': counts,
+    }
+
+
+def write_csv(comparison, fileobj, flagged_only=False):
+    """One line per employee with previous / current / delta for every component"""
+    writer = csv.writer(fileobj)
+    header = ['Employee ID', 'Name', 'Department', 'Status', 'Flagged']
+    for _, label in COMPONENTS:
+        header += [f'{label} (prev)', f'{label} (curr)', f'{label} (delta)']
+    writer.writerow(header)
+    for row in comparison['rows']:
+        if flagged_only and not row['flagged']:
+            continue
+        flagged = '; '.join(component['label'] for component in row['changes'])
+        line = [row['employee_id'], row['name'], row['department'], row['status'], flagged]
+        for component in row['components']:
+            line += [component['previous'], component['current'], component['delta']]
+        writer.writerow(line)
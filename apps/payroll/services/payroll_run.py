@@ -0,0 +1,132 @@
+"""
+Payroll Run Service
+Generates a month's PayrollItems for every ACTIVE employee in one pass
+
+- Employee is the single source of salary data (the linked User only mirrors
+  it). ACTIVE employees and their existing item for the month are read with
+  one LEFT JOIN - no per-employee lookups and no second table to reconcile
+- days_worked and overtime pay come from the month's attendance (one grouped
+  query) for employees who clock in; others keep the values entered by hand
+- Gross, NHIF, NSSF, pension and PAYE are computed in memory
+- New items are bulk-created, existing ones bulk-updated, and
+  MonthlyPayroll.calculate_totals runs once at the end
+
+Re-running a DRAFT payroll refreshes salaries/allowances and deductions but
+keeps the month's manual inputs (bonus, loans, advances, other deductions,
+notes, and overtime/days worked for employees without attendance records).
+Items for employees who are no longer ACTIVE are removed. Payrolls past
+DRAFT (and FINALIZED ones in particular) are skipped.
+"""
+from django.db import transaction
+from django.db.models import F, FilteredRelation, Q
+
+from apps.payroll.models import Employee, MonthlyPayroll, PayrollItem
+from apps.payroll.rates import compute_deductions_batch
+from apps.payroll.services.attendance import monthly_attendance, overtime_pay, summarize_attendance
+
+
+# Copied from the employee record on every run
+EMPLOYEE_FIELDS = [
+    'basic_salary',
+    'housing_allowance',
+    'transport_allowance',
+    'other_allowances',
+]
+
+# Filled from attendance when the employee has clock events for the month
+ATTENDANCE_FIELDS = ['days_worked', 'overtime_pay']
+
+# Computed by the run
+DEDUCTION_FIELDS = ['paye', 'nhif', 'nssf', 'pension']
+
+
+class PayrollRunSkipped(Exception):
+    """Raised when the payroll for the month can no longer be regenerated"""
+
+
+def run_payroll(month, year):
+    """
+    Generate (or regenerate) PayrollItems for month/year
+
+    Returns a summary dict: payroll, created, updated, removed
+    Raises PayrollRunSkipped if the payroll exists and is not DRAFT
+    """
+    with transaction.atomic():
+        payroll, _ = MonthlyPayroll.objects.select_for_update().get_or_create(month=month, year=year)
+        if payroll.status != 'DRAFT':
+            raise PayrollRunSkipped(
+                f'Payroll for {payroll.period_display} is {payroll.get_status_display()} - not regenerated'
+            )
+
+        summarize_attendance(payroll.period_start, payroll.period_end)
+        attendance = monthly_attendance(payroll.period_start, payroll.period_end)
+
+        employees = list(
+            Employee.objects
+            .filter(status='ACTIVE')
+            .annotate(
+                current_item=FilteredRelation('payroll_items', condition=Q(payroll_items__payroll=payroll)),
+                item_id=F('current_item__id'),
+                item_overtime_pay=F('current_item__overtime_pay'),
+                item_bonus=F('current_item__bonus'),
+                item_days_worked=F('current_item__days_worked'),
+            )
+            .order_by('employee_id')
+        )
+
+        to_create = []
+        to_update = []
+        items = []
+        for employee in employees:
+            if employee.item_id is None:
+                item = PayrollItem(payroll=payroll, employee=employee)
+                to_create.append(item)
+            else:
+                # Only the fields the run writes (plus the manual earnings
+                # that feed gross pay) are needed for bulk_update
+                item = PayrollItem(
+                    id=employee.item_id,
+                    payroll=payroll,
+                    employee=employee,
+                    overtime_pay=employee.item_overtime_pay,
+                    bonus=employee.item_bonus,
+                    days_worked=employee.item_days_worked,
+                )
+                to_update.append(item)
+
+            for field in EMPLOYEE_FIELDS:
+                setattr(item, field, getattr(employee, field))
+
+            worked = attendance.get(employee.id)
+            if worked:
+                item.days_worked = worked['days_worked']
+                item.overtime_pay = overtime_pay(employee.basic_salary, worked['overtime_hours'])
+            items.append(item)
+
+        # All deductions in one pass against the rate table for the month
+        deductions = compute_deductions_batch(
+            (
+                (item.gross_salary, item.basic_salary, employee.pension_contribution_rate)
+                for item, employee in zip(items, employees)
+            ),
+            on_date=payroll.period_start,
+        )
+        for item, result in zip(items, deductions):
+            item.nhif, item.nssf, item.pension, item.paye = result
+
+        if to_create:
+            PayrollItem.objects.bulk_create(to_create, batch_size=500)
+        if to_update:
+            PayrollItem.objects.bulk_update(to_update, EMPLOYEE_FIELDS + ATTENDANCE_FIELDS + DEDUCTION_FIELDS, batch_size=500)
+
+        # Employees no longer ACTIVE
+        removed, _ = payroll.payroll_items.exclude(employee__status='ACTIVE').delete()
+
+        payroll.calculate_totals()
+
+    return {
+        'payroll': payroll,
+        'created': len(to_create),
+        'updated': len(to_update),
+        'removed': removed,
+    }
@@ -0,0 +1,305 @@
+"""
+Payroll What-If Simulator
+Shows how salary changes or new statutory rates change the monthly payroll cost
+
+- The month's payroll (or the ACTIVE employees if it has not been generated)
+  is loaded once with one joined query into column lists (PayrollSnapshot)
+- A scenario applies department raises and rate-table overrides in memory
+- Baseline and scenarios are recomputed column by column against one rate
+  table each - nothing is written to the database
+
+Scenario format (dict, as accepted by the endpoint and built by the command):
+    {
+        "name": "Production +10%, SHIF 2.75%",
+        "raises": [{"department": "Production", "percent": "10"},
+                   {"department": null, "amount": "1000"}],     # null = everyone
+        "rates": {"health_rate": "2.75", "health_minimum": "300"}
+    }
+
+Rate overrides: percentages are given in percent, amounts in KES
+"""
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from apps.payroll.models import Employee, MonthlyPayroll, PayrollItem
+from apps.payroll.rates import CENTS, ZERO, compute_deductions, rates_for
+
+
+# Rate overrides accepted in a scenario
+PERCENT_RATES = ['health_rate', 'health_relief_rate', 'nssf_rate']
+AMOUNT_RATES = ['health_minimum', 'personal_relief', 'nssf_upper_limit']
+
+TOTAL_FIELDS = ['gross', 'paye', 'nhif', 'nssf', 'pension', 'other_deductions', 'net', 'employer_nssf', 'employer_cost']
+TOP_CHANGES = 20
+
+HUNDRED = Decimal('100')
+
+
+class ScenarioError(ValueError):
+    """Raised for an invalid scenario definition"""
+
+
+# ============================================================================
+# SNAPSHOT
+# ============================================================================
+
+class PayrollSnapshot:
+    """
+    A month's payroll inputs as parallel column lists (one entry per employee)
+    """
+
+    def __init__(self, period_start, period_display, source, rows):
+        self.period_start = period_start
+        self.period_display = period_display
+        self.source = source
+        self.table = rates_for(period_start)
+
+        self.employee_ids = [row[0] for row in rows]
+        self.names = [f'{row[1]} {row[2]}' for row in rows]
+        self.departments = [row[3] or 'Unassigned' for row in rows]
+        self.basic = [row[4] for row in rows]
+        self.allowances = [row[5] + row[6] + row[7] for row in rows]
+        self.extra_earnings = [row[8] + row[9] for row in rows]
+        self.pension_rates = [row[10] for row in rows]
+        self.other_deductions = [row[11] + row[12] + row[13] for row in rows]
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+
+def load_snapshot(month, year):
+    """
+    Snapshot from the month's PayrollItems, or from ACTIVE employees when the
+    payroll has not been generated yet (one query either way)
+    """
+    payroll = MonthlyPayroll.objects.filter(month=month, year=year).first()
+    if payroll is not None:
+        rows = list(
+            PayrollItem.objects
+            .filter(payroll=payroll)
+            .order_by('employee__employee_id')
+            .values_list(
+                'employee__employee_id', 'employee__first_name', 'employee__last_name', 'employee__department',
+                'basic_salary', 'housing_allowance', 'transport_allowance', 'other_allowances',
+                'overtime_pay', 'bonus', 'employee__pension_contribution_rate',
+                'loan_deduction', 'advance_deduction', 'other_deductions',
+            )
+        )
+        if rows:
+            return PayrollSnapshot(payroll.period_start, payroll.period_display, 'payroll', rows)
+
+    period_start = date(year, month, 1)
+    rows = [
+        (employee_id, first_name, last_name, department, basic, housing, transport, other,
+         ZERO, ZERO, pension_rate, ZERO, ZERO, ZERO)
+        for employee_id, first_name, last_name, department, basic, housing, transport, other, pension_rate
+        in Employee.objects
+        .filter(status='ACTIVE')
+        .order_by('employee_id')
+        .values_list(
+            'employee_id', 'first_name', 'last_name', 'department',
+            'basic_salary', 'housing_allowance', 'transport_allowance', 'other_allowances',
+            'pension_contribution_rate',
+        )
+    ]
+    return PayrollSnapshot(period_start, f'{period_start:%B %Y}', 'employees', rows)
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def _decimal(value, label):
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, TypeError):
+        raise ScenarioError(f'{label} must be a number')
+
+
+def parse_request(payload):
+    """Validate a POSTed simulation body; returns (month, scenarios)"""
+    if not isinstance(payload, dict):
+        raise ScenarioError('Request body must be a JSON object')
+    return payload.get('month'), payload.get('scenarios') or []
+
+
+def parse_scenario(spec, index=0):
+    """Validate a scenario dict; returns (name, raises, rate_changes)"""
+    if not isinstance(spec, dict):
+        raise ScenarioError('Each scenario must be an object')
+    name = str(spec.get('name') or f'Scenario {index + 1}')
+
+    raises = []
+    raise_specs = spec.get('raises') or []
+    if not isinstance(raise_specs, list):
+        raise ScenarioError(f'{name}: "raises" must be a list')
+    for change in raise_specs:
+        if not isinstance(change, dict) or ('percent' in change) == ('amount' in change):
+            raise ScenarioError(f'{name}: each raise needs exactly one of "percent" or "amount"')
+        department = change.get('department') or None
+        if 'percent' in change:
+            raises.append((department, _decimal(change['percent'], f'{name}: raise percent') / HUNDRED, ZERO))
+        else:
+            raises.append((department, ZERO, _decimal(change['amount'], f'{name}: raise amount')))
+
+    rate_changes = {}
+    rate_specs = spec.get('rates') or {}
+    if not isinstance(rate_specs, dict):
+        raise ScenarioError(f'{name}: "rates" must be an object')
+    for key, value in rate_specs.items():
+        if key in PERCENT_RATES:
+            rate_changes[key] = _decimal(value, f'{name}: {key}') / HUNDRED
+        elif key in AMOUNT_RATES:
+            rate_changes[key] = _decimal(value, f'{name}: {key}')
+        else:
+            raise ScenarioError(f'{name}: unknown rate "{key}" (allowed: {", ".join(PERCENT_RATES + AMOUNT_RATES)})')
+    return name, raises, rate_changes
+
+
+def raise_from_text(value):
+    """
+    'Production:10%' -> percent raise, 'Production:+2000' -> amount raise,
+    '*:5%' -> everyone (command-line / query-string shorthand)
+    """
+    department, _, change = value.rpartition(':')
+    department = None if department in ('', '*') else department
+    if change.endswith('%'):
+        return {'department': department, 'percent': change[:-1]}
+    return {'department': department, 'amount': change.lstrip('+')}
+
+
+def scenario_table(base, rate_changes):
+    """RateTable for a scenario - NSSF rate/limit map onto the tier list"""
+    changes = dict(rate_changes)
+    nssf_rate = changes.pop('nssf_rate', None)
+    nssf_upper_limit = changes.pop('nssf_upper_limit', None)
+    if nssf_rate is not None or nssf_upper_limit is not None:
+        tiers = list(base.nssf_tiers)
+        if nssf_rate is not None:
+            tiers = [(upper, nssf_rate) for upper, _ in tiers]
+        if nssf_upper_limit is not None and tiers:
+            tiers[-1] = (nssf_upper_limit, tiers[-1][1])
+        changes['nssf_tiers'] = tiers
+    if not changes:
+        return base
+    return base.replace(**changes)
+
+
+def apply_raises(snapshot, raises):
+    """New basic salary column with the department raises applied"""
+    basic = list(snapshot.basic)
+    for department, percent, amount in raises:
+        for index, employee_department in enumerate(snapshot.departments):
+            if department is None or employee_department.lower() == department.lower():
+                basic[index] = (basic[index] * (1 + percent) + amount).quantize(CENTS)
+    return basic
+
+
+# ============================================================================
+# CALCULATION
+# ============================================================================
+
+def compute_columns(snapshot, basic, table):
+    """Per-employee gross, deductions, net and employer cost columns"""
+    gross = [b + a + e for b, a, e in zip(basic, snapshot.allowances, snapshot.extra_earnings)]
+    deductions = [
+        compute_deductions(table, g, b, rate)
+        for g, b, rate in zip(gross, basic, snapshot.pension_rates)
+    ]
+    nhif = [d.nhif for d in deductions]
+    nssf = [d.nssf for d in deductions]
+    pension = [d.pension for d in deductions]
+    paye = [d.paye for d in deductions]
+    net = [
+        g - d.nhif - d.nssf - d.pension - d.paye - other
+        for g, d, other in zip(gross, deductions, snapshot.other_deductions)
+    ]
+    # Employer matches the employee NSSF contribution
+    employer_cost = [g + n for g, n in zip(gross, nssf)]
+    return {
+        'gross': gross,
+        'paye': paye,
+        'nhif': nhif,
+        'nssf': nssf,
+        'pension': pension,
+        'other_deductions': snapshot.other_deductions,
+        'net': net,
+        'employer_nssf': nssf,
+        'employer_cost': employer_cost,
+    }
+
+
+def _totals(columns):
+    return {field: sum(columns[field], ZERO) for field in TOTAL_FIELDS}
+
+
+def _by_department(snapshot, column):
+    totals = defaultdict(lambda: ZERO)
+    for department, value in zip(snapshot.departments, column):
+        totals[department] += value
+    return totals
+
+
+def simulate(snapshot, scenarios):
+    """
+    Run scenarios against one snapshot
+    scenarios: list of scenario dicts (see module docstring)
+    Returns a JSON-ready dict (Decimals) with the baseline and per-scenario diffs
+    """
+    parsed = [parse_scenario(spec, index) for index, spec in enumerate(scenarios)]
+
+    baseline = compute_columns(snapshot, snapshot.basic, snapshot.table)
+    baseline_totals = _totals(baseline)
+    baseline_departments = _by_department(snapshot, baseline['employer_cost'])
+
+    results = []
+    for name, raises, rate_changes in parsed:
+        basic = apply_raises(snapshot, raises) if raises else snapshot.basic
+        columns = compute_columns(snapshot, basic, scenario_table(snapshot.table, rate_changes))
+        totals = _totals(columns)
+        departments = _by_department(snapshot, columns['employer_cost'])
+
+        changes = [
+            (columns['employer_cost'][i] - baseline['employer_cost'][i], i)
+            for i in range(len(snapshot))
+            if columns['employer_cost'][i] != baseline['employer_cost'][i]
+            or columns['net'][i] != baseline['net'][i]
+        ]
+        changes.sort(key=lambda change: abs(change[0]), reverse=True)
+
+        results.append({
+            'name': name,
+            'totals': totals,
+            'diff': {field: totals[field] - baseline_totals[field] for field in TOTAL_FIELDS},
+            'departments': [
+                {
+                    'department': department,
+                    'baseline_cost': baseline_departments[department],
+                    'scenario_cost': departments[department],
+                    'diff': departments[department] - baseline_departments[department],
+                }
+                for department in sorted(baseline_departments)
+            ],
+            'employees_changed': len(changes),
+            'top_changes': [
+                {
+                    'employee_id': snapshot.employee_ids[i],
+                    'name': snapshot.names[i],
+                    'department': snapshot.departments[i],
+                    'basic_salary': basic[i],
+                    'net_diff': columns['net'][i] - baseline['net'][i],
+                    'employer_cost_diff': cost_diff,
+                }
+                for cost_diff, i in changes[:TOP_CHANGES]
+            ],
+        })
+
+    return {
+        'period': snapshot.period_display,
+        'source': snapshot.source,
+        'rate_table': snapshot.table.version,
+        'employees': len(snapshot),
+        'baseline': baseline_totals,
+        'scenarios': results,
+    }
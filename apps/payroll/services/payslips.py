@@ -0,0 +1,253 @@
+"""
+Payslip PDF Service
+Renders one PDF payslip per PayrollItem in a process pool
+
+- Payroll items are loaded with one joined query (employee + payroll) in the
+  parent process and turned into plain, picklable payslip contexts
+- Each worker process loads the letterhead and template once and renders
+  its share of payslips with xhtml2pdf
+- Files go to MEDIA_ROOT/payslips/YYYY/MM/ with deterministic names
+- A manifest.json per month stores the content hash of every payslip; a
+  payslip whose data, template and letterhead are unchanged is skipped
+
+Runs from the generate_payslips command, never inside a request.
+"""
+import base64
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+from apps.payroll.models import PayrollItem
+
+
+PAYSLIP_TEMPLATE = 'payroll/payslip_pdf.html'
+LETTERHEAD_PATH = Path(settings.BASE_DIR) / 'static' / 'images' / 'logo.jpg'
+MANIFEST_NAME = 'manifest.json'
+
+# Earnings / deductions shown on the payslip, in order
+EARNING_FIELDS = [
+    ('basic_salary', 'Basic Salary'),
+    ('housing_allowance', 'Housing Allowance'),
+    ('transport_allowance', 'Transport Allowance'),
+    ('other_allowances', 'Other Allowances'),
+    ('overtime_pay', 'Overtime'),
+    ('bonus', 'Bonus'),
+]
+DEDUCTION_FIELDS = [
+    ('paye', 'PAYE'),
+    ('nhif', 'NHIF'),
+    ('nssf', 'NSSF'),
+    ('pension', 'Pension'),
+    ('loan_deduction', 'Loan Repayment'),
+    ('advance_deduction', 'Salary Advance'),
+    ('other_deductions', 'Other Deductions'),
+]
+
+
+# ============================================================================
+# PATHS & MANIFEST
+# ============================================================================
+
+def payslip_directory(year, month):
+    """MEDIA_ROOT/payslips/YYYY/MM"""
+    return Path(settings.MEDIA_ROOT) / 'payslips' / f'{year:04d}' / f'{month:02d}'
+
+
+def payslip_filename(year, month, employee_id):
+    """Deterministic file name, e.g. payslip_2025-09_EMP001.pdf"""
+    return f'payslip_{year:04d}-{month:02d}_{employee_id}.pdf'
+
+
+def load_manifest(directory):
+    """{file name: content hash} for payslips already written"""
+    try:
+        with open(directory / MANIFEST_NAME) as manifest:
+            return json.load(manifest)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_manifest(directory, manifest):
+    temp_path = directory / f'{MANIFEST_NAME}.tmp'
+    with open(temp_path, 'w') as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(temp_path, directory / MANIFEST_NAME)
+
+
+# ============================================================================
+# CONTEXT & HASHING (parent process)
+# ============================================================================
+
+def _amount(value):
+    return f'{(value or Decimal("0.00")):,.2f}'
+
+
+def payslip_context(item):
+    """Plain-string payslip context for one item (picklable, hashable)"""
+    employee = item.employee
+    payroll = item.payroll
+    earnings = [(label, _amount(getattr(item, field))) for field, label in EARNING_FIELDS]
+    deductions = [
+        (label, _amount(getattr(item, field)))
+        for field, label in DEDUCTION_FIELDS
+        if getattr(item, field)
+    ]
+    return {
+        'company_name': 'Chesanto Bakery',
+        'period': payroll.period_display,
+        'employee_id': employee.employee_id,
+        'employee_name': employee.full_name,
+        'position': employee.position,
+        'department': employee.department or '',
+        'kra_pin': employee.kra_pin or '',
+        'nssf_number': employee.nssf_number or '',
+        'nhif_number': employee.nhif_number or '',
+        'bank_name': employee.bank_name or '',
+        'bank_account_number': employee.bank_account_number or '',
+        'days_worked': item.days_worked,
+        'earnings': earnings,
+        'deductions': deductions,
+        'gross_pay': _amount(item.gross_salary),
+        'total_deductions': _amount(item.total_deductions),
+        'net_pay': _amount(item.net_salary),
+    }
+
+
+@lru_cache(maxsize=1)
+def template_fingerprint():
+    """Hash of the template source and letterhead - a change re-renders every payslip"""
+    from django.template.loader import get_template
+
+    digest = hashlib.sha256()
+    digest.update(Path(get_template(PAYSLIP_TEMPLATE).origin.name).read_bytes())
+    if LETTERHEAD_PATH.exists():
+        digest.update(LETTERHEAD_PATH.read_bytes())
+    return digest.hexdigest()
+
+
+def content_hash(context):
+    payload = json.dumps(context, sort_keys=True).encode()
+    return hashlib.sha256(payload + template_fingerprint().encode()).hexdigest()
+
+
+# ============================================================================
+# RENDERING (worker processes)
+# ============================================================================
+
+def _init_worker():
+    """Process pool initializer: make sure Django is set up (spawn/forkserver)"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+    _payslip_template()
+    _letterhead_data_uri()
+
+
+@lru_cache(maxsize=1)
+def _payslip_template():
+    from django.template.loader import get_template
+
+    return get_template(PAYSLIP_TEMPLATE)
+
+
+@lru_cache(maxsize=1)
+def _letterhead_data_uri():
+    if not LETTERHEAD_PATH.exists():
+        return ''
+    encoded = base64.b64encode(LETTERHEAD_PATH.read_bytes()).decode()
+    return f'data:image/jpeg;base64,{encoded}'
+
+
+def render_payslip(job):
+    """
+    Render one payslip PDF to its final path (written atomically)
+    job: (path, context) - returns (path, error message or None)
+    """
+    from xhtml2pdf import pisa
+
+    path, context = job
+    html = _payslip_template().render({**context, 'letterhead': _letterhead_data_uri()})
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as output:
+        result = pisa.CreatePDF(html, dest=output)
+    if result.err:
+        os.remove(temp_path)
+        return path, f'{result.err} rendering error(s)'
+    os.replace(temp_path, path)
+    return path, None
+
+
+# ============================================================================
+# GENERATION
+# ============================================================================
+
+def generate_payslips(payroll, employee_ids=None, force=False, workers=None):
+    """
+    Write payslip PDFs for a MonthlyPayroll
+
+    employee_ids: limit to these Employee.employee_id values
+    force: re-render even when the content hash is unchanged
+    workers: process pool size (default: CPU count)
+
+    Returns a summary dict: directory, rendered, skipped, failed (list of
+    (file name, error))
+    """
+    items = (
+        PayrollItem.objects
+        .filter(payroll=payroll)
+        .select_related('employee', 'payroll')
+        .order_by('employee__employee_id')
+    )
+    if employee_ids:
+        items = items.filter(employee__employee_id__in=employee_ids)
+
+    directory = payslip_directory(payroll.year, payroll.month)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(directory)
+
+    jobs = []
+    hashes = {}
+    skipped = 0
+    for item in items:
+        context = payslip_context(item)
+        name = payslip_filename(payroll.year, payroll.month, item.employee.employee_id)
+        digest = content_hash(context)
+        if not force and manifest.get(name) == digest and (directory / name).exists():
+            skipped += 1
+            continue
+        hashes[name] = digest
+        jobs.append((str(directory / name), context))
+
+    rendered = 0
+    failed = []
+    if jobs:
+        # Workers never touch the database - don't hand them open connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(render_payslip, job) for job in jobs]
+            for future in as_completed(futures):
+                path, error = future.result()
+                name = Path(path).name
+                if error:
+                    failed.append((name, error))
+                    manifest.pop(name, None)
+                else:
+                    manifest[name] = hashes[name]
+                    rendered += 1
+        save_manifest(directory, manifest)
+
+    return {
+        'directory': directory,
+        'rendered': rendered,
+        'skipped': skipped,
+        'failed': failed,
+    }
@@ -1,3 +1,447 @@
-from django.test import TestCase
+from datetime import date, datetime
+from decimal import Decimal
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from .models import AttendanceDay, ClockEvent, Employee, PayrollItem
+from .rates import RATE_TABLES, RateTable, compute_deductions, compute_deductions_batch, rates_for
+from .services.attendance import monthly_attendance, overtime_pay, record_clock_event, summarize_attendance
+from .services.payroll_run import run_payroll
+
+
+def legacy_statutory_deductions(gross, basic_salary, pension_rate):
+    """
+    Reference copy of the original hard-coded 2024 calculation
+    (NHIF if/elif ladder + nested PAYE cascade) - the rate tables must match it
+    """
+    if gross <= 5999:
+        nhif = Decimal('150.00')
+    elif gross <= 7999:
+        nhif = Decimal('300.00')
+    elif gross <= 11999:
+        nhif = Decimal('400.00')
+    elif gross <= 14999:
+        nhif = Decimal('500.00')
+    elif gross <= 19999:
+        nhif = Decimal('600.00')
+    elif gross <= 24999:
+        nhif = Decimal('750.00')
+    elif gross <= 29999:
+        nhif = Decimal('850.00')
+    elif gross <= 34999:
+        nhif = Decimal('900.00')
+    elif gross <= 39999:
+        nhif = Decimal('950.00')
+    elif gross <= 44999:
+        nhif = Decimal('1000.00')
+    elif gross <= 49999:
+        nhif = Decimal('1100.00')
+    elif gross <= 59999:
+        nhif = Decimal('1200.00')
+    elif gross <= 69999:
+        nhif = Decimal('1300.00')
+    elif gross <= 79999:
+        nhif = Decimal('1400.00')
+    elif gross <= 89999:
+        nhif = Decimal('1500.00')
+    elif gross <= 99999:
+        nhif = Decimal('1600.00')
+    else:
+        nhif = Decimal('1700.00')
+
+    nssf = min(gross * Decimal('0.06'), Decimal('2160.00')).quantize(Decimal('0.01'))
+
+    pension = Decimal('0.00')
+    if pension_rate > 0:
+        pension = (basic_salary * pension_rate / 100).quantize(Decimal('0.01'))
+
+    taxable_income = gross - nhif - nssf - pension
+    if taxable_income <= 0:
+        paye = Decimal('0.00')
+    else:
+        paye = Decimal('0.00')
+        if taxable_income <= 24000:
+            paye = taxable_income * Decimal('0.10')
+        else:
+            paye += Decimal('24000') * Decimal('0.10')
+            if taxable_income <= 32333:
+                paye += (taxable_income - Decimal('24000')) * Decimal('0.25')
+            else:
+                paye += Decimal('8333') * Decimal('0.25')
+                if taxable_income <= 500000:
+                    paye += (taxable_income - Decimal('32333')) * Decimal('0.30')
+                else:
+                    paye += Decimal('467667') * Decimal('0.30')
+                    if taxable_income <= 800000:
+                        paye += (taxable_income - Decimal('500000')) * Decimal('0.325')
+                    else:
+                        paye += Decimal('300000') * Decimal('0.325')
+                        paye += (taxable_income - Decimal('800000')) * Decimal('0.35')
+        paye = max(paye - Decimal('2400.00'), Decimal('0.00')).quantize(Decimal('0.01'))
+
+    return nhif, nssf, pension, paye
+
+
+# (basic, housing, bonus, pension %, NHIF, NSSF, pension, PAYE) - produced by the
+# original PayrollItem.calculate_statutory_deductions before the rate tables
+GOLDEN_VALUES = [
+    ('5000.00', '0.00', '0.00', '0.00', '150.00', '300.00', '0.00', '0.00'),
+    ('5999.00', '0', '0', '0', '150.00', '359.94', '0.00', '0.00'),
+    ('5999.50', '0', '0', '0', '300.00', '359.97', '0.00', '0.00'),
+    ('7999.00', '0', '0', '0', '300.00', '479.94', '0.00', '0.00'),
+    ('12000.00', '0', '0', '0', '500.00', '720.00', '0.00', '0.00'),
+    ('15000.00', '0', '0', '0', '600.00', '900.00', '0.00', '0.00'),
+    ('24000.00', '0', '0', '0', '750.00', '1440.00', '0.00', '0.00'),
+    ('25000.00', '0', '0', '0', '850.00', '1500.00', '0.00', '0.00'),
+    ('30000.00', '0', '0', '5.00', '900.00', '1800.00', '1500.00', '450.00'),
+    ('35000.00', '5000.00', '0', '0', '1000.00', '2160.00', '0.00', '3435.35'),
+    ('45000.00', '0', '3000.00', '7.50', '1100.00', '2160.00', '3375.00', '4792.85'),
+    ('55000.00', '0', '0', '0', '1200.00', '2160.00', '0.00', '7875.35'),
+    ('65000.00', '0', '0', '10.00', '1300.00', '2160.00', '6500.00', '8895.35'),
+    ('75000.00', '0', '0', '0', '1400.00', '2160.00', '0.00', '13815.35'),
+    ('85000.00', '0', '0', '0', '1500.00', '2160.00', '0.00', '16785.35'),
+    ('99999.00', '0', '0', '0', '1600.00', '2160.00', '0.00', '21255.05'),
+    ('100000.00', '0', '0', '0', '1700.00', '2160.00', '0.00', '21225.35'),
+    ('150000.00', '20000.00', '10000.00', '5.00', '1700.00', '2160.00', '7500.00', '42975.35'),
+    ('520000.00', '0', '0', '0', '1700.00', '2160.00', '0.00', '147628.85'),
+    ('900000.00', '0', '0', '12.50', '1700.00', '2160.00', '112500.00', '234566.35'),
+    ('36150.55', '0', '0', '3.33', '950.00', '2160.00', '1203.81', '1959.18'),
+    ('32333.00', '0', '0', '0', '900.00', '1939.98', '0.00', '1373.26'),
+]
+
+
+def _item(basic, housing='0', bonus='0', pension_rate='0'):
+    employee = Employee(pension_contribution_rate=Decimal(pension_rate))
+    return PayrollItem(
+        employee=employee,
+        basic_salary=Decimal(basic),
+        housing_allowance=Decimal(housing),
+        bonus=Decimal(bonus),
+    )
+
+
+class StatutoryDeductionGoldenValueTests(SimpleTestCase):
+    """PayrollItem deductions must equal the values of the original implementation"""
+
+    def test_golden_values(self):
+        for basic, housing, bonus, rate, nhif, nssf, pension, paye in GOLDEN_VALUES:
+            with self.subTest(basic=basic, housing=housing, bonus=bonus, rate=rate):
+                item = _item(basic, housing, bonus, rate)
+                item.compute_statutory_deductions()
+                self.assertEqual(
+                    (item.nhif, item.nssf, item.pension, item.paye),
+                    (Decimal(nhif), Decimal(nssf), Decimal(pension), Decimal(paye)),
+                )
+
+    def test_parity_with_legacy_calculation_across_salary_range(self):
+        table = rates_for(date(2024, 6, 1))
+        rates = [Decimal('0'), Decimal('5'), Decimal('7.5')]
+        for step in range(0, 1_000_000, 997):
+            gross = Decimal(step) + Decimal('0.37')
+            for rate in rates:
+                with self.subTest(gross=gross, rate=rate):
+                    self.assertEqual(
+                        tuple(compute_deductions(table, gross, gross, rate)),
+                        legacy_statutory_deductions(gross, gross, rate),
+                    )
+
+    def test_band_and_bracket_edges(self):
+        table = rates_for(date(2024, 6, 1))
+        edges = [5999, 6000, 24000, 24999, 25000, 32333, 32334, 36000, 99999, 100000,
+                 500000, 500001, 800000, 800001]
+        for edge in edges:
+            for delta in (Decimal('-0.01'), Decimal('0'), Decimal('0.01')):
+                gross = Decimal(edge) + delta
+                with self.subTest(gross=gross):
+                    self.assertEqual(
+                        tuple(compute_deductions(table, gross, gross, Decimal('0'))),
+                        legacy_statutory_deductions(gross, gross, Decimal('0')),
+                    )
+
+    def test_batch_matches_single_calculation(self):
+        rows = [
+            (Decimal(basic) + Decimal(housing) + Decimal(bonus), Decimal(basic), Decimal(rate))
+            for basic, housing, bonus, rate, *_ in GOLDEN_VALUES
+        ]
+        batch = compute_deductions_batch(rows, on_date=date(2024, 6, 1))
+        self.assertEqual(len(batch), len(rows))
+        for (gross, basic, rate), result in zip(rows, batch):
+            self.assertEqual(tuple(result), legacy_statutory_deductions(gross, basic, rate))
+
+    def test_pension_kept_when_employee_has_no_rate(self):
+        item = _item('50000')
+        item.pension = Decimal('1000.00')
+        item.compute_statutory_deductions()
+        self.assertEqual(item.pension, Decimal('1000.00'))
+        self.assertEqual(
+            item.paye,
+            legacy_statutory_deductions(Decimal('50000'), Decimal('50000'), Decimal('0'))[3] - Decimal('300.00'),
+        )
+
+
+class RateTableTests(SimpleTestCase):
+
+    def test_tables_sorted_by_effective_date(self):
+        dates = [table.effective_from for table in RATE_TABLES]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_effective_date_selection(self):
+        new_table = RateTable(version='TEST', effective_from=date(2030, 1, 1))
+        original = list(RATE_TABLES)
+        from . import rates
+        try:
+            rates.RATE_TABLES.append(new_table)
+            rates._EFFECTIVE_DATES.append(new_table.effective_from)
+            self.assertIs(rates.rates_for(date(2029, 12, 31)), original[-1])
+            self.assertIs(rates.rates_for(date(2030, 1, 1)), new_table)
+        finally:
+            rates.RATE_TABLES[:] = original
+            rates._EFFECTIVE_DATES[:] = [table.effective_from for table in original]
+
+    def test_no_table_before_first_effective_date(self):
+        with self.assertRaises(ValueError):
+            rates_for(date(2000, 1, 1))
+
+    def test_percentage_health_contribution(self):
+        table = RateTable(
+            version='SHIF-TEST',
+            effective_from=date(2030, 1, 1),
+            health_rate=Decimal('0.0275'),
+            health_minimum=Decimal('300.00'),
+        )
+        self.assertEqual(table.health(Decimal('5000')), Decimal('300.00'))
+        self.assertEqual(table.health(Decimal('40000')), Decimal('1100.00'))
+
+
+NAIROBI = ZoneInfo('Africa/Nairobi')
+
+
+def _at(day, hour, minute=0):
+    return datetime(2025, 9, day, hour, minute, tzinfo=NAIROBI)
+
+
+class AttendanceTests(TestCase):
+
+    def setUp(self):
+        self.employee = Employee.objects.create(
+            employee_id='EMP001',
+            first_name='Jane',
+            last_name='Baker',
+            position='Baker',
+            hire_date=date(2024, 1, 1),
+            basic_salary=Decimal('24000.00'),
+        )
+
+    def test_night_shift_counts_on_clock_in_day(self):
+        record_clock_event(self.employee, 'IN', _at(1, 22))
+        record_clock_event(self.employee, 'OUT', _at(2, 8, 30))
+        summarize_attendance(date(2025, 9, 1), date(2025, 9, 30))
+
+        day = AttendanceDay.objects.get(employee=self.employee, date=date(2025, 9, 1))
+        self.assertEqual(day.hours_worked, Decimal('10.50'))
+        self.assertEqual(day.overtime_hours, Decimal('2.50'))
+        self.assertTrue(day.is_complete)
+        self.assertEqual(
+            AttendanceDay.objects.get(employee=self.employee, date=date(2025, 9, 2)).hours_worked,
+            Decimal('0.00'),
+        )
+
+    def test_missing_clock_out_still_counts_as_day_worked(self):
+        record_clock_event(self.employee, 'IN', _at(3, 7))
+        record_clock_event(self.employee, 'IN', _at(4, 7))
+        record_clock_event(self.employee, 'OUT', _at(4, 15))
+        summarize_attendance(date(2025, 9, 1), date(2025, 9, 30))
+
+        self.assertFalse(AttendanceDay.objects.get(employee=self.employee, date=date(2025, 9, 3)).is_complete)
+        totals = monthly_attendance(date(2025, 9, 1), date(2025, 9, 30))[self.employee.id]
+        self.assertEqual(totals['days_worked'], 2)
+        self.assertEqual(totals['hours_worked'], Decimal('8.00'))
+
+    def test_duplicate_clock_in_rejected(self):
+        record_clock_event(self.employee, 'IN', _at(5, 7))
+        with self.assertRaises(ValidationError):
+            record_clock_event(self.employee, 'IN', _at(5, 9))
+        with self.assertRaises(ValidationError):
+            record_clock_event(self.employee, 'OUT', _at(6, 9))
+
+    def test_clock_events_are_append_only(self):
+        event = record_clock_event(self.employee, 'IN', _at(5, 7))
+        with self.assertRaises(ValidationError):
+            event.save()
+        with self.assertRaises(ValidationError):
+            ClockEvent.objects.filter(pk=event.pk).update(event_type='OUT')
+        with self.assertRaises(ValidationError):
+            ClockEvent.objects.all().delete()
+
+    def test_payroll_run_fills_days_worked_and_overtime(self):
+        for day in range(1, 11):
+            record_clock_event(self.employee, 'IN', _at(day, 6))
+            record_clock_event(self.employee, 'OUT', _at(day, 16))
+        run_payroll(9, 2025)
+
+        item = PayrollItem.objects.get(employee=self.employee)
+        self.assertEqual(item.days_worked, 10)
+        self.assertEqual(item.overtime_pay, overtime_pay(Decimal('24000.00'), Decimal('20.00')))
+        self.assertEqual(item.overtime_pay, Decimal('3000.00'))
+
+
+class PayrollSimulatorTests(TestCase):
+
+    def setUp(self):
+        for index, (department, salary) in enumerate([('Production', '30000'), ('Sales', '60000'), (None, '120000')]):
+            Employee.objects.create(
+                employee_id=f'EMP{index:03d}',
+                first_name='Staff',
+                last_name=str(index),
+                position='Staff',
+                department=department,
+                hire_date=date(2024, 1, 1),
+                basic_salary=Decimal(salary),
+            )
+        run_payroll(9, 2025)
+
+    def test_baseline_matches_generated_payroll(self):
+        from .models import MonthlyPayroll
+        from .services.payroll_simulator import load_snapshot, simulate
+
+        payroll = MonthlyPayroll.objects.get(month=9, year=2025)
+        result = simulate(load_snapshot(9, 2025), [{'name': 'No change'}])
+        self.assertEqual(result['baseline']['gross'], payroll.total_gross)
+        self.assertEqual(result['baseline']['paye'], payroll.total_paye)
+        self.assertEqual(result['baseline']['net'], payroll.total_net)
+        self.assertEqual(result['scenarios'][0]['employees_changed'], 0)
+
+    def test_department_raise_and_rate_change_without_writes(self):
+        from .services.payroll_simulator import load_snapshot, simulate
+
+        snapshot = load_snapshot(9, 2025)
+        with self.assertNumQueries(0):
+            result = simulate(snapshot, [
+                {'name': 'Raise', 'raises': [{'department': 'production', 'percent': '10'}]},
+                {'name': 'SHIF', 'rates': {'health_rate': '2.75', 'health_minimum': '300'}},
+            ])
+        raise_result, shif_result = result['scenarios']
+        self.assertEqual(raise_result['diff']['gross'], Decimal('3000.00'))
+        self.assertEqual(raise_result['employees_changed'], 1)
+        # 2.75% of 30,000 / 60,000 / 120,000 against NHIF bands of 900 / 1,300 / 1,700
+        self.assertEqual(shif_result['diff']['nhif'], Decimal('5775.00') - Decimal('3900.00'))
+
+    def test_malformed_scenarios_raise_scenario_error(self):
+        from .services.payroll_simulator import ScenarioError, parse_request, parse_scenario
+
+        for payload in [[], 'x', 3]:
+            with self.assertRaises(ScenarioError):
+                parse_request(payload)
+        for spec in [{'rates': ['health_rate']}, {'rates': '2.75'}, {'raises': 5}]:
+            with self.assertRaises(ScenarioError):
+                parse_scenario(spec)
+
+    def test_rate_table_replace_keeps_original(self):
+        table = rates_for(date(2025, 9, 1))
+        shif = table.replace(health_rate=Decimal('0.0275'))
+        self.assertEqual(shif.health(Decimal('40000')), Decimal('1100.00'))
+        self.assertEqual(table.health(Decimal('40000')), Decimal('1000.00'))
+        self.assertEqual(shif.paye(Decimal('50000')), table.paye(Decimal('50000')))
+
+
+class BankPaymentFileTests(TestCase):
+
+    def setUp(self):
+        from .models import MonthlyPayroll
+
+        for index, account in enumerate(['0123-456 789', '12AB', '99887766']):
+            Employee.objects.create(
+                employee_id=f'EMP{index:03d}',
+                first_name='Staff',
+                last_name=str(index),
+                position='Staff',
+                hire_date=date(2024, 1, 1),
+                basic_salary=Decimal('20000.00'),
+                bank_name='Equity Bank',
+                bank_account_number=account,
+            )
+        run_payroll(9, 2025)
+        self.payroll = MonthlyPayroll.objects.get(month=9, year=2025)
+        self.payroll.status = 'APPROVED'
+        self.payroll.save()
+
+    def test_fixed_width_file_is_reconciled(self):
+        import hashlib
+        from .services.bank_payments import FIXED_WIDTH_LINE, start_payment_file, stream_payment_file
+
+        payment_file = start_payment_file(self.payroll, 'FIXED')
+        content = b''.join(stream_payment_file(payment_file))
+        lines = content.decode('ascii').split('\r\n')[:-1]
+
+        self.assertEqual({len(line) for line in lines}, {FIXED_WIDTH_LINE})
+        self.assertEqual([line[0] for line in lines], ['H', 'D', 'D', 'T'])
+        payment_file.refresh_from_db()
+        self.assertTrue(payment_file.is_complete)
+        self.assertEqual(payment_file.row_count, 2)
+        self.assertEqual(payment_file.checksum, hashlib.sha256(content).hexdigest())
+        self.assertEqual(payment_file.validation_errors, [{'employee_id': 'EMP001', 'error': 'Account number must be 6-20 digits'}])
+        self.assertEqual(int(lines[-1][9:27]), int(payment_file.total_amount * 100))
+
+    def test_draft_payroll_rejected(self):
+        from .services.bank_payments import PaymentFileError, start_payment_file
+
+        self.payroll.status = 'DRAFT'
+        with self.assertRaises(PaymentFileError):
+            start_payment_file(self.payroll, 'CSV')
+
+
+class PayrollComparisonTests(TestCase):
+
+    def setUp(self):
+        from .models import MonthlyPayroll
+
+        employees = [
+            Employee.objects.create(
+                employee_id=f'EMP{index:03d}',
+                first_name='Staff',
+                last_name=str(index),
+                position='Staff',
+                department='Production',
+                hire_date=date(2024, 1, 1),
+                basic_salary=Decimal('20000.00'),
+            )
+            for index in range(3)
+        ]
+        run_payroll(8, 2025)
+
+        Employee.objects.filter(pk=employees[0].pk).update(housing_allowance=Decimal('4000.00'))
+        Employee.objects.filter(pk=employees[1].pk).update(basic_salary=Decimal('20100.00'))
+        Employee.objects.filter(pk=employees[2].pk).update(status='TERMINATED')
+        Employee.objects.create(
+            employee_id='EMP003',
+            first_name='Staff',
+            last_name='3',
+            position='Staff',
+            hire_date=date(2025, 9, 1),
+            basic_salary=Decimal('15000.00'),
+        )
+        run_payroll(9, 2025)
+        self.previous = MonthlyPayroll.objects.get(month=8, year=2025)
+        self.current = MonthlyPayroll.objects.get(month=9, year=2025)
+
+    def test_components_flagged_above_threshold(self):
+        from .services.payroll_comparison import compare_payrolls
+
+        with self.assertNumQueries(1):
+            comparison = compare_payrolls(self.previous, self.current)
+        rows = {row['employee_id']: row for row in comparison['rows']}
+
+        self.assertEqual([row['status'] for row in comparison['rows']], ['CHANGED', 'CHANGED', 'MISSING', 'NEW'])
+        self.assertIn('Housing', [change['label'] for change in rows['EMP000']['changes']])
+        self.assertFalse(rows['EMP001']['flagged'])  # +100 basic is below the minimum amount
+        self.assertEqual(rows['EMP002']['net']['current'], Decimal('0.00'))
+        self.assertEqual(comparison['counts'], {'employees': 4, 'new': 1, 'missing': 1, 'flagged': 3})
+
+        totals = {total['field']: total for total in comparison['totals']}
+        self.assertEqual(totals['housing_allowance']['delta'], Decimal('4000.00'))
+        self.assertEqual(
+            totals['net_pay']['delta'],
+            sum((row['net']['delta'] for row in comparison['rows']), Decimal('0.00')),
+        )
@@ -0,0 +1,16 @@
+"""
+Payroll App URLs
+"""
+from django.urls import path
+from . import views
+
+app_name = 'payroll'
+
+urlpatterns = [
+    # Exports
+    path('<int:payroll_id>/bank-file/', views.bank_payment_file, name='bank_payment_file'),
+    
+    # Reports
+    path('simulate/', views.payroll_simulation, name='simulate'),
+    path('compare/', views.payroll_comparison, name='compare'),
+]
@@ -1,3 +1,182 @@
-from django.shortcuts import render
+"""
+Payroll App Views
+"""
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
 
-# Create your views here.
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.views.decorators.http import require_http_methods
+
+from .models import MonthlyPayroll
+from .services.bank_payments import (
+    PaymentFileError, payment_filename, start_payment_file, stream_payment_file
+)
+from .services.payroll_comparison import (
+    DEFAULT_MIN_AMOUNT, DEFAULT_THRESHOLD_PERCENT, compare_payrolls, write_csv
+)
+from .services.payroll_simulator import (
+    AMOUNT_RATES, PERCENT_RATES, ScenarioError, load_snapshot, parse_request, raise_from_text,
+    simulate,
+)
+
+
+PAYROLL_ROLES = ['SUPERADMIN', 'ADMIN']
+MAX_SCENARIOS = 50
+
+
+def _scenario_from_query(params):
+    """
+    Single scenario from query params:
+    raise=Production:10% (repeatable; 'Production:+2000' for an amount, '*:5%' for everyone)
+    health_rate=2.75&health_minimum=300 ... (any allowed rate override)
+    """
+    raises = [raise_from_text(value) for value in params.getlist('raise')]
+    rates = {key: params[key] for key in PERCENT_RATES + AMOUNT_RATES if params.get(key)}
+    return {'name': params.get('name') or 'What-if', 'raises': raises, 'rates': rates}
+
+
+@login_required
+@require_http_methods(['GET', 'POST'])
+def payroll_simulation(request):
+    """
+    What-if payroll simulation - nothing is saved
+    GET:  month=YYYY-MM plus one scenario in query params (see _scenario_from_query)
+    POST: JSON {"month": "YYYY-MM", "scenarios": [scenario, ...]} (up to MAX_SCENARIOS)
+    Permission: SUPERADMIN, ADMIN
+    """
+    if request.user.role not in PAYROLL_ROLES:
+        return JsonResponse({'error': 'You do not have permission to run payroll simulations.'}, status=403)
+
+    if request.method == 'POST':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Request body must be JSON.'}, status=400)
+        try:
+            month, scenarios = parse_request(payload)
+        except ScenarioError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    else:
+        month = request.GET.get('month')
+        scenarios = [_scenario_from_query(request.GET)]
+
+    try:
+        period = datetime.strptime(month, '%Y-%m').date() if month else timezone.localdate()
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'Invalid month format. Use YYYY-MM.'}, status=400)
+
+    if not isinstance(scenarios, list) or not 1 <= len(scenarios) <= MAX_SCENARIOS:
+        return JsonResponse({'error': f'Provide 1 to {MAX_SCENARIOS} scenarios.'}, status=400)
+
+    try:
+        result = simulate(load_snapshot(period.month, period.year), scenarios)
+    except ScenarioError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse(result, encoder=DjangoJSONEncoder)
+
+
+@login_required
+def bank_payment_file(request, payroll_id):
+    """
+    Stream the bank transfer file for a payroll's net pay
+    Query params: format=csv|fixed
+    Each download is recorded as a BankPaymentFile (row count, total, checksum)
+    Permission: SUPERADMIN, ADMIN
+    """
+    if request.user.role not in PAYROLL_ROLES:
+        messages.error(request, 'You do not have permission to export bank payment files.')
+        return redirect('home')
+
+    payroll = get_object_or_404(MonthlyPayroll, pk=payroll_id)
+    file_format = 'FIXED' if request.GET.get('format', 'csv').lower() == 'fixed' else 'CSV'
+    try:
+        payment_file = start_payment_file(
+            payroll, file_format, generated_by=request.user.get_full_name() or request.user.email
+        )
+    except PaymentFileError as e:
+        messages.error(request, str(e))
+        return redirect('home')
+
+    content_type = 'text/plain' if file_format == 'FIXED' else 'text/csv'
+    response = StreamingHttpResponse(stream_payment_file(payment_file), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{payment_filename(payment_file)}"'
+    return response
+
+
+def _payroll_for_month(value):
+    """MonthlyPayroll for a YYYY-MM string (ValueError if malformed, None if not generated)"""
+    period = datetime.strptime(value, '%Y-%m').date()
+    return MonthlyPayroll.objects.filter(month=period.month, year=period.year).first()
+
+
+@login_required
+def payroll_comparison(request):
+    """
+    Month-over-month payroll comparison with flagged changes
+    Query params: from=YYYY-MM, to=YYYY-MM (default: latest payroll vs the one before),
+    threshold=percent, min_amount=KES, show=all, format=csv
+    Permission: SUPERADMIN, ADMIN
+    """
+    if request.user.role not in PAYROLL_ROLES:
+        messages.error(request, 'You do not have permission to compare payrolls.')
+        return redirect('home')
+
+    try:
+        current = (
+            _payroll_for_month(request.GET['to']) if request.GET.get('to')
+            else MonthlyPayroll.objects.order_by('-year', '-month').first()
+        )
+        if current is None:
+            previous = None
+        elif request.GET.get('from'):
+            previous = _payroll_for_month(request.GET['from'])
+        else:
+            previous = (
+                MonthlyPayroll.objects
+                .filter(Q(year__lt=current.year) | Q(year=current.year, month__lt=current.month))
+                .order_by('-year', '-month')
+                .first()
+            )
+    except ValueError:
+        messages.error(request, 'Invalid month format. Use YYYY-MM.')
+        return redirect('home')
+
+    if current is None or previous is None:
+        messages.error(request, 'Two generated payrolls are needed for a comparison.')
+        return redirect('home')
+
+    try:
+        threshold = Decimal(request.GET.get('threshold') or DEFAULT_THRESHOLD_PERCENT)
+        min_amount = Decimal(request.GET.get('min_amount') or DEFAULT_MIN_AMOUNT)
+    except InvalidOperation:
+        messages.error(request, 'Threshold and minimum amount must be numbers.')
+        return redirect('home')
+
+    comparison = compare_payrolls(previous, current, threshold, min_amount)
+    show_all = request.GET.get('show') == 'all'
+
+    if request.GET.get('format', '').lower() == 'csv':
+        filename = f'payroll_comparison_{previous.year}{previous.month:02d}_{current.year}{current.month:02d}'
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        write_csv(comparison, response, flagged_only=not show_all)
+        return response
+
+    rows = comparison['rows'] if show_all else [row for row in comparison['rows'] if row['flagged']]
+    params = request.GET.copy()
+    params.pop('show', None)
+    params.pop('format', None)
+    return render(request, 'payroll/payroll_comparison.html', {
+        'comparison': comparison,
+        'rows': rows,
+        'show_all': show_all,
+        'query': params.urlencode(),
+    })
@@ -234,6 +234,14 @@ class ProductionBatchAdmin(admin.ModelAdmin):
             ),
             'description': '🤖 AUTO: All costs calculated automatically'
         }),
+        ('Actual COGS', {
+            'fields': (
+                'costing_method', 'actual_ingredient_cost', 'actual_packaging_cost',
+                'actual_total_cost', 'costed_at'
+            ),
+            'description': '🤖 AUTO: Stock consumed valued from purchase layers (manage.py cost_production)',
+            'classes': ('collapse',)
+        }),
         ('P&L (Profit & Loss)', {
             'fields': (
                 'selling_price_per_packet', 'expected_revenue',
@@ -251,7 +259,9 @@ class ProductionBatchAdmin(admin.ModelAdmin):
         'expected_packets', 'variance_packets', 'variance_percentage',
         'ingredient_cost', 'packaging_cost', 'allocated_indirect_cost',
         'total_cost', 'cost_per_packet', 'selling_price_per_packet',
-        'expected_revenue', 'gross_profit', 'gross_margin_percentage'
+        'expected_revenue', 'gross_profit', 'gross_margin_percentage',
+        'costing_method', 'actual_ingredient_cost', 'actual_packaging_cost',
+        'actual_total_cost', 'costed_at'
     ]
     
     def batch_display(self, obj):
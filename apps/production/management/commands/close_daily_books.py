@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import date
 from apps.production.models import DailyProduction
+from apps.production.services.book_closing import finish_closed_day
 from apps.accounts.models import User
 
 
@@ -23,6 +24,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Force close even if already closed',
         )
+        parser.add_argument(
+            '--no-email',
+            action='store_true',
+            help='Do not send the daily report email',
+        )
     
     def handle(self, *args, **options):
         # Get date to close
@@ -49,14 +55,18 @@ class Command(BaseCommand):
             )
             self.stdout.write(self.style.SUCCESS(f'Created empty production record for {target_date}'))
         
+        system_user = User.objects.filter(is_superuser=True).first()
+        
         # Check if already closed
         if daily_production.is_closed and not options['force']:
             self.stdout.write(self.style.WARNING(f'Books for {target_date} already closed'))
+            # Closed earlier (Close Books screen or a failed run): finish the
+            # report, costing, forecast, metrics and email that may not have run
+            self.finish_day(daily_production, system_user, options)
             return
         
         # Close books
         try:
-            system_user = User.objects.filter(is_superuser=True).first()
             daily_production.close_books(system_user)
             
             self.stdout.write(self.style.SUCCESS(f'✅ Books closed successfully for {target_date}'))
@@ -72,10 +82,43 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(self.style.SUCCESS(f'  ✓ No variance'))
             
-            # TODO: Send email report (Phase 3)
-            # send_daily_report_email(daily_production)
+            self.finish_day(daily_production, system_user, options)
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error closing books: {str(e)}'))
             raise
-
+    
+    def finish_day(self, daily_production, user, options):
+        """Close-time pipeline: COGS, daily report, stock forecast, metrics, email"""
+        result = finish_closed_day(daily_production, user, send_email=not options['no_email'])
+        
+        costing = result['costing']
+        self.stdout.write(f"  - Actual COGS ({costing['method']}): KES {costing['total_actual_cost']:,.2f}")
+        
+        report = result['report']
+        if result['report_created']:
+            self.stdout.write(self.style.SUCCESS(
+                f'  📊 Daily report generated: revenue KES {report.total_revenue:,.2f}, '
+                f'profit KES {report.gross_profit:,.2f} ({report.gross_margin_percentage}%)'
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(f'  Daily report for {report.date} already exists (unchanged)'))
+        
+        for level, count in sorted(result['forecast']['alerts'].items()):
+            self.stdout.write(self.style.WARNING(f'  🚨 {count} new {level} restock alert(s)'))
+        
+        if result['digest'] is not None:
+            self.report_digest(result['digest'])
+    
+    def report_digest(self, result):
+        """Digest email outcome (recipients already reached were skipped)"""
+        if result['failed']:
+            self.stdout.write(self.style.ERROR(
+                f"  ✉️  Report email: {result['sent']} sent, {result['failed']} failed - re-run to retry"
+            ))
+        elif result['sent'] or result['skipped']:
+            self.stdout.write(self.style.SUCCESS(
+                f"  ✉️  Report email sent to {result['sent']} recipient(s) ({result['skipped']} already had it)"
+            ))
+        else:
+            self.stdout.write(self.style.WARNING('  ✉️  No management recipients for the report email'))
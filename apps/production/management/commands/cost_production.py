@@ -0,0 +1,67 @@
+"""
+Management command to compute actual COGS for production batches
+Values PRODUCTION stock movements from received purchase layers (FIFO / weighted average)
+
+Usage:
+    python manage.py cost_production --date 2025-09-15
+    python manage.py cost_production --month 2025-09 --method WEIGHTED_AVERAGE
+"""
+from calendar import monthrange
+from datetime import date, datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.period_locks import PeriodLockedError
+from apps.production.services.costing import (
+    VALUATION_CLASSES, DEFAULT_COSTING_METHOD, cost_production_batches
+)
+
+
+class Command(BaseCommand):
+    help = 'Compute actual cost of goods for production batches in bulk (per day or month)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Production date to cost (YYYY-MM-DD). Defaults to today.',
+        )
+        parser.add_argument(
+            '--month',
+            type=str,
+            help='Cost every batch in a month (YYYY-MM)',
+        )
+        parser.add_argument(
+            '--method',
+            choices=sorted(VALUATION_CLASSES),
+            default=DEFAULT_COSTING_METHOD,
+            help=f'Inventory valuation method (default: {DEFAULT_COSTING_METHOD})',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options['month']:
+                month_start = datetime.strptime(options['month'], '%Y-%m').date()
+                start_date = month_start
+                end_date = month_start.replace(day=monthrange(month_start.year, month_start.month)[1])
+            elif options['date']:
+                start_date = end_date = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            else:
+                start_date = end_date = date.today()
+        except ValueError:
+            raise CommandError('Invalid date format. Use YYYY-MM-DD for --date and YYYY-MM for --month')
+
+        try:
+            summary = cost_production_batches(start_date, end_date, method=options['method'])
+        except PeriodLockedError as e:
+            raise CommandError(' '.join(e.messages))
+
+        if not summary['batches']:
+            self.stdout.write(self.style.WARNING(f'No production batches between {start_date} and {end_date}'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Costed {summary['batches']} batch(es) / {summary['movements']} stock movement(s) "
+            f"using {summary['method']}"
+        ))
+        self.stdout.write(f"  - Actual COGS: KES {summary['total_actual_cost']:,.2f}")
@@ -0,0 +1,82 @@
+"""
+Management command to import historical months from the Excel books workbook
+
+Usage:
+    python manage.py import_workbook "Docs/Local_woking_docs/Chesantto Books_September 2025_.xlsx"
+    python manage.py import_workbook august.xlsx september.xlsx --chunk-days 10
+    python manage.py import_workbook september.xlsx --dry-run
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.models import User
+from apps.production.services.workbook_import import (
+    DEFAULT_CHUNK_DAYS, WorkbookImportError, import_workbook
+)
+
+
+MAX_ERRORS_SHOWN = 20
+
+
+class Command(BaseCommand):
+    help = 'Import production days, batches, purchases and daily reports from monthly books workbooks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Workbook file(s) (.xlsx)')
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=DEFAULT_CHUNK_DAYS,
+            help=f'Days written per transaction (default {DEFAULT_CHUNK_DAYS})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Read and validate only; show what would be imported',
+        )
+
+    def handle(self, *args, **options):
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days must be at least 1')
+
+        system_user = User.objects.filter(is_superuser=True).first()
+        for path in options['files']:
+            started = time.monotonic()
+            try:
+                summary = import_workbook(
+                    path,
+                    user=system_user,
+                    chunk_days=options['chunk_days'],
+                    dry_run=options['dry_run'],
+                )
+            except WorkbookImportError as e:
+                raise CommandError(str(e))
+            elapsed = time.monotonic() - started
+
+            verb = 'Would import' if options['dry_run'] else 'Imported'
+            self.stdout.write(self.style.SUCCESS(f'✅ {verb} {path} ({elapsed:.1f}s)'))
+            self.stdout.write(
+                f"  - Days: {summary['days']} | Batches: {summary['batches']} | "
+                f"Daily reports: {summary['reports']}"
+            )
+            self.stdout.write(
+                f"  - Purchases: {summary['purchases']} ({summary['purchase_items']} items)"
+            )
+            if summary['skipped_days']:
+                self.stdout.write(self.style.WARNING(
+                    f"  ⚠️  {len(summary['skipped_days'])} day(s) already imported or locked - skipped"
+                ))
+            if summary['unmatched_expenses']:
+                total = sum(summary['unmatched_expenses'].values())
+                self.stdout.write(
+                    f"  - {len(summary['unmatched_expenses'])} expense description(s) not mapped to "
+                    f"inventory items (KES {total:,.2f}) - not imported as purchases"
+                )
+            errors = summary['errors']
+            if errors:
+                self.stdout.write(self.style.WARNING(f'  ⚠️  {len(errors)} row(s) failed validation:'))
+                for error in errors[:MAX_ERRORS_SHOWN]:
+                    self.stdout.write(f'    - {error}')
+                if len(errors) > MAX_ERRORS_SHOWN:
+                    self.stdout.write(f'    ... and {len(errors) - MAX_ERRORS_SHOWN} more')
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-19 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productionbatch',
+            name='actual_ingredient_cost',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='🤖 AUTO: Ingredients consumed × purchase layer cost', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='productionbatch',
+            name='actual_packaging_cost',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='🤖 AUTO: Packaging consumed × purchase layer cost', max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='productionbatch',
+            name='actual_total_cost',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='🤖 AUTO: Actual ingredient + actual packaging + indirect', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='productionbatch',
+            name='costed_at',
+            field=models.DateTimeField(blank=True, help_text='🤖 AUTO: When actual costs were last computed', null=True),
+        ),
+        migrations.AddField(
+            model_name='productionbatch',
+            name='costing_method',
+            field=models.CharField(blank=True, choices=[('FIFO', 'FIFO'), ('WEIGHTED_AVERAGE', 'Weighted Average')], help_text='🤖 AUTO: Method used for the actual costs below', max_length=20),
+        ),
+    ]
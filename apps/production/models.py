@@ -7,6 +7,9 @@ from django.conf import settings
 from django.utils import timezone
 from decimal import Decimal
 from django.core.exceptions import ValidationError
+from apps.core.period_locks import (
+    PeriodLockedQuerySet, allow_closed_day_edits, assert_batches_writable
+)
 
 
 class DailyProduction(models.Model):
@@ -239,7 +242,9 @@ class DailyProduction(models.Model):
             self.is_closed = True
             self.closed_at = timezone.now()
             self.updated_by = user
-            self.save()
+            # Closing re-allocates indirect costs to the day's batches (post_save signal)
+            with allow_closed_day_edits():
+                self.save()
     
     def save(self, *args, **kwargs):
         """Override save to auto-calculate values"""
@@ -254,6 +259,11 @@ class ProductionBatch(models.Model):
     Individual production batch (one mix)
     Auto-deducts ingredients from inventory via Django signal
     """
+    COSTING_METHOD_CHOICES = [
+        ('FIFO', 'FIFO'),
+        ('WEIGHTED_AVERAGE', 'Weighted Average'),
+    ]
+    
     daily_production = models.ForeignKey(
         DailyProduction,
         on_delete=models.CASCADE,
@@ -340,6 +350,37 @@ class ProductionBatch(models.Model):
         help_text="🤖 AUTO: total_cost / actual_packets"
     )
     
+    # Actual COGS (stock consumed, valued from purchase layers by the costing engine)
+    costing_method = models.CharField(
+        max_length=20,
+        choices=COSTING_METHOD_CHOICES,
+        blank=True,
+        help_text="🤖 AUTO: Method used for the actual costs below"
+    )
+    actual_ingredient_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="🤖 AUTO: Ingredients consumed × purchase layer cost"
+    )
+    actual_packaging_cost = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        help_text="🤖 AUTO: Packaging consumed × purchase layer cost"
+    )
+    actual_total_cost = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="🤖 AUTO: Actual ingredient + actual packaging + indirect"
+    )
+    costed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="🤖 AUTO: When actual costs were last computed"
+    )
+    
     # P&L (CEO requirement)
     selling_price_per_packet = models.DecimalField(
         max_digits=10,
@@ -398,9 +439,16 @@ class ProductionBatch(models.Model):
         verbose_name_plural = "Production Batches"
         unique_together = ['daily_production', 'batch_number']
     
+    objects = PeriodLockedQuerySet.as_manager()
+    
     def __str__(self):
         return f"{self.mix.product.name} Batch #{self.batch_number} ({self.daily_production.date})"
     
+    @classmethod
+    def assert_period_open(cls, batches):
+        """Raise PeriodLockedError if any batch belongs to a closed day/month"""
+        assert_batches_writable(batches)
+    
     def calculate_variance(self):
         """Calculate production variance (actual vs expected)"""
         try:
@@ -508,6 +556,10 @@ class ProductionBatch(models.Model):
         if self.pk and self.is_finalized:
             raise ValidationError("Cannot edit finalized batch (books closed)")
         
+        # Can't add/edit batches on closed days or in closed accounting periods
+        if self.daily_production_id:
+            self.assert_period_open([self])
+        
         # Actual packets should be positive (only validate if value is set)
         if self.actual_packets is not None and self.actual_packets < 0:
             raise ValidationError("Actual packets cannot be negative")
@@ -519,6 +571,8 @@ class ProductionBatch(models.Model):
     
     def save(self, *args, **kwargs):
         """Override save to auto-calculate all values"""
+        self.assert_period_open([self])
+        
         # Ensure integer fields are not None
         if self.actual_packets is None:
             self.actual_packets = 0
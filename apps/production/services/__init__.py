@@ -0,0 +1 @@
+"""Production services package"""
@@ -0,0 +1,56 @@
+"""
+Book Closing Pipeline
+Everything that has to happen once a day's books are closed
+
+DailyProduction.close_books() only locks the day. Whoever closed it - the
+9PM cron (close_daily_books) or the Close Books screen - then runs:
+1. Actual COGS for the day's batches from purchase layers
+2. The immutable DailyReport (one pass over the day's batches)
+3. Usage rates, days of supply and restock alerts
+4. Analytics store: the day's final totals + end-of-day inventory levels
+5. The daily digest email
+
+Every step can be repeated: an existing report is returned untouched, the
+costing, forecast and metrics recompute the same values, and the digest
+skips recipients already reached. The cron runs it again for a day that was
+already closed, which finishes anything an earlier run did not.
+"""
+from apps.analytics.services.metrics import record_days, record_inventory_levels
+from apps.inventory.services.consumption import update_stock_forecast
+from apps.production.services.costing import cost_production_batches
+from apps.reports.services.daily_report import build_daily_report
+from apps.reports.services.digest import send_daily_digest
+
+
+def finish_closed_day(daily_production, user=None, send_email=True):
+    """
+    Run the close-time pipeline for a closed DailyProduction
+
+    Returns {
+        'costing': cost_production_batches result,
+        'report', 'report_created',
+        'forecast': update_stock_forecast result,
+        'digest': send_daily_digest counts (None when not sent),
+    }
+    """
+    day = daily_production.date
+    costing = cost_production_batches(day, day)
+    report, created = build_daily_report(daily_production, user)
+
+    # Window runs through the last closed day, which now includes this one
+    forecast = update_stock_forecast()
+
+    record_days([day])
+    record_inventory_levels(day)
+
+    digest = None
+    if send_email and not report.email_sent:
+        digest = send_daily_digest(report, sent_by=user)
+
+    return {
+        'costing': costing,
+        'report': report,
+        'report_created': created,
+        'forecast': forecast,
+        'digest': digest,
+    }
@@ -0,0 +1,253 @@
+"""
+Production Costing Engine
+Actual cost of goods for production batches, valued from purchase layers
+
+ProductionBatch.ingredient_cost is a snapshot of Mix.total_cost. This engine
+instead values the stock each batch actually consumed (its PRODUCTION
+StockMovements) against the received PurchaseItems, using FIFO or a moving
+weighted average, and stores the result on the movements and batches.
+
+Batches are costed in bulk for a date range (a day or a month):
+1. Batches in the range
+2. Their PRODUCTION movements
+3. Items involved (conversion factor, fallback cost, category)
+4. Received purchase lines for those items (the layers' unit costs)
+5. Full movement history for those items up to the last movement being costed
+then one bulk_update for movements and one for batches.
+"""
+from collections import defaultdict, deque
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.utils import timezone
+
+from apps.core.period_locks import allow_closed_day_edits
+from apps.inventory.models import InventoryItem, PurchaseItem, StockMovement
+from apps.production.models import ProductionBatch
+
+
+FIFO = 'FIFO'
+WEIGHTED_AVERAGE = 'WEIGHTED_AVERAGE'
+DEFAULT_COSTING_METHOD = FIFO
+
+ZERO = Decimal('0')
+UNIT_COST_PLACES = Decimal('0.0001')
+MONEY_PLACES = Decimal('0.01')
+
+
+# ============================================================================
+# INVENTORY VALUATION
+# ============================================================================
+
+class FifoLayers:
+    """Open purchase layers for one item, oldest first"""
+
+    def __init__(self, fallback_cost):
+        self.layers = deque()  # [quantity_remaining, unit_cost]
+        self.last_cost = fallback_cost
+
+    def receive(self, quantity, unit_cost):
+        self.layers.append([quantity, unit_cost])
+        self.last_cost = unit_cost
+
+    def issue(self, quantity):
+        """Remove quantity from the oldest layers; returns total cost"""
+        cost = ZERO
+        remaining = quantity
+        while remaining > 0 and self.layers:
+            layer = self.layers[0]
+            taken = min(layer[0], remaining)
+            cost += taken * layer[1]
+            layer[0] -= taken
+            remaining -= taken
+            if layer[0] <= 0:
+                self.layers.popleft()
+        if remaining > 0:
+            # Consumed more than was ever received (e.g. stock seeded without movements)
+            cost += remaining * self.last_cost
+        return cost
+
+    @property
+    def current_cost(self):
+        return self.layers[-1][1] if self.layers else self.last_cost
+
+
+class WeightedAverage:
+    """Moving weighted-average cost for one item"""
+
+    def __init__(self, fallback_cost):
+        self.quantity = ZERO
+        self.average = fallback_cost
+
+    def receive(self, quantity, unit_cost):
+        on_hand = max(self.quantity, ZERO)
+        total = on_hand + quantity
+        if total > 0:
+            self.average = (on_hand * self.average + quantity * unit_cost) / total
+        self.quantity += quantity
+
+    def issue(self, quantity):
+        self.quantity -= quantity
+        return quantity * self.average
+
+    @property
+    def current_cost(self):
+        return self.average
+
+
+VALUATION_CLASSES = {
+    FIFO: FifoLayers,
+    WEIGHTED_AVERAGE: WeightedAverage,
+}
+
+
+# ============================================================================
+# COSTING RUN
+# ============================================================================
+
+def _load_purchase_costs(item_ids, conversion):
+    """{(purchase_id, item_id): cost per recipe_unit} for received purchases"""
+    costs = {}
+    for purchase_id, item_id, unit_cost in PurchaseItem.objects.filter(
+        item_id__in=item_ids,
+        purchase__status='RECEIVED'
+    ).values_list('purchase_id', 'item_id', 'unit_cost'):
+        factor = conversion.get(item_id) or Decimal('1')
+        costs[(purchase_id, item_id)] = unit_cost / factor
+    return costs
+
+
+def value_movements(history, items, purchase_costs, method, targets):
+    """
+    Replay each item's movement history and value the target movements
+
+    history: movement dicts ordered by (created_at, id)
+    items: {item_id: item dict with cost_per_recipe_unit}
+    targets: set of movement ids to value
+    Returns {movement_id: (unit_cost, total_cost)}
+    """
+    valuation_class = VALUATION_CLASSES[method]
+    books = {}
+    values = {}
+
+    for movement in history:
+        item_id = movement['item_id']
+        book = books.get(item_id)
+        if book is None:
+            fallback = items[item_id]['cost_per_recipe_unit'] or ZERO
+            book = books[item_id] = valuation_class(fallback)
+            # Stock that existed before the first recorded movement
+            if movement['stock_before'] > 0:
+                book.receive(movement['stock_before'], fallback)
+
+        quantity = movement['quantity']
+        if quantity > 0:
+            unit_cost = book.current_cost
+            if movement['movement_type'] == 'PURCHASE':
+                unit_cost = purchase_costs.get((movement['reference_id'], item_id), unit_cost)
+            book.receive(quantity, unit_cost)
+        elif quantity < 0:
+            issued = -quantity
+            cost = book.issue(issued)
+            if movement['id'] in targets:
+                values[movement['id']] = (
+                    (cost / issued).quantize(UNIT_COST_PLACES, ROUND_HALF_UP),
+                    cost.quantize(MONEY_PLACES, ROUND_HALF_UP),
+                )
+
+    return values
+
+
+def cost_production_batches(start_date, end_date, method=DEFAULT_COSTING_METHOD):
+    """
+    Compute actual COGS for every batch produced between start_date and end_date (inclusive)
+    Returns a summary dict: batches, movements, method, total_actual_cost
+    """
+    if method not in VALUATION_CLASSES:
+        raise ValueError(f'Unknown costing method: {method}')
+
+    batches = list(
+        ProductionBatch.objects.filter(
+            daily_production__date__gte=start_date,
+            daily_production__date__lte=end_date,
+        ).only('id', 'daily_production_id', 'batch_number', 'allocated_indirect_cost')
+    )
+    summary = {'batches': 0, 'movements': 0, 'method': method, 'total_actual_cost': ZERO}
+    if not batches:
+        return summary
+
+    targets = list(
+        StockMovement.objects.filter(
+            movement_type='PRODUCTION',
+            reference_type='PRODUCTION',
+            reference_id__in=[batch.id for batch in batches],
+        ).only('id', 'item_id', 'reference_id', 'quantity', 'created_at')
+    )
+    item_ids = {movement.item_id for movement in targets}
+
+    items = {}
+    if item_ids:
+        items = {
+            row['id']: row
+            for row in InventoryItem.objects.filter(id__in=item_ids).values(
+                'id', 'conversion_factor', 'cost_per_recipe_unit', 'category__code'
+            )
+        }
+        conversion = {item_id: row['conversion_factor'] for item_id, row in items.items()}
+        purchase_costs = _load_purchase_costs(item_ids, conversion)
+
+        cutoff = max(movement.created_at for movement in targets)
+        history = StockMovement.objects.filter(
+            item_id__in=item_ids,
+            created_at__lte=cutoff,
+        ).order_by('created_at', 'id').values(
+            'id', 'item_id', 'movement_type', 'quantity', 'stock_before', 'reference_id'
+        )
+        values = value_movements(
+            history.iterator(chunk_size=2000),
+            items,
+            purchase_costs,
+            method,
+            {movement.id for movement in targets},
+        )
+    else:
+        values = {}
+
+    # Per-batch totals, split ingredient vs packaging by item category
+    ingredient_cost = defaultdict(lambda: ZERO)
+    packaging_cost = defaultdict(lambda: ZERO)
+    for movement in targets:
+        unit_cost, total_cost = values.get(movement.id, (ZERO, ZERO))
+        movement.unit_cost = unit_cost
+        movement.total_cost = total_cost
+        if items[movement.item_id]['category__code'] == 'PACKAGING':
+            packaging_cost[movement.reference_id] += total_cost
+        else:
+            ingredient_cost[movement.reference_id] += total_cost
+
+    now = timezone.now()
+    for batch in batches:
+        batch.costing_method = method
+        batch.actual_ingredient_cost = ingredient_cost[batch.id]
+        batch.actual_packaging_cost = packaging_cost[batch.id]
+        batch.actual_total_cost = (
+            batch.actual_ingredient_cost
+            + batch.actual_packaging_cost
+            + batch.allocated_indirect_cost
+        ).quantize(MONEY_PLACES, ROUND_HALF_UP)
+        batch.costed_at = now
+        summary['total_actual_cost'] += batch.actual_total_cost
+
+    # Costing usually runs after the 9PM close - closed accounting months stay locked
+    with allow_closed_day_edits():
+        if targets:
+            StockMovement.objects.bulk_update(targets, ['unit_cost', 'total_cost'], batch_size=500)
+        ProductionBatch.objects.bulk_update(
+            batches,
+            ['costing_method', 'actual_ingredient_cost', 'actual_packaging_cost',
+             'actual_total_cost', 'costed_at'],
+            batch_size=500,
+        )
+
+    summary['batches'] = len(batches)
+    summary['movements'] = len(targets)
+    return summary
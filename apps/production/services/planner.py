@@ -0,0 +1,168 @@
+"""
+Production Planner
+How many batches of each active mix current stock can make, and a plan
+
+Loads everything in two queries:
+1. The BOM lines of every active mix (with product price and yield)
+2. Stock of the inventory items those lines use, plus the packaging bags
+   (1 bag per packet, as deducted by the production signals)
+
+For each mix the feasible batch count is the minimum over its lines of
+floor(stock / quantity per batch); the line with the smallest ratio is the
+bottleneck. Mixes share ingredients (flour, sugar, bags), so the plan then
+allocates stock greedily across mixes in order of margin per batch.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Q
+
+from apps.inventory.models import InventoryItem
+from apps.products.models import MixIngredient
+
+
+ZERO = Decimal('0')
+
+# (recipe line unit, inventory recipe_unit) -> factor
+UNIT_FACTORS = {
+    ('kg', 'g'): Decimal('1000'),
+    ('g', 'kg'): Decimal('0.001'),
+    ('l', 'ml'): Decimal('1000'),
+    ('ml', 'l'): Decimal('0.001'),
+}
+
+
+def to_recipe_units(quantity, unit, recipe_unit):
+    """Recipe line quantity in the inventory item's recipe_unit"""
+    return quantity * UNIT_FACTORS.get((unit, recipe_unit), 1)
+
+
+def _load_mixes():
+    """{mix_id: mix dict with 'lines': [(item_id, quantity, unit)]}"""
+    rows = MixIngredient.objects.filter(
+        mix__is_active=True, mix__product__is_active=True
+    ).values(
+        'mix_id', 'mix__name', 'mix__version', 'mix__expected_packets', 'mix__total_cost',
+        'mix__product__name', 'mix__product__price_per_packet',
+        'quantity', 'unit', 'ingredient__inventory_item_id',
+    ).order_by()
+    mixes = {}
+    for row in rows:
+        mix = mixes.setdefault(row['mix_id'], {
+            'mix_id': row['mix_id'],
+            'mix': f"{row['mix__name']} (v{row['mix__version']})",
+            'product': row['mix__product__name'],
+            'expected_packets': row['mix__expected_packets'],
+            'margin_per_batch': (
+                row['mix__expected_packets'] * row['mix__product__price_per_packet']
+                - row['mix__total_cost']
+            ),
+            'lines': [],
+        })
+        if row['ingredient__inventory_item_id'] and row['quantity'] > 0:
+            mix['lines'].append((row['ingredient__inventory_item_id'], row['quantity'], row['unit']))
+    return mixes
+
+
+def _load_stock(item_ids, products):
+    """
+    {item_id: item dict} for the BOM items, and {product name: bag item id}
+    Packaging bags are matched by name like deduct_packaging_bags does
+    """
+    items = {}
+    packaging = {}
+    generic_bag = None
+    for item in InventoryItem.objects.filter(
+        Q(id__in=item_ids) | Q(name__icontains='packaging bag')
+    ).values('id', 'name', 'current_stock', 'recipe_unit'):
+        items[item['id']] = item
+        for product in products:
+            if item['name'] == f'Packaging Bags ({product})':
+                packaging[product] = item['id']
+        if 'packaging bag' in item['name'].lower() and generic_bag is None:
+            generic_bag = item['id']
+    for product in products:
+        if product not in packaging and generic_bag is not None:
+            packaging[product] = generic_bag
+    return items, packaging
+
+
+def _batches_possible(needs, stock):
+    """(max batches, bottleneck item id) - min of stock / need over the lines"""
+    if not needs:
+        return None, None
+    ratios = {item_id: int(max(stock[item_id], ZERO) // need) for item_id, need in needs.items()}
+    bottleneck = min(ratios, key=ratios.get)
+    return ratios[bottleneck], bottleneck
+
+
+def plan_production():
+    """
+    Feasible batches per active mix and a margin-ordered plan
+
+    Returns {
+        'mixes': [{mix_id, mix, product, expected_packets, margin_per_batch,
+                   max_batches, bottleneck: {item_id, name, available,
+                   needed_per_batch, unit} | None}],
+        'plan': [{mix_id, mix, product, batches, packets, margin}],
+        'total_margin',
+    }
+    max_batches is None for a mix with no stocked ingredients (not limited)
+    """
+    mixes = _load_mixes()
+    item_ids = {item_id for mix in mixes.values() for item_id, _, _ in mix['lines']}
+    items, packaging = _load_stock(item_ids, {mix['product'] for mix in mixes.values()})
+
+    # Per mix: {item_id: quantity per batch in recipe units}
+    for mix in mixes.values():
+        needs = defaultdict(lambda: ZERO)
+        for item_id, quantity, unit in mix['lines']:
+            if item_id in items:
+                needs[item_id] += to_recipe_units(quantity, unit, items[item_id]['recipe_unit'])
+        bag_id = packaging.get(mix['product'])
+        if bag_id is not None and mix['expected_packets'] > 0:
+            needs[bag_id] += mix['expected_packets']
+        mix['needs'] = dict(needs)
+
+    stock = {item_id: item['current_stock'] for item_id, item in items.items()}
+    results = []
+    for mix in mixes.values():
+        max_batches, bottleneck = _batches_possible(mix['needs'], stock)
+        results.append({
+            'mix_id': mix['mix_id'],
+            'mix': mix['mix'],
+            'product': mix['product'],
+            'expected_packets': mix['expected_packets'],
+            'margin_per_batch': mix['margin_per_batch'],
+            'max_batches': max_batches,
+            'bottleneck': {
+                'item_id': bottleneck,
+                'name': items[bottleneck]['name'],
+                'available': items[bottleneck]['current_stock'],
+                'needed_per_batch': mix['needs'][bottleneck],
+                'unit': items[bottleneck]['recipe_unit'],
+            } if bottleneck is not None else None,
+        })
+
+    # Greedy allocation: the most profitable batches take the shared stock first
+    plan = []
+    total_margin = ZERO
+    for mix in sorted(mixes.values(), key=lambda mix: mix['margin_per_batch'], reverse=True):
+        batches, _ = _batches_possible(mix['needs'], stock)
+        if not batches or mix['margin_per_batch'] <= 0:
+            continue
+        for item_id, need in mix['needs'].items():
+            stock[item_id] -= need * batches
+        margin = mix['margin_per_batch'] * batches
+        total_margin += margin
+        plan.append({
+            'mix_id': mix['mix_id'],
+            'mix': mix['mix'],
+            'product': mix['product'],
+            'batches': batches,
+            'packets': batches * mix['expected_packets'],
+            'margin': margin,
+        })
+
+    results.sort(key=lambda row: (row['product'], row['mix']))
+    return {'mixes': results, 'plan': plan, 'total_margin': total_margin}
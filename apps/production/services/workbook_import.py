@@ -0,0 +1,650 @@
+"""
+Historical Workbook Import
+Loads a monthly "Chesanto Books" Excel workbook into the production, purchase
+and report tables
+
+- The workbook is streamed once with openpyxl (read_only, values only)
+- Each sheet is parsed into column lists; validation runs column by column
+  and bad rows are dropped and reported as "Sheet!row: message"
+- Days, batches and reports are written with bulk_create in transactional
+  chunks of days; purchases in chunks of purchase days
+- Re-running is idempotent: dates that already have a DailyProduction and
+  purchase numbers (XLS-YYYYMMDD) that already exist are skipped
+- Days and expenditure dated in a closed accounting month are skipped and
+  reported
+- The analytics metrics of the imported dates are recorded at the end
+
+Sheets used:
+    Production                  -> ProductionBatch (one per "Mix N" row)
+    Dispatch and Sales per day  -> DailyProduction dispatched / returned
+    Fuel reconciliation         -> DailyProduction fuel / diesel costs
+    Expenditure                 -> Purchase + PurchaseItem (RECEIVED)
+
+Imported days are closed history: bulk_create skips the model save() and
+signals, so no stock is deducted or received; derived batch / day fields are
+computed here instead. Batch ingredient costs are the workbook's actual costs.
+"""
+import re
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.analytics.services.metrics import record_days
+from apps.core.period_locks import allow_closed_day_edits, registry
+from apps.inventory.models import InventoryItem, Purchase, PurchaseItem, Supplier
+from apps.production.models import DailyProduction, ProductionBatch
+from apps.products.models import Mix
+from apps.reports.models import DailyReport
+from apps.reports.services.charts import chart_fields
+from apps.reports.services.daily_report import daily_report_values, margin
+
+
+DEFAULT_CHUNK_DAYS = 7
+
+PRODUCTION_SHEET = 'Production'
+DISPATCH_SHEET = 'Dispatch and Sales per day'
+EXPENDITURE_SHEET = 'Expenditure'
+FUEL_SHEET = 'Fuel reconciliation'
+REQUIRED_SHEETS = [PRODUCTION_SHEET, DISPATCH_SHEET, EXPENDITURE_SHEET, FUEL_SHEET]
+
+# Production sheet blocks: product -> (mix, ingredient, total cost, total production) columns
+PRODUCTION_BLOCKS = {
+    'Bread': (1, 2, 5, 6),
+    'KDF': (9, 10, 13, 14),
+    'Scones': (19, 20, 23, 24),
+}
+SAME_AS_ABOVE = '"'
+
+# Dispatch sheet: DailyProduction field prefix -> (dispatch, returns) columns
+DISPATCH_COLUMNS = {
+    'bread': (3, 6),
+    'kdf': (15, 18),
+    'scones': (27, 30),
+}
+DISPATCH_SKIP_ROWS = {'subtotal', 'closing stock'}
+
+# Fuel sheet: (date, amount) columns
+TRUCK_FUEL_COLUMNS = (0, 2)
+DIESEL_COLUMNS = (6, 8)
+
+# Expenditure description (normalised, see _description_key) -> InventoryItem name
+EXPENDITURE_ITEMS = {
+    'unga': 'Wheat Flour',
+    'extraunga': 'Wheat Flour',
+    'sugar': 'Sugar',
+    'cookingfat': 'Cooking Fat',
+    'cookingoil': 'Cooking Oil',
+    'yeast': 'Yeast (Standard)',
+    'breadimprover': 'Bread Improver',
+    'salt': 'Salt',
+    'calcium': 'Calcium',
+    'foodcolour': 'Food Colour',
+    'packagingpapers': 'Packaging Papers',
+    'diesel': 'Diesel',
+    'firewood': 'Firewood',
+}
+
+IMPORT_SUPPLIER = 'Historical Import (Workbook)'
+PURCHASE_PREFIX = 'XLS-'
+
+ZERO = Decimal('0.00')
+MONEY = Decimal('0.01')
+QUANTITY = Decimal('0.001')
+
+
+class WorkbookImportError(ValueError):
+    """Raised when the workbook cannot be read or is missing a sheet"""
+
+
+# ============================================================================
+# CELL HELPERS
+# ============================================================================
+
+def parse_sheet_date(value):
+    """'01.09.2025', a datetime or a date -> date (None if not a date)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.strptime(value.strip(), '%d.%m.%Y').date()
+        except ValueError:
+            return None
+    return None
+
+
+def _decimal(value):
+    """Numeric cell -> Decimal (None for blanks and text)"""
+    if value is None or isinstance(value, (bool, str, datetime, date)):
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _cell(row, column):
+    return row[column] if column < len(row) else None
+
+
+def _text(value):
+    return str(value).strip() if value is not None else ''
+
+
+def _description_key(description):
+    """'Cookingfat (10kg cartons)' -> 'cookingfat', 'Extra unga' -> 'extraunga'"""
+    text = re.split(r'[(\d]', _text(description).lower(), maxsplit=1)[0]
+    return re.sub(r'[^a-z]', '', text)
+
+
+# ============================================================================
+# SHEET PARSERS (rows -> column lists)
+# ============================================================================
+
+def _columns(*names):
+    return {name: [] for name in ('row',) + names}
+
+
+def parse_production(rows):
+    """
+    One entry per batch ("Mix N" row) per product block
+    Mix 1 is itemised (ingredient lines + a subtotal row with the mix cost);
+    later mixes carry the mix cost and output on their own row
+    """
+    columns = _columns('date', 'product', 'packets', 'cost')
+    current_date = None
+    open_batches = {}  # product -> index of an itemised batch still awaiting its subtotal
+
+    for row_number, row in enumerate(rows, start=1):
+        if row_number <= 2:
+            continue
+        row_date = parse_sheet_date(_cell(row, 0))
+        if row_date is not None:
+            current_date = row_date
+
+        for product, (mix_col, ingredient_col, cost_col, output_col) in PRODUCTION_BLOCKS.items():
+            label = _text(_cell(row, mix_col))
+            ingredient = _text(_cell(row, ingredient_col))
+            cost = _cell(row, cost_col)
+
+            if label.lower().startswith('mix'):
+                columns['row'].append(row_number)
+                columns['date'].append(current_date)
+                columns['product'].append(product)
+                columns['packets'].append(_cell(row, output_col))
+                columns['cost'].append(cost)
+                if ingredient and ingredient != SAME_AS_ABOVE:
+                    open_batches[product] = len(columns['row']) - 1
+                else:
+                    open_batches.pop(product, None)
+            elif product in open_batches and not label and cost is not None:
+                index = open_batches[product]
+                if ingredient:
+                    # Another ingredient line of the itemised mix
+                    running = _decimal(columns['cost'][index])
+                    line = _decimal(cost)
+                    if running is not None and line is not None:
+                        columns['cost'][index] = running + line
+                else:
+                    # Subtotal row: the mix total replaces the running sum
+                    columns['cost'][index] = cost
+                    del open_batches[product]
+    return columns
+
+
+def parse_dispatch(rows):
+    """One entry per salesperson row: (dispatched, returned) per product"""
+    fields = [f'{prefix}_{kind}' for prefix in DISPATCH_COLUMNS for kind in ('dispatched', 'returned')]
+    columns = _columns('date', *fields)
+    current_date = None
+
+    for row_number, row in enumerate(rows, start=1):
+        if row_number <= 2:
+            continue
+        first = _cell(row, 0)
+        row_date = parse_sheet_date(first)
+        if row_date is not None:
+            current_date = row_date
+        elif first is not None:
+            break  # "Grand Totals" - end of the daily rows
+        staff = _text(_cell(row, 1)).lower()
+        if not staff or staff in DISPATCH_SKIP_ROWS or current_date is None:
+            continue
+
+        columns['row'].append(row_number)
+        columns['date'].append(current_date)
+        for prefix, (dispatch_col, returns_col) in DISPATCH_COLUMNS.items():
+            columns[f'{prefix}_dispatched'].append(_cell(row, dispatch_col))
+            columns[f'{prefix}_returned'].append(_cell(row, returns_col))
+    return columns
+
+
+def parse_fuel(rows):
+    """Truck fuel and diesel lines: (date, kind, amount)"""
+    columns = _columns('date', 'kind', 'amount')
+    for row_number, row in enumerate(rows, start=1):
+        for kind, (date_col, amount_col) in (('fuel', TRUCK_FUEL_COLUMNS), ('diesel', DIESEL_COLUMNS)):
+            row_date = parse_sheet_date(_cell(row, date_col))
+            amount = _cell(row, amount_col)
+            if row_date is None or amount is None:
+                continue  # headers, carried-forward balances, deposits
+            columns['row'].append(row_number)
+            columns['date'].append(row_date)
+            columns['kind'].append(kind)
+            columns['amount'].append(amount)
+    return columns
+
+
+def parse_expenditure(rows):
+    """Expense lines (the date is only on the first line of each day; subtotals skipped)"""
+    columns = _columns('date', 'description', 'quantity', 'total')
+    current_date = None
+    for row_number, row in enumerate(rows, start=1):
+        if row_number == 1:
+            continue
+        row_date = parse_sheet_date(_cell(row, 0))
+        if row_date is not None:
+            current_date = row_date
+        description = _text(_cell(row, 1))
+        if not description or current_date is None:
+            continue
+        if description.lower().startswith('total'):
+            break
+        columns['row'].append(row_number)
+        columns['date'].append(current_date)
+        columns['description'].append(description)
+        columns['quantity'].append(_cell(row, 2))
+        columns['total'].append(_cell(row, 4))
+    return columns
+
+
+# ============================================================================
+# VALIDATION (column by column)
+# ============================================================================
+
+def _check(columns, name, convert, message, bad, errors, sheet):
+    """
+    Convert a whole column in place; rows whose value fails get `message`
+    and are added to `bad`
+    """
+    converted = []
+    for index, value in enumerate(columns[name]):
+        result = convert(value)
+        if result is None:
+            bad.add(index)
+            errors.append(f'{sheet}!{columns["row"][index]}: {message} ({value!r})')
+        converted.append(result)
+    columns[name] = converted
+
+
+def _non_negative(value):
+    number = _decimal(value)
+    return number if number is not None and number >= 0 else None
+
+
+def _blank_is_zero(value):
+    return ZERO if value is None else _non_negative(value)
+
+
+def _count(value):
+    number = _non_negative(value)
+    return int(number) if number is not None and number == number.to_integral_value() else None
+
+
+def _positive(value):
+    number = _decimal(value)
+    return number if number is not None and number > 0 else None
+
+
+def _valid_rows(columns, bad):
+    """Drop the bad indexes from every column"""
+    keep = [index for index in range(len(columns['row'])) if index not in bad]
+    return {name: [values[index] for index in keep] for name, values in columns.items()}
+
+
+def validate_production(columns, errors):
+    bad = set()
+    _check(columns, 'date', lambda value: value, 'batch before the first date', bad, errors, PRODUCTION_SHEET)
+    _check(columns, 'packets', _count, 'output is not a whole non-negative number', bad, errors, PRODUCTION_SHEET)
+    _check(columns, 'cost', _non_negative, 'mix cost is not a non-negative number', bad, errors, PRODUCTION_SHEET)
+    return _valid_rows(columns, bad)
+
+
+def validate_dispatch(columns, errors):
+    bad = set()
+    for name in list(columns):
+        if name.endswith(('_dispatched', '_returned')):
+            _check(columns, name, _blank_is_zero, f'{name.replace("_", " ")} is not a number', bad, errors, DISPATCH_SHEET)
+    return _valid_rows(columns, bad)
+
+
+def validate_fuel(columns, errors):
+    bad = set()
+    _check(columns, 'amount', _non_negative, 'amount is not a non-negative number', bad, errors, FUEL_SHEET)
+    return _valid_rows(columns, bad)
+
+
+def validate_expenditure(columns, errors):
+    bad = set()
+    _check(columns, 'quantity', _positive, 'quantity is not a positive number', bad, errors, EXPENDITURE_SHEET)
+    _check(columns, 'total', _non_negative, 'total is not a non-negative number', bad, errors, EXPENDITURE_SHEET)
+    return _valid_rows(columns, bad)
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def read_workbook(path):
+    """
+    Stream the four sheets once and return the validated column lists
+    Returns (sheets dict, errors list)
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise WorkbookImportError('openpyxl is required to import workbooks (pip install openpyxl)')
+
+    try:
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    except (OSError, ValueError, KeyError) as e:
+        raise WorkbookImportError(f'Could not open workbook {path}: {e}')
+
+    try:
+        missing = [name for name in REQUIRED_SHEETS if name not in workbook.sheetnames]
+        if missing:
+            raise WorkbookImportError(f'Workbook is missing sheet(s): {", ".join(missing)}')
+
+        def rows(name):
+            return workbook[name].iter_rows(values_only=True)
+
+        errors = []
+        sheets = {
+            'production': validate_production(parse_production(rows(PRODUCTION_SHEET)), errors),
+            'dispatch': validate_dispatch(parse_dispatch(rows(DISPATCH_SHEET)), errors),
+            'fuel': validate_fuel(parse_fuel(rows(FUEL_SHEET)), errors),
+            'expenditure': validate_expenditure(parse_expenditure(rows(EXPENDITURE_SHEET)), errors),
+        }
+    finally:
+        workbook.close()
+    return sheets, errors
+
+
+# ============================================================================
+# BUILDING MODEL INSTANCES (in memory)
+# ============================================================================
+
+def _product_mixes():
+    """Product name -> the active Mix used for imported batches (one query)"""
+    mixes = {}
+    for mix in Mix.objects.filter(is_active=True).select_related('product').order_by('id'):
+        mixes.setdefault(mix.product.name, mix)
+    return mixes
+
+
+def build_day(day, batches, dispatch, fuel, opening, user, closed_at, source):
+    """
+    Unsaved DailyProduction + ProductionBatches + DailyReport for one date
+    batches: [(product, mix, packets, cost)]; dispatch: {field: total};
+    fuel: {'fuel': amount, 'diesel': amount}; opening: {prefix: stock}
+    """
+    daily_production = DailyProduction(
+        date=day,
+        is_closed=True,
+        closed_at=closed_at,
+        diesel_cost=fuel.get('diesel', ZERO).quantize(MONEY),
+        fuel_distribution_cost=fuel.get('fuel', ZERO).quantize(MONEY),
+        reconciliation_notes=f'Imported from {source}',
+        created_by=user,
+        updated_by=user,
+    )
+    for prefix, stock in opening.items():
+        setattr(daily_production, f'opening_{prefix}_stock', stock)
+    for field, value in dispatch.items():
+        setattr(daily_production, field, int(value))
+    daily_production.calculate_total_indirect_costs()
+
+    day_ingredient_cost = sum((cost for _, _, _, cost in batches), ZERO)
+    produced = defaultdict(int)
+    day_batches = []
+    for number, (product, mix, packets, cost) in enumerate(batches, start=1):
+        batch = ProductionBatch(
+            daily_production=daily_production,
+            mix=mix,
+            batch_number=number,
+            actual_packets=packets,
+            ingredient_cost=cost.quantize(MONEY),
+            is_finalized=True,
+            created_by=user,
+            updated_by=user,
+        )
+        batch.calculate_variance()
+        batch.calculate_packaging_cost()
+        # Same proportional split as ProductionBatch.allocate_indirect_costs
+        if day_ingredient_cost > 0:
+            batch.allocated_indirect_cost = (
+                cost / day_ingredient_cost * daily_production.total_indirect_costs
+            ).quantize(MONEY)
+        batch.total_cost = batch.ingredient_cost + batch.packaging_cost + batch.allocated_indirect_cost
+        if packets > 0:
+            batch.cost_per_packet = (batch.total_cost / packets).quantize(MONEY)
+        batch.calculate_pl()
+        batch.gross_margin_percentage = margin(batch.gross_profit, batch.expected_revenue)
+        produced[product.lower()] += packets
+        day_batches.append(batch)
+
+    for prefix in DISPATCH_COLUMNS:
+        setattr(daily_production, f'{prefix}_produced', produced[prefix])
+    daily_production.calculate_closing_stock()
+    daily_production.check_reconciliation_variance()
+
+    report = DailyReport(
+        date=day,
+        is_locked=True,
+        generated_by=user,
+        **daily_report_values(daily_production, day_batches),
+    )
+    for field, value in chart_fields(report).items():
+        setattr(report, field, value)
+    return daily_production, day_batches, report
+
+
+def _group_days(sheets, mixes, errors):
+    """Per-date batches, dispatch totals and fuel totals from the column lists"""
+    batches = defaultdict(list)
+    production = sheets['production']
+    for row, day, product, packets, cost in zip(
+        production['row'], production['date'], production['product'], production['packets'], production['cost']
+    ):
+        mix = mixes.get(product)
+        if mix is None:
+            errors.append(f'{PRODUCTION_SHEET}!{row}: no active {product} mix to attach the batch to')
+            continue
+        batches[day].append((product, mix, packets, cost))
+
+    dispatch = defaultdict(lambda: defaultdict(int))
+    columns = sheets['dispatch']
+    fields = [name for name in columns if name.endswith(('_dispatched', '_returned'))]
+    for index, day in enumerate(columns['date']):
+        for field in fields:
+            dispatch[day][field] += columns[field][index]
+
+    fuel = defaultdict(lambda: defaultdict(lambda: ZERO))
+    columns = sheets['fuel']
+    for day, kind, amount in zip(columns['date'], columns['kind'], columns['amount']):
+        fuel[day][kind] += amount
+    return batches, dispatch, fuel
+
+
+def _group_purchases(sheets, items, unmatched):
+    """Per-date {InventoryItem: [quantity, total]} for expenditure lines that map to an item"""
+    purchases = defaultdict(dict)
+    columns = sheets['expenditure']
+    for day, description, quantity, total in zip(
+        columns['date'], columns['description'], columns['quantity'], columns['total']
+    ):
+        item = items.get(EXPENDITURE_ITEMS.get(_description_key(description)))
+        if item is None:
+            unmatched[description.strip()] += total
+            continue
+        line = purchases[day].setdefault(item, [ZERO, ZERO])
+        line[0] += quantity
+        line[1] += total
+    return purchases
+
+
+def _skip_locked_day(day, locked, errors):
+    """True if the day sits in a closed accounting month (reported once per day)"""
+    if not registry.is_month_locked(day.year, day.month):
+        return False
+    if day not in locked:
+        errors.append(f'{day:%d.%m.%Y}: accounting period {day:%B %Y} is closed')
+        locked.add(day)
+    return True
+
+
+def _chunks(values, size):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def import_workbook(path, user=None, chunk_days=DEFAULT_CHUNK_DAYS, dry_run=False):
+    """
+    Import one workbook; returns a summary dict
+        days, batches, reports, purchases, purchase_items: rows created
+        skipped_days: dates that already existed, or production / expenditure
+                      dates in a closed accounting month
+        unmatched_expenses: {description: total} not mapped to an inventory item
+        errors: validation messages ("Sheet!row: message")
+    With dry_run nothing is written; the counts are what would be created.
+    """
+    source = str(path).rsplit('/', 1)[-1]
+    sheets, errors = read_workbook(path)
+    batches, dispatch, fuel = _group_days(sheets, _product_mixes(), errors)
+
+    dates = sorted(set(batches) | set(dispatch))
+    for day in sorted(set(fuel) - set(dates)):
+        errors.append(f'{FUEL_SHEET}: fuel for {day:%d.%m.%Y} has no production day')
+
+    existing = set(DailyProduction.objects.filter(date__in=dates).values_list('date', flat=True))
+    locked = set()
+    new_dates = []
+    for day in dates:
+        if day in existing:
+            continue
+        if _skip_locked_day(day, locked, errors):
+            continue
+        new_dates.append(day)
+
+    # Opening stock chains from the last day before the import (then day to day)
+    opening = {prefix: 0 for prefix in DISPATCH_COLUMNS}
+    if new_dates:
+        previous = (
+            DailyProduction.objects
+            .filter(date__lt=new_dates[0])
+            .order_by('-date')
+            .values(*[f'closing_{prefix}_stock' for prefix in DISPATCH_COLUMNS])
+            .first()
+        )
+        if previous:
+            opening = {prefix: previous[f'closing_{prefix}_stock'] for prefix in DISPATCH_COLUMNS}
+
+    closed_at = timezone.now()
+    days = []
+    for day in new_dates:
+        built = build_day(day, batches[day], dispatch[day], fuel[day], opening, user, closed_at, source)
+        opening = {prefix: getattr(built[0], f'closing_{prefix}_stock') for prefix in DISPATCH_COLUMNS}
+        days.append(built)
+
+    unmatched = defaultdict(lambda: ZERO)
+    item_names = set(EXPENDITURE_ITEMS.values())
+    items = {
+        item.name: item
+        for item in InventoryItem.objects.filter(name__in=item_names).select_related('category')
+    }
+    purchases = _group_purchases(sheets, items, unmatched)
+    existing_numbers = set(
+        Purchase.objects
+        .filter(purchase_number__in=[f'{PURCHASE_PREFIX}{day:%Y%m%d}' for day in purchases])
+        .values_list('purchase_number', flat=True)
+    )
+    # Expenditure in a closed month would change its expense totals too
+    purchase_days = [
+        day for day in sorted(purchases)
+        if f'{PURCHASE_PREFIX}{day:%Y%m%d}' not in existing_numbers
+        and not _skip_locked_day(day, locked, errors)
+    ]
+
+    summary = {
+        'days': len(days),
+        'batches': sum(len(day_batches) for _, day_batches, _ in days),
+        'reports': len(days),
+        'purchases': len(purchase_days),
+        'purchase_items': sum(len(purchases[day]) for day in purchase_days),
+        'skipped_days': sorted(existing | locked),
+        'unmatched_expenses': dict(unmatched),
+        'errors': errors,
+    }
+    if dry_run:
+        return summary
+
+    for chunk in _chunks(days, chunk_days):
+        with transaction.atomic(), allow_closed_day_edits():
+            DailyProduction.objects.bulk_create([daily_production for daily_production, _, _ in chunk])
+            for daily_production, day_batches, _ in chunk:
+                for batch in day_batches:
+                    batch.daily_production = daily_production  # picks up the new pk
+            ProductionBatch.objects.bulk_create(
+                [batch for _, day_batches, _ in chunk for batch in day_batches]
+            )
+            DailyReport.objects.bulk_create([report for _, _, report in chunk])
+    if days:
+        # New closed days were written without signals
+        registry.invalidate()
+
+    if purchase_days:
+        # Inactive: kept out of supplier choices and purchase recommendations
+        supplier, _ = Supplier.objects.get_or_create(
+            name=IMPORT_SUPPLIER, defaults={'created_by': user, 'is_active': False}
+        )
+        for chunk in _chunks(purchase_days, chunk_days):
+            with transaction.atomic():
+                created = Purchase.objects.bulk_create([
+                    Purchase(
+                        purchase_number=f'{PURCHASE_PREFIX}{day:%Y%m%d}',
+                        supplier=supplier,
+                        purchase_date=day,
+                        actual_delivery_date=day,
+                        status='RECEIVED',
+                        total_amount=sum((total for _, total in purchases[day].values()), ZERO).quantize(MONEY),
+                        notes=f'Imported from {source}',
+                        created_by=user,
+                        updated_by=user,
+                    )
+                    for day in chunk
+                ])
+                PurchaseItem.objects.bulk_create([
+                    PurchaseItem(
+                        purchase=purchase,
+                        item=item,
+                        quantity=quantity.quantize(QUANTITY),
+                        unit_cost=(total / quantity).quantize(MONEY),
+                        total_cost=total.quantize(MONEY),
+                        expense_category=item.category.code,
+                        purchase_date=purchase.purchase_date,
+                    )
+                    for purchase in created
+                    for item, (quantity, total) in purchases[purchase.purchase_date].items()
+                ])
+
+    # bulk_create sends no signals: fill the analytics store for the new dates
+    record_days(set(new_dates) | set(purchase_days))
+    return summary
@@ -1,3 +1,144 @@
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from apps.accounting.models import AccountingPeriod
+from apps.core.period_locks import registry
+from apps.inventory.models import ExpenseCategory, InventoryItem, Purchase, PurchaseItem
+from apps.products.models import Mix, Product
+from apps.reports.models import DailyReport
+
+from .models import DailyProduction, ProductionBatch
+from .services.workbook_import import (
+    DISPATCH_SHEET, EXPENDITURE_SHEET, FUEL_SHEET, PRODUCTION_SHEET, import_workbook,
+)
+
+
+def _row(**cells):
+    """Sheet row from {column index: value} (keys like c0, c5)"""
+    row = [None] * (max(int(key[1:]) for key in cells) + 1)
+    for key, value in cells.items():
+        row[int(key[1:])] = value
+    return row
+
+
+def write_workbook(path):
+    """
+    Two September days (open month) and one August day (closed month):
+    production, dispatch and fuel for every day, expenditure on 1 and 2 Sep
+    and 15 Aug
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    production = workbook.active
+    production.title = PRODUCTION_SHEET
+    production.append(['Production'])
+    production.append(['Date', 'Mix'])
+    production.append(_row(c0='15.08.2025', c1='Mix 1', c5=900, c6=95))
+    production.append(_row(c0='01.09.2025', c1='Mix 1', c5=1000, c6=100, c9='Mix 1', c13=800, c14=80))
+    production.append(_row(c1='Mix 2', c5=1000, c6=98))
+    production.append(_row(c0='02.09.2025', c1='Mix 1', c5=1000, c6=102))
+
+    dispatch = workbook.create_sheet(DISPATCH_SHEET)
+    dispatch.append(['Dispatch'])
+    dispatch.append(['Date', 'Salesperson'])
+    dispatch.append(_row(c0='15.08.2025', c1='Jane', c3=90, c6=2))
+    dispatch.append(_row(c0='01.09.2025', c1='Jane', c3=150, c6=5, c15=70))
+    dispatch.append(_row(c0='02.09.2025', c1='Jane', c3=95, c6=1))
+
+    fuel = workbook.create_sheet(FUEL_SHEET)
+    fuel.append(['Truck fuel', None, None, None, None, None, 'Diesel'])
+    fuel.append(_row(c0='01.09.2025', c2=500, c6='01.09.2025', c8=300))
+
+    expenditure = workbook.create_sheet(EXPENDITURE_SHEET)
+    expenditure.append(['Date', 'Description', 'Quantity', 'Unit cost', 'Total'])
+    expenditure.append(['15.08.2025', 'Sugar', 2, 2500, 5000])
+    expenditure.append(['01.09.2025', 'Sugar', 2, 2500, 5000])
+    expenditure.append([None, 'Unga (2kg)', 10, 180, 1800])
+    expenditure.append([None, 'Mandazi tray', 1, 300, 300])
+    expenditure.append(['02.09.2025', 'Salt', 5, 40, 200])
+    expenditure.append([None, 'Total', None, None, 7300])
+    workbook.save(path)
+
+
+class WorkbookImportTests(TestCase):
+
+    def setUp(self):
+        for name, price in [('Bread', '60'), ('KDF', '100')]:
+            product = Product.objects.create(
+                name=name, baseline_output=100, price_per_packet=Decimal(price),
+            )
+            Mix.objects.create(product=product, name=f'{name} Mix', expected_packets=100)
+        category = ExpenseCategory.objects.create(name='Raw Materials', code='RAW_MATERIALS')
+        for name in ['Sugar', 'Wheat Flour', 'Salt']:
+            InventoryItem.objects.create(
+                name=name,
+                category=category,
+                purchase_unit='kg',
+                recipe_unit='kg',
+                cost_per_purchase_unit=Decimal('100.00'),
+                cost_per_recipe_unit=Decimal('100.00'),
+                reorder_level=Decimal('0'),
+            )
+        AccountingPeriod.objects.create(year=2025, month=8, status='CLOSED')
+        registry.invalidate()
+
+        handle, self.path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        write_workbook(self.path)
+
+    def tearDown(self):
+        registry.invalidate()
+
+    def test_import_counts_and_closed_month_skipped(self):
+        summary = import_workbook(self.path)
+
+        self.assertEqual(summary['days'], 2)
+        self.assertEqual(summary['batches'], 4)
+        self.assertEqual(summary['reports'], 2)
+        self.assertEqual(summary['purchases'], 2)
+        self.assertEqual(summary['purchase_items'], 3)
+        self.assertEqual(summary['unmatched_expenses'], {'Mandazi tray': Decimal('300')})
+        self.assertEqual(summary['skipped_days'], [date(2025, 8, 15)])
+        self.assertEqual(summary['errors'], ['15.08.2025: accounting period August 2025 is closed'])
+
+        day = DailyProduction.objects.get(date=date(2025, 9, 1))
+        self.assertTrue(day.is_closed)
+        self.assertEqual(day.bread_produced, 198)
+        self.assertEqual(day.kdf_produced, 80)
+        self.assertEqual(day.bread_dispatched, 150)
+        self.assertEqual(day.total_indirect_costs, Decimal('800.00'))
+        self.assertEqual(DailyReport.objects.count(), 2)
+
+        # Nothing - production or expenditure - lands in the closed month
+        self.assertFalse(DailyProduction.objects.filter(date__month=8).exists())
+        self.assertFalse(Purchase.objects.filter(purchase_date__month=8).exists())
+        purchase = Purchase.objects.get(purchase_date=date(2025, 9, 1))
+        self.assertEqual(purchase.status, 'RECEIVED')
+        self.assertEqual(purchase.total_amount, Decimal('6800.00'))
+
+    def test_reimport_creates_nothing(self):
+        import_workbook(self.path)
+        counts = (
+            DailyProduction.objects.count(), ProductionBatch.objects.count(),
+            Purchase.objects.count(), PurchaseItem.objects.count(),
+        )
+
+        summary = import_workbook(self.path)
+
+        for key in ('days', 'batches', 'reports', 'purchases', 'purchase_items'):
+            self.assertEqual(summary[key], 0, key)
+        self.assertEqual(
+            summary['skipped_days'],
+            [date(2025, 8, 15), date(2025, 9, 1), date(2025, 9, 2)],
+        )
+        self.assertEqual(counts, (
+            DailyProduction.objects.count(), ProductionBatch.objects.count(),
+            Purchase.objects.count(), PurchaseItem.objects.count(),
+        ))
+        self.assertEqual(counts, (2, 4, 2, 3))
@@ -6,6 +6,10 @@ app_name = 'production'
 urlpatterns = [
     # Daily Production Dashboard
     path('', views.daily_production_today, name='daily_production'),
+    
+    # Production Planner (before <date>/ so 'plan' is not read as a date)
+    path('plan/', views.production_plan, name='production_plan'),
+    path('plan/api/', views.production_plan_api, name='production_plan_api'),
     path('<str:date>/', views.daily_production_view, name='daily_production_date'),
     
     # Production Batches
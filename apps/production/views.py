@@ -5,6 +5,8 @@ Implements daily production tracking, batch recording, indirect costs, and book
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
 from django.utils import timezone
 from django.db.models import Sum, Q
 from datetime import datetime, timedelta
@@ -14,6 +16,9 @@ from decimal import Decimal
 from .models import DailyProduction, ProductionBatch, IndirectCost
 from apps.products.models import Product, Mix
 from apps.accounts.models import User
+from apps.core.period_locks import allow_closed_day_edits
+from apps.production.services.planner import plan_production
+from apps.production.services.book_closing import finish_closed_day
 
 
 # ============================================================================
@@ -285,22 +290,23 @@ def batch_create(request, date=None):
                     'suggested_batch_number': batch_number,
                 })
             
-            # Create batch
-            batch = ProductionBatch.objects.create(
-                daily_production=daily_production,
-                mix=mix,
-                batch_number=batch_number,
-                actual_packets=actual_packets,
-                rejects_produced=rejects_produced,
-                start_time=start_time if start_time else None,
-                end_time=end_time if end_time else None,
-                quality_notes=quality_notes,
-                created_by=request.user,
-                updated_by=request.user
-            )
-            
-            # Allocate indirect costs to all batches
-            allocate_all_indirect_costs(daily_production)
+            # Create batch (closed days only get here for Admin/CEO/Manager - see can_edit_production)
+            with allow_closed_day_edits():
+                batch = ProductionBatch.objects.create(
+                    daily_production=daily_production,
+                    mix=mix,
+                    batch_number=batch_number,
+                    actual_packets=actual_packets,
+                    rejects_produced=rejects_produced,
+                    start_time=start_time if start_time else None,
+                    end_time=end_time if end_time else None,
+                    quality_notes=quality_notes,
+                    created_by=request.user,
+                    updated_by=request.user
+                )
+                
+                # Allocate indirect costs to all batches
+                allocate_all_indirect_costs(daily_production)
             
             messages.success(request, f'✅ Batch #{batch_number} for {mix.product.name} created successfully!')
             return redirect('production:daily_production_date', date=date_obj.strftime('%Y-%m-%d'))
@@ -431,10 +437,11 @@ def batch_edit(request, pk):
                 messages.error(request, 'Only Bread can have rejects.')
                 raise ValueError('Invalid rejects')
             
-            batch.save()
-            
-            # Reallocate indirect costs
-            allocate_all_indirect_costs(daily_production)
+            with allow_closed_day_edits():
+                batch.save()
+                
+                # Reallocate indirect costs
+                allocate_all_indirect_costs(daily_production)
             
             messages.success(request, 'Batch updated successfully.')
             return redirect('production:batch_detail', pk=pk)
@@ -498,10 +505,11 @@ def indirect_costs_form(request, date):
             daily_production.other_indirect_costs = get_decimal_value('other_indirect_costs')
             daily_production.reconciliation_notes = request.POST.get('reconciliation_notes', '')
             daily_production.updated_by = request.user
-            daily_production.save()
-            
-            # Reallocate costs to all batches
-            allocate_all_indirect_costs(daily_production)
+            with allow_closed_day_edits():
+                daily_production.save()
+                
+                # Reallocate costs to all batches
+                allocate_all_indirect_costs(daily_production)
             
             messages.success(request, 'Indirect costs updated successfully.')
             return redirect('production:daily_production_date', date=date_obj.strftime('%Y-%m-%d'))
@@ -558,6 +566,9 @@ def close_books(request, date):
         # Finalize all batches
         daily_production.batches.update(is_finalized=True)
         
+        # Same close-time pipeline as the 9PM cron: COGS, report, forecast, metrics, email
+        finish_closed_day(daily_production, request.user)
+        
         # Check for variance warning
         if daily_production.has_variance:
             messages.warning(
@@ -603,6 +614,33 @@ def close_books(request, date):
     return render(request, 'production/book_closing_view.html', context)
 
 
+# ============================================================================
+# PRODUCTION PLANNER
+# ============================================================================
+
+@login_required
+def production_plan(request):
+    """
+    Planner screen: batches each active mix can make from current stock,
+    the bottleneck ingredient, and a plan ordered by margin
+    """
+    if request.user.role == 'BASIC_USER':
+        messages.error(request, '❌ You do not have permission to plan production.')
+        return redirect('production:daily_production')
+
+    context = plan_production()
+    context['date'] = timezone.localdate()
+    return render(request, 'production/production_plan.html', context)
+
+
+@login_required
+def production_plan_api(request):
+    """Planner results as JSON (same data as the planner screen)"""
+    if request.user.role == 'BASIC_USER':
+        return JsonResponse({'error': 'You do not have permission to plan production.'}, status=403)
+    return JsonResponse(plan_production(), encoder=DjangoJSONEncoder)
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
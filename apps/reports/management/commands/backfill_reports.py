@@ -0,0 +1,41 @@
+"""
+Management command to backfill a year of reports
+Builds missing DailyReports for closed days, then every completed week and
+month of the year from them (one aggregate per week / month)
+
+Usage:
+    python manage.py backfill_reports --year 2025
+    python manage.py backfill_reports --year 2025 --rebuild
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.reports.services.rollups import backfill_year
+
+
+class Command(BaseCommand):
+    help = 'Backfill daily, weekly and monthly reports for a year'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Year to backfill. Defaults to the current year.')
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute existing weekly/monthly reports (daily reports are never rewritten)',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        year = options['year'] or today.year
+
+        started = time.monotonic()
+        system_user = User.objects.filter(is_superuser=True).first()
+        counts = backfill_year(year, today, system_user, rebuild=options['rebuild'])
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Reports backfilled for {year} in {time.monotonic() - started:.2f}s'))
+        self.stdout.write(f"  - Daily: {counts['daily']}")
+        self.stdout.write(f"  - Weekly: {counts['weekly']}")
+        self.stdout.write(f"  - Monthly: {counts['monthly']}")
@@ -0,0 +1,50 @@
+"""
+Management command to roll the month's DailyReports up into a MonthlyReport
+Run via Railway Cron: 0 0 1 * * (1st of the month - reports the previous month)
+
+Usage:
+    python manage.py generate_monthly_report
+    python manage.py generate_monthly_report --month 2025-09 --rebuild
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.reports.services.rollups import build_monthly_report, last_completed_month
+
+
+class Command(BaseCommand):
+    help = 'Generate the monthly report from the stored daily reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', type=str, help='Month (YYYY-MM). Defaults to the previous month.')
+        parser.add_argument('--rebuild', action='store_true', help='Recompute an existing monthly report')
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('Invalid month format. Use YYYY-MM')
+        else:
+            month = last_completed_month(timezone.localdate())
+
+        system_user = User.objects.filter(is_superuser=True).first()
+        report, created = build_monthly_report(month, system_user, rebuild=options['rebuild'])
+        if report is None:
+            self.stdout.write(self.style.WARNING(f'No daily reports for {month:%B %Y}'))
+            return
+        if not created and not options['rebuild']:
+            self.stdout.write(self.style.WARNING(f'Monthly report for {report.month_name} already exists'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Monthly report {report.month_name}'))
+        self.stdout.write(f'  - Revenue: KES {report.total_revenue:,.2f}')
+        self.stdout.write(f'  - Profit: KES {report.total_profit:,.2f} ({report.average_margin}%)')
+        for product in ('bread', 'kdf', 'scones'):
+            self.stdout.write(
+                f"  - {product.title()}: KES {getattr(report, f'{product}_profit'):,.2f} "
+                f"({getattr(report, f'{product}_margin')}%)"
+            )
@@ -0,0 +1,51 @@
+"""
+Management command to roll the week's DailyReports up into a WeeklyReport
+Run via Railway Cron: 0 8 * * 0 (Sunday 8AM - reports the week that ended last Sunday)
+
+Usage:
+    python manage.py generate_weekly_report
+    python manage.py generate_weekly_report --week-ending 2025-09-14 --rebuild
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.reports.services.rollups import build_weekly_report, last_completed_week, week_bounds
+
+
+class Command(BaseCommand):
+    help = 'Generate the weekly report from the stored daily reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--week-ending',
+            type=str,
+            help='Any date in the week (YYYY-MM-DD). Defaults to the last completed week.',
+        )
+        parser.add_argument('--rebuild', action='store_true', help='Recompute an existing weekly report')
+
+    def handle(self, *args, **options):
+        if options['week_ending']:
+            try:
+                week_ending = datetime.strptime(options['week_ending'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Invalid date format. Use YYYY-MM-DD')
+        else:
+            week_ending = last_completed_week(timezone.localdate())
+        start, end = week_bounds(week_ending)
+
+        system_user = User.objects.filter(is_superuser=True).first()
+        report, created = build_weekly_report(end, system_user, rebuild=options['rebuild'])
+        if report is None:
+            self.stdout.write(self.style.WARNING(f'No daily reports for {start} to {end}'))
+            return
+        if not created and not options['rebuild']:
+            self.stdout.write(self.style.WARNING(f'Weekly report for {start} to {end} already exists'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Weekly report {start} to {end}'))
+        self.stdout.write(f'  - Revenue: KES {report.total_revenue:,.2f}')
+        self.stdout.write(f'  - Profit: KES {report.total_profit:,.2f} ({report.average_margin}%)')
+        self.stdout.write(f'  - Batches: {report.total_batches}')
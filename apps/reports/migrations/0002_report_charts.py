@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyreport',
+            name='chart_data',
+            field=models.JSONField(blank=True, default=dict, help_text='🤖 AUTO: Chart series stored at generation time'),
+        ),
+        migrations.AddField(
+            model_name='dailyreport',
+            name='etag',
+            field=models.CharField(blank=True, help_text='🤖 AUTO: Hash of the stored report (HTTP ETag)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='monthlyreport',
+            name='chart_data',
+            field=models.JSONField(blank=True, default=dict, help_text='🤖 AUTO: Chart series stored at generation time'),
+        ),
+        migrations.AddField(
+            model_name='monthlyreport',
+            name='etag',
+            field=models.CharField(blank=True, help_text='🤖 AUTO: Hash of the stored report (HTTP ETag)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='weeklyreport',
+            name='chart_data',
+            field=models.JSONField(blank=True, default=dict, help_text='🤖 AUTO: Chart series stored at generation time'),
+        ),
+        migrations.AddField(
+            model_name='weeklyreport',
+            name='etag',
+            field=models.CharField(blank=True, help_text='🤖 AUTO: Hash of the stored report (HTTP ETag)', max_length=64),
+        ),
+    ]
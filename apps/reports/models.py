@@ -107,6 +107,18 @@ class DailyReport(models.Model):
     scones_profit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     scones_margin = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     
+    # Charts (precomputed for the report page)
+    chart_data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="🤖 AUTO: Chart series stored at generation time"
+    )
+    etag = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="🤖 AUTO: Hash of the stored report (HTTP ETag)"
+    )
+    
     # Status
     is_locked = models.BooleanField(
         default=True,
@@ -176,6 +188,18 @@ class WeeklyReport(models.Model):
     # Commissions (7 days totals)
     total_commissions = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     
+    # Charts (precomputed for the report page)
+    chart_data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="🤖 AUTO: Chart series stored at generation time"
+    )
+    etag = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="🤖 AUTO: Hash of the stored report (HTTP ETag)"
+    )
+    
     # Status
     is_locked = models.BooleanField(default=True)
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -261,6 +285,18 @@ class MonthlyReport(models.Model):
     scones_profit = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     scones_margin = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     
+    # Charts (precomputed for the report page)
+    chart_data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="🤖 AUTO: Chart series stored at generation time"
+    )
+    etag = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="🤖 AUTO: Hash of the stored report (HTTP ETag)"
+    )
+    
     # Status
     is_locked = models.BooleanField(default=True)
     generated_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1 @@
+"""Reports services package"""
@@ -0,0 +1,138 @@
+"""
+Report Chart Series
+Chart.js series computed once when a report is generated and stored on it
+
+- Daily: per-product output / revenue / cost / profit and the cost split,
+  straight from the report fields (no extra queries)
+- Weekly / monthly: one series point per day from the period's DailyReports
+  (one values_list query) plus the per-product totals
+- report_etag: SHA-256 of the stored values and series - the strong ETag the
+  report pages are served with
+"""
+import calendar
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from apps.reports.models import DailyReport, MonthlyReport, WeeklyReport
+
+
+PRODUCT_LABELS = [('bread', 'Bread'), ('kdf', 'KDF'), ('scones', 'Scones')]
+
+# Bump when the report page layout changes: roll-up pages revalidate and get the
+# new layout; daily pages cached as immutable keep theirs until they expire
+REPORT_PAGE_VERSION = 1
+
+# Not part of the report content (excluded from the ETag)
+NON_CONTENT_FIELDS = {
+    'id', 'chart_data', 'etag', 'is_locked', 'generated_at', 'generated_by', 'email_sent', 'email_sent_at',
+}
+
+
+def month_end(month):
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def _number(value):
+    return float(value or 0)
+
+
+def daily_chart_data(report):
+    """Series for one day from its DailyReport fields"""
+    def series(metric, convert=_number):
+        return [convert(getattr(report, f'{prefix}_{metric}')) for prefix, _ in PRODUCT_LABELS]
+
+    return {
+        'products': {
+            'labels': [label for _, label in PRODUCT_LABELS],
+            'produced': series('produced', int),
+            'revenue': series('revenue'),
+            'cost': series('cost'),
+            'profit': series('profit'),
+        },
+        'costs': {
+            'labels': ['Direct costs', 'Indirect costs'],
+            'values': [_number(report.total_direct_costs), _number(report.total_indirect_costs)],
+        },
+    }
+
+
+def period_chart_data(start, end):
+    """Daily trend and per-product totals for a week / month (one query)"""
+    fields = ['date', 'total_revenue', 'total_costs', 'gross_profit', 'gross_margin_percentage']
+    product_fields = [
+        f'{prefix}_{metric}'
+        for prefix, _ in PRODUCT_LABELS
+        for metric in ('produced', 'revenue', 'profit')
+    ]
+    rows = list(
+        DailyReport.objects
+        .filter(date__gte=start, date__lte=end)
+        .order_by('date')
+        .values_list(*fields, *product_fields)
+    )
+
+    totals = dict.fromkeys(product_fields, 0)
+    for row in rows:
+        for field, value in zip(product_fields, row[len(fields):]):
+            totals[field] += value
+
+    return {
+        'daily': {
+            'labels': [row[0].isoformat() for row in rows],
+            'revenue': [_number(row[1]) for row in rows],
+            'costs': [_number(row[2]) for row in rows],
+            'profit': [_number(row[3]) for row in rows],
+            'margin': [_number(row[4]) for row in rows],
+        },
+        'products': {
+            'labels': [label for _, label in PRODUCT_LABELS],
+            'produced': [totals[f'{prefix}_produced'] for prefix, _ in PRODUCT_LABELS],
+            'revenue': [_number(totals[f'{prefix}_revenue']) for prefix, _ in PRODUCT_LABELS],
+            'profit': [_number(totals[f'{prefix}_profit']) for prefix, _ in PRODUCT_LABELS],
+        },
+    }
+
+
+def stored_values(report):
+    """The report's content fields as a dict"""
+    return {
+        field.attname: getattr(report, field.attname)
+        for field in report._meta.concrete_fields
+        if field.name not in NON_CONTENT_FIELDS
+    }
+
+
+def report_etag(report, chart_data):
+    """Strong ETag for a report: hash of its stored values and chart series"""
+    payload = json.dumps(
+        {'version': REPORT_PAGE_VERSION, 'values': stored_values(report), 'charts': chart_data},
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def chart_fields(report):
+    """{'chart_data', 'etag'} for a Daily/Weekly/MonthlyReport (saved or not)"""
+    if isinstance(report, DailyReport):
+        chart_data = daily_chart_data(report)
+    elif isinstance(report, WeeklyReport):
+        chart_data = period_chart_data(report.week_starting, report.week_ending)
+    elif isinstance(report, MonthlyReport):
+        chart_data = period_chart_data(report.month, month_end(report.month))
+    else:
+        raise TypeError(f'Not a report: {report!r}')
+    return {'chart_data': chart_data, 'etag': report_etag(report, chart_data)}
+
+
+def ensure_charts(report):
+    """Fill chart_data / etag on a report generated before they were stored"""
+    if report.etag:
+        return report
+    fields = chart_fields(report)
+    type(report).objects.filter(pk=report.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(report, name, value)
+    return report
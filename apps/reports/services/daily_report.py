@@ -0,0 +1,144 @@
+"""
+Daily Report Builder
+Fills the immutable DailyReport for a closed production day
+
+- The day's ProductionBatches are loaded once with select_related('mix__product')
+- Product-level and total metrics are accumulated in a single in-memory pass
+- One DailyReport row is written with its chart series; an existing report
+  is never rewritten
+
+Batch costs use the actual COGS from the costing engine when the batch has
+been costed (close_daily_books costs the day before building the report),
+otherwise the Mix snapshot (ingredient_cost + packaging_cost).
+Revenue is the value of the day's output at the product selling price.
+Revenue deficits and commissions stay at zero until sales are tracked again.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+
+from apps.production.models import ProductionBatch
+from apps.reports.models import DailyReport
+from apps.reports.services.charts import chart_fields
+
+
+# Product name -> DailyReport field prefix
+REPORT_PRODUCTS = {'bread': 'bread', 'kdf': 'kdf', 'scones': 'scones'}
+
+ZERO = Decimal('0.00')
+MONEY = Decimal('0.01')
+MAX_MARGIN = Decimal('999.99')  # DecimalField(max_digits=5, decimal_places=2)
+
+
+def margin(profit, revenue):
+    """(profit / revenue) × 100, clamped to what the margin fields can store"""
+    if not revenue:
+        return ZERO
+    value = (profit / revenue * 100).quantize(MONEY)
+    return max(min(value, MAX_MARGIN), -MAX_MARGIN)
+
+
+def batch_direct_cost(batch):
+    """Ingredients + packaging: actual COGS once costed, else the Mix snapshot"""
+    if batch.costed_at is not None:
+        return batch.actual_ingredient_cost + batch.actual_packaging_cost
+    return batch.ingredient_cost + batch.packaging_cost
+
+
+def daily_report_values(daily_production, batches=None):
+    """
+    Every DailyReport metric for one DailyProduction (one query for the batches)
+    `batches` may be passed in-memory (with mix.product loaded) to skip the query
+    Returns a dict of DailyReport field values
+    """
+    if batches is None:
+        batches = (
+            ProductionBatch.objects
+            .filter(daily_production=daily_production)
+            .select_related('mix__product')
+        )
+
+    products = {
+        prefix: {'produced': 0, 'revenue': ZERO, 'cost': ZERO}
+        for prefix in REPORT_PRODUCTS.values()
+    }
+    total_batches = 0
+    total_revenue = ZERO
+    total_direct_costs = ZERO
+
+    for batch in batches:
+        direct_cost = batch_direct_cost(batch)
+        total_batches += 1
+        total_revenue += batch.expected_revenue
+        total_direct_costs += direct_cost
+
+        prefix = REPORT_PRODUCTS.get(batch.mix.product.name.strip().lower())
+        if prefix is None:
+            continue
+        product = products[prefix]
+        product['produced'] += batch.actual_packets
+        if prefix == 'bread':
+            product['produced'] += batch.rejects_produced
+        product['revenue'] += batch.expected_revenue
+        product['cost'] += direct_cost + batch.allocated_indirect_cost
+
+    total_indirect_costs = Decimal(daily_production.total_indirect_costs)
+    total_costs = total_direct_costs + total_indirect_costs
+    gross_profit = total_revenue - total_costs
+
+    values = {
+        'total_batches': total_batches,
+        'total_revenue': total_revenue.quantize(MONEY),
+        'total_direct_costs': total_direct_costs.quantize(MONEY),
+        'total_indirect_costs': total_indirect_costs.quantize(MONEY),
+        'total_costs': total_costs.quantize(MONEY),
+        'gross_profit': gross_profit.quantize(MONEY),
+        'gross_margin_percentage': margin(gross_profit, total_revenue),
+        'revenue_deficits': ZERO,
+        'crate_deficits': 0,
+        'total_commissions': ZERO,
+    }
+    for prefix, product in products.items():
+        dispatched = getattr(daily_production, f'{prefix}_dispatched')
+        returned = getattr(daily_production, f'{prefix}_returned')
+        profit = product['revenue'] - product['cost']
+        values.update({
+            f'{prefix}_produced': product['produced'],
+            f'{prefix}_dispatched': dispatched,
+            f'{prefix}_returned': returned,
+            f'{prefix}_sold': dispatched - returned,
+            f'{prefix}_revenue': product['revenue'].quantize(MONEY),
+            f'{prefix}_cost': product['cost'].quantize(MONEY),
+            f'{prefix}_profit': profit.quantize(MONEY),
+            f'{prefix}_margin': margin(profit, product['revenue']),
+        })
+    return values
+
+
+def build_daily_report(daily_production, user=None):
+    """
+    Create the DailyReport for a closed day
+    Returns (report, created) - an existing report is returned untouched
+    """
+    if not daily_production.is_closed:
+        raise ValueError(f'Books for {daily_production.date} are not closed yet')
+
+    existing = DailyReport.objects.filter(date=daily_production.date).first()
+    if existing is not None:
+        return existing, False
+
+    report = DailyReport(
+        date=daily_production.date,
+        is_locked=True,
+        generated_by=user,
+        **daily_report_values(daily_production),
+    )
+    for field, value in chart_fields(report).items():
+        setattr(report, field, value)
+    try:
+        with transaction.atomic():
+            report.save()
+    except IntegrityError:
+        # Generated concurrently by another run
+        return DailyReport.objects.get(date=daily_production.date), False
+    return report, True
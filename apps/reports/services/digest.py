@@ -0,0 +1,153 @@
+"""
+Daily Report Email Digest
+Sends the closed day's summary to management over one SMTP connection
+
+- The summary is rendered once per report; every recipient gets their own
+  copy of the same message (one EmailLog each)
+- Recipients that already have a SENT or PENDING log for the report are skipped,
+  so a cron re-run after a partial failure only retries the ones that failed
+  (PENDING means the send may have happened - never retried automatically)
+- email_sent / email_sent_at are set by one conditional UPDATE once every
+  recipient has been reached
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from apps.communications.models import EmailLog
+from apps.reports.models import DailyReport
+from apps.reports.services.charts import PRODUCT_LABELS
+
+logger = logging.getLogger(__name__)
+
+
+DIGEST_TEMPLATE = 'emails/reports/daily_digest.html'
+DIGEST_ROLES = ['SUPERADMIN', 'ADMIN']
+
+
+def digest_recipients():
+    """Active management users' email addresses"""
+    return sorted(set(
+        get_user_model().objects
+        .filter(role__in=DIGEST_ROLES, is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+    ))
+
+
+def digest_subject(report):
+    return f'Daily Report - {report.date:%a %d %b %Y}'
+
+
+def digest_context(report):
+    """Template context (JSON-safe: it is also stored on each EmailLog)"""
+    return {
+        'report_date': report.date.isoformat(),
+        'report_date_display': f'{report.date:%A, %d %B %Y}',
+        'report_url': settings.SERVER_URL.rstrip('/') + reverse(
+            'reports:daily_detail', args=[report.date.year, report.date.month, report.date.day]
+        ),
+        'summary': [
+            ('Revenue', f'KES {report.total_revenue:,.2f}'),
+            ('Total Costs', f'KES {report.total_costs:,.2f}'),
+            ('Gross Profit', f'KES {report.gross_profit:,.2f}'),
+            ('Margin', f'{report.gross_margin_percentage}%'),
+            ('Batches', str(report.total_batches)),
+        ],
+        'products': [
+            {
+                'label': label,
+                'produced': getattr(report, f'{prefix}_produced'),
+                'profit': f"{getattr(report, f'{prefix}_profit'):,.2f}",
+                'margin': str(getattr(report, f'{prefix}_margin')),
+            }
+            for prefix, label in PRODUCT_LABELS
+        ],
+        'has_deficits': report.revenue_deficits > 0,
+        'revenue_deficits': f'{report.revenue_deficits:,.2f}',
+    }
+
+
+def send_daily_digest(report, recipients=None, sent_by=None):
+    """
+    Email the report to every recipient not yet reached
+    Returns {'sent', 'failed', 'skipped'} counts; email_sent is set when none failed
+    """
+    result = {'sent': 0, 'failed': 0, 'skipped': 0}
+    if report.email_sent:
+        return result
+
+    recipients = digest_recipients() if recipients is None else recipients
+    if not recipients:
+        return result
+    subject = digest_subject(report)
+    reached = set(
+        EmailLog.objects
+        .filter(
+            template=DIGEST_TEMPLATE,
+            subject=subject,
+            recipient__in=recipients,
+            status__in=[EmailLog.Status.SENT, EmailLog.Status.PENDING],
+        )
+        .values_list('recipient', flat=True)
+    )
+    pending = [recipient for recipient in recipients if recipient not in reached]
+    result['skipped'] = len(recipients) - len(pending)
+
+    if pending:
+        context = digest_context(report)
+        html_message = render_to_string(f'communications/{DIGEST_TEMPLATE}', {**context, 'subject': subject})
+        plain_message = strip_tags(html_message)
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for recipient in pending:
+                log = EmailLog.objects.create(
+                    recipient=recipient,
+                    subject=subject,
+                    template=DIGEST_TEMPLATE,
+                    sent_by=sent_by,
+                    context_data=context,
+                    status=EmailLog.Status.PENDING,
+                )
+                email = EmailMultiAlternatives(
+                    subject=subject,
+                    body=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[recipient],
+                    connection=connection,
+                )
+                email.attach_alternative(html_message, 'text/html')
+                try:
+                    email.send(fail_silently=False)
+                except Exception as e:
+                    EmailLog.objects.filter(pk=log.pk).update(
+                        status=EmailLog.Status.FAILED, error_message=str(e), retry_count=log.retry_count + 1
+                    )
+                    logger.error(f'Daily digest to {recipient} failed: {e}')
+                    result['failed'] += 1
+                else:
+                    EmailLog.objects.filter(pk=log.pk).update(
+                        status=EmailLog.Status.SENT, delivered_at=timezone.now()
+                    )
+                    result['sent'] += 1
+        except Exception as e:
+            # Connection could not be opened - nothing was sent, retry next run
+            logger.error(f'Daily digest for {report.date}: SMTP connection failed: {e}')
+            result['failed'] += len(pending) - result['sent'] - result['failed']
+        finally:
+            connection.close()
+
+    if not result['failed']:
+        sent_at = timezone.now()
+        if DailyReport.objects.filter(pk=report.pk, email_sent=False).update(email_sent=True, email_sent_at=sent_at):
+            report.email_sent = True
+            report.email_sent_at = sent_at
+    return result
@@ -0,0 +1,207 @@
+"""
+Weekly & Monthly Report Roll-ups
+Built from the stored DailyReport rows, never from batches or stock movements
+
+- A week (Monday-Sunday) or a month is one aggregate() over its DailyReports
+- Margins are weighted by revenue: Σ profit / Σ revenue × 100, not the
+  average of the daily percentages
+- Roll-ups are written once with their chart series; rebuild=True
+  recomputes an existing row in place (they are derived data - the daily
+  reports stay immutable)
+"""
+from datetime import date, timedelta
+
+from django.db.models import Count, Q, Sum
+
+from apps.production.models import DailyProduction
+from apps.reports.models import DailyReport, MonthlyReport, WeeklyReport
+from apps.reports.services.charts import chart_fields, month_end
+from apps.reports.services.daily_report import build_daily_report, margin
+
+
+PRODUCTS = ['bread', 'kdf', 'scones']
+
+# Roll-up field -> DailyReport field summed into it
+WEEKLY_SUMS = {
+    'total_bread_produced': 'bread_produced',
+    'total_kdf_produced': 'kdf_produced',
+    'total_scones_produced': 'scones_produced',
+    'total_batches': 'total_batches',
+    'total_bread_sold': 'bread_sold',
+    'total_kdf_sold': 'kdf_sold',
+    'total_scones_sold': 'scones_sold',
+    'total_revenue': 'total_revenue',
+    'total_costs': 'total_costs',
+    'total_profit': 'gross_profit',
+    'total_revenue_deficits': 'revenue_deficits',
+    'total_crate_deficits': 'crate_deficits',
+    'total_commissions': 'total_commissions',
+}
+
+MONTHLY_SUMS = {
+    **WEEKLY_SUMS,
+    'total_direct_costs': 'total_direct_costs',
+    'total_indirect_costs': 'total_indirect_costs',
+    **{
+        f'{product}_{metric}': f'{product}_{metric}'
+        for product in PRODUCTS
+        for metric in ('revenue', 'cost', 'profit')
+    },
+}
+
+
+# ============================================================================
+# PERIODS
+# ============================================================================
+
+def week_bounds(week_ending):
+    """(Monday, Sunday) of the week containing week_ending"""
+    sunday = week_ending + timedelta(days=6 - week_ending.weekday())
+    return sunday - timedelta(days=6), sunday
+
+
+def month_bounds(month):
+    """(first day, last day) of the month containing `month`"""
+    first = month.replace(day=1)
+    return first, month_end(first)
+
+
+def last_completed_week(today):
+    """Sunday of the most recent week that has fully ended before today"""
+    return today - timedelta(days=today.weekday() + 1)
+
+
+def last_completed_month(today):
+    """First day of the month before today's month"""
+    return (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+
+# ============================================================================
+# AGGREGATION
+# ============================================================================
+
+def _rollup(start, end, sums, extra=None):
+    """One aggregate over the period's DailyReports; None when there are none"""
+    aggregates = {field: Sum(source) for field, source in sums.items()}
+    aggregates['days'] = Count('id')
+    aggregates.update(extra or {})
+    totals = DailyReport.objects.filter(date__gte=start, date__lte=end).aggregate(**aggregates)
+    if not totals.pop('days'):
+        return None
+    return totals
+
+
+def weekly_values(week_ending):
+    start, end = week_bounds(week_ending)
+    values = _rollup(start, end, WEEKLY_SUMS)
+    if values is None:
+        return None
+    values['average_margin'] = margin(values['total_profit'], values['total_revenue'])
+    return values
+
+
+def monthly_values(month):
+    start, end = month_bounds(month)
+    values = _rollup(
+        start, end, MONTHLY_SUMS,
+        extra={'deficit_incidents': Count('id', filter=Q(revenue_deficits__gt=0))},
+    )
+    if values is None:
+        return None
+    values['average_margin'] = margin(values['total_profit'], values['total_revenue'])
+    for product in PRODUCTS:
+        values[f'{product}_margin'] = margin(values[f'{product}_profit'], values[f'{product}_revenue'])
+    return values
+
+
+# ============================================================================
+# BUILDERS
+# ============================================================================
+
+def _save_rollup(existing, report, values):
+    """Create `report`, or recompute `existing` in place, with values and chart series"""
+    target = existing or report
+    for field, value in values.items():
+        setattr(target, field, value)
+    values.update(chart_fields(target))
+    if existing is not None:
+        type(existing).objects.filter(pk=existing.pk).update(**values)
+        existing.refresh_from_db()
+        return existing, False
+    report.chart_data = values['chart_data']
+    report.etag = values['etag']
+    report.save()
+    return report, True
+
+
+def build_weekly_report(week_ending, user=None, rebuild=False):
+    """
+    WeeklyReport for the Monday-Sunday week containing week_ending
+    Returns (report or None when the week has no daily reports, created)
+    """
+    start, end = week_bounds(week_ending)
+    existing = WeeklyReport.objects.filter(week_ending=end).first()
+    if existing is not None and not rebuild:
+        return existing, False
+
+    values = weekly_values(end)
+    if values is None:
+        return existing, False
+    report = WeeklyReport(week_starting=start, week_ending=end, generated_by=user)
+    return _save_rollup(existing, report, values)
+
+
+def build_monthly_report(month, user=None, rebuild=False):
+    """
+    MonthlyReport for the month containing `month`
+    Returns (report or None when the month has no daily reports, created)
+    """
+    start, _ = month_bounds(month)
+    existing = MonthlyReport.objects.filter(month=start).first()
+    if existing is not None and not rebuild:
+        return existing, False
+
+    values = monthly_values(start)
+    if values is None:
+        return existing, False
+    report = MonthlyReport(month=start, month_name=f'{start:%B %Y}', generated_by=user)
+    return _save_rollup(existing, report, values)
+
+
+# ============================================================================
+# BACKFILL
+# ============================================================================
+
+def backfill_year(year, today, user=None, rebuild=False):
+    """
+    Missing DailyReports for closed days, then every completed week and month
+    of the year rolled up from them
+    Returns counts {'daily', 'weekly', 'monthly'} of reports written
+    """
+    counts = {'daily': 0, 'weekly': 0, 'monthly': 0}
+
+    reported = DailyReport.objects.filter(date__year=year).values_list('date', flat=True)
+    for daily_production in (
+        DailyProduction.objects
+        .filter(date__year=year, is_closed=True)
+        .exclude(date__in=reported)
+        .order_by('date')
+    ):
+        _, created = build_daily_report(daily_production, user)
+        counts['daily'] += created
+
+    # Weeks ending in the year (a week spanning New Year belongs to its Sunday)
+    sunday = week_bounds(date(year, 1, 1))[1]
+    while sunday.year == year and sunday < today:
+        report, created = build_weekly_report(sunday, user, rebuild=rebuild)
+        counts['weekly'] += bool(report is not None and (created or rebuild))
+        sunday += timedelta(days=7)
+
+    for month in range(1, 13):
+        start, end = month_bounds(date(year, month, 1))
+        if end >= today:
+            break
+        report, created = build_monthly_report(start, user, rebuild=rebuild)
+        counts['monthly'] += bool(report is not None and (created or rebuild))
+
+    return counts
@@ -1,3 +1,103 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from apps.communications.models import EmailLog
+from apps.production.models import DailyProduction
+
+from .models import DailyReport
+from .services.daily_report import build_daily_report
+from .services.digest import DIGEST_TEMPLATE, send_daily_digest
+
+
+RECIPIENTS = ['ceo@example.com', 'accounts@example.com', 'flaky@example.com']
+FAILING = set()
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that refuses addresses in FAILING"""
+
+    def send_messages(self, messages):
+        for message in messages:
+            if FAILING & set(message.to):
+                raise OSError('550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+class BrokenConnectionBackend(EmailBackend):
+    """locmem backend whose connection cannot be opened"""
+
+    def open(self):
+        raise OSError('Connection refused')
+
+
+@override_settings(EMAIL_BACKEND='apps.reports.tests.FlakyBackend')
+class DailyDigestTests(TestCase):
+
+    def setUp(self):
+        daily_production = DailyProduction.objects.create(date=date(2025, 9, 10))
+        daily_production.close_books(None)
+        self.report, _ = build_daily_report(daily_production)
+        FAILING.clear()
+        self.addCleanup(FAILING.clear)
+
+    def statuses(self):
+        return sorted(
+            EmailLog.objects
+            .filter(template=DIGEST_TEMPLATE)
+            .values_list('recipient', 'status')
+        )
+
+    def test_rerun_retries_only_the_failed_recipient(self):
+        FAILING.add('flaky@example.com')
+        with self.assertLogs('apps.reports.services.digest', 'ERROR'):
+            result = send_daily_digest(self.report, RECIPIENTS)
+
+        self.assertEqual(result, {'sent': 2, 'failed': 1, 'skipped': 0})
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(DailyReport.objects.get(pk=self.report.pk).email_sent)
+
+        FAILING.clear()
+        result = send_daily_digest(self.report, RECIPIENTS)
+
+        self.assertEqual(result, {'sent': 1, 'failed': 0, 'skipped': 2})
+        self.assertEqual([message.to for message in mail.outbox[2:]], [['flaky@example.com']])
+        self.assertEqual(self.statuses(), [
+            ('accounts@example.com', EmailLog.Status.SENT),
+            ('ceo@example.com', EmailLog.Status.SENT),
+            ('flaky@example.com', EmailLog.Status.FAILED),
+            ('flaky@example.com', EmailLog.Status.SENT),
+        ])
+        stored = DailyReport.objects.get(pk=self.report.pk)
+        self.assertTrue(stored.email_sent)
+
+        # Already sent: nothing goes out and email_sent_at is kept
+        stale = DailyReport.objects.get(pk=self.report.pk)
+        stale.email_sent = False
+        result = send_daily_digest(stale, RECIPIENTS)
+        self.assertEqual(result, {'sent': 0, 'failed': 0, 'skipped': 3})
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(DailyReport.objects.get(pk=self.report.pk).email_sent_at, stored.email_sent_at)
+
+    def test_pending_log_is_not_resent(self):
+        EmailLog.objects.create(
+            recipient='ceo@example.com',
+            subject=f'Daily Report - {self.report.date:%a %d %b %Y}',
+            template=DIGEST_TEMPLATE,
+            status=EmailLog.Status.PENDING,
+        )
+        result = send_daily_digest(self.report, RECIPIENTS)
+
+        self.assertEqual(result, {'sent': 2, 'failed': 0, 'skipped': 1})
+        self.assertNotIn(['ceo@example.com'], [message.to for message in mail.outbox])
+
+    @override_settings(EMAIL_BACKEND='apps.reports.tests.BrokenConnectionBackend')
+    def test_connection_failure_counts_every_recipient_as_failed(self):
+        with self.assertLogs('apps.reports.services.digest', 'ERROR'):
+            result = send_daily_digest(self.report, RECIPIENTS)
+
+        self.assertEqual(result, {'sent': 0, 'failed': 3, 'skipped': 0})
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(DailyReport.objects.get(pk=self.report.pk).email_sent)
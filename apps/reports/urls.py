@@ -0,0 +1,14 @@
+"""
+Reports App URLs
+Stored (closed-books) report pages linked from the report emails
+"""
+from django.urls import path
+from . import views
+
+app_name = 'reports'
+
+urlpatterns = [
+    path('daily/<int:year>-<int:month>-<int:day>/', views.daily_report_detail, name='daily_detail'),
+    path('weekly/<int:year>-<int:month>-<int:day>/', views.weekly_report_detail, name='weekly_detail'),
+    path('monthly/<int:year>-<int:month>/', views.monthly_report_detail, name='monthly_detail'),
+]
@@ -1,3 +1,154 @@
-from django.shortcuts import render
+"""
+Reports App Views
+Read-only pages for the stored daily / weekly / monthly reports
 
-# Create your views here.
+Each page is served with the report's strong ETag. Daily reports are locked
+once generated and are cached `private, immutable`; weekly and monthly
+roll-ups can be recomputed in place (--rebuild on backfill_reports and the
+generate commands), so they are served `no-cache` and revalidated. A
+conditional GET with a matching If-None-Match costs one indexed lookup of
+the ETag and no body. The chart series are stored on the report, so
+rendering does no aggregation.
+"""
+from datetime import date
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .models import DailyReport, MonthlyReport, WeeklyReport
+from .services.charts import PRODUCT_LABELS, ensure_charts
+
+
+REPORT_ROLES = ['SUPERADMIN', 'ADMIN']
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def _report_date(*parts):
+    try:
+        return date(*parts)
+    except ValueError:
+        raise Http404('Invalid report date')
+
+
+def _render_report(request, model, lookup, title, summary, rebuildable=False):
+    """
+    Conditional GET + render for one stored report
+    summary(report) -> [(label, value)] cards shown above the charts
+    rebuildable: the report can be rewritten in place, so never immutable
+    """
+    if request.user.role not in REPORT_ROLES:
+        messages.error(request, 'You do not have permission to view reports.')
+        return redirect('home')
+
+    stored = model.objects.filter(**lookup).values_list('etag', 'is_locked').first()
+    if stored is None:
+        raise Http404('Report not found')
+    etag, is_locked = stored
+    if etag:
+        not_modified = get_conditional_response(request, etag=f'"{etag}"')
+        if not_modified is not None:
+            _patch_report_cache(not_modified, is_locked and not rebuildable)
+            return not_modified
+
+    report = ensure_charts(model.objects.get(**lookup))
+    response = render(request, 'reports/report_detail.html', {
+        'report': report,
+        'title': title(report),
+        'summary': summary(report),
+        'products': [
+            {
+                'label': label,
+                'revenue': getattr(report, f'{prefix}_revenue', None),
+                'profit': getattr(report, f'{prefix}_profit', None),
+                'margin': getattr(report, f'{prefix}_margin', None),
+            }
+            for prefix, label in PRODUCT_LABELS
+            if hasattr(report, f'{prefix}_revenue')
+        ],
+        'chart_data': report.chart_data,
+    })
+    response['ETag'] = f'"{report.etag}"'
+    _patch_report_cache(response, report.is_locked and not rebuildable)
+    return response
+
+
+def _patch_report_cache(response, immutable):
+    """
+    Locked, never-rewritten reports are immutable; anything else
+    revalidates its ETag
+    """
+    if immutable:
+        patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+
+
+@login_required
+def daily_report_detail(request, year, month, day):
+    """
+    Stored daily report with charts (URL: /reports/daily/YYYY-MM-DD/)
+    Permission: SUPERADMIN, ADMIN
+    """
+    return _render_report(
+        request,
+        DailyReport,
+        {'date': _report_date(year, month, day)},
+        title=lambda report: f'Daily Report - {report.date:%A, %d %B %Y}',
+        summary=lambda report: [
+            ('Revenue', report.total_revenue),
+            ('Total Costs', report.total_costs),
+            ('Gross Profit', report.gross_profit),
+            ('Margin %', report.gross_margin_percentage),
+            ('Batches', report.total_batches),
+            ('Revenue Deficits', report.revenue_deficits),
+        ],
+    )
+
+
+@login_required
+def weekly_report_detail(request, year, month, day):
+    """
+    Stored weekly report with charts (URL: /reports/weekly/<week ending>/)
+    Permission: SUPERADMIN, ADMIN
+    """
+    return _render_report(
+        request,
+        WeeklyReport,
+        {'week_ending': _report_date(year, month, day)},
+        title=lambda report: f'Weekly Report - {report.week_starting:%d %b} to {report.week_ending:%d %b %Y}',
+        summary=lambda report: [
+            ('Revenue', report.total_revenue),
+            ('Total Costs', report.total_costs),
+            ('Profit', report.total_profit),
+            ('Margin %', report.average_margin),
+            ('Batches', report.total_batches),
+            ('Revenue Deficits', report.total_revenue_deficits),
+        ],
+        rebuildable=True,
+    )
+
+
+@login_required
+def monthly_report_detail(request, year, month):
+    """
+    Stored monthly report with charts (URL: /reports/monthly/YYYY-MM/)
+    Permission: SUPERADMIN, ADMIN
+    """
+    return _render_report(
+        request,
+        MonthlyReport,
+        {'month': _report_date(year, month, 1)},
+        title=lambda report: f'Monthly Report - {report.month_name}',
+        summary=lambda report: [
+            ('Revenue', report.total_revenue),
+            ('Total Costs', report.total_costs),
+            ('Profit', report.total_profit),
+            ('Margin %', report.average_margin),
+            ('Batches', report.total_batches),
+            ('Deficit Incidents', report.deficit_incidents),
+        ],
+        rebuildable=True,
+    )
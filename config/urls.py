@@ -9,6 +9,10 @@ urlpatterns = [
     path('products/', include('apps.products.urls')),  # Products app URLs
     path('inventory/', include('apps.inventory.urls')),  # Inventory app URLs
     path('production/', include('apps.production.urls')),  # Production app URLs
+    path('accounting/', include('apps.accounting.urls')),  # Accounting exports
+    path('payroll/', include('apps.payroll.urls')),  # Payroll reports
+    path('reports/', include('apps.reports.urls')),  # Stored daily/weekly/monthly reports
+    path('analytics/', include('apps.analytics.urls')),  # Metrics store API + product performance
     # path('sales/', include('apps.sales.urls')),  # ❌ REMOVED - Rebuilt from scratch
 ]
 